@@ -67,7 +67,7 @@ async function resolveStrategyFromDatabase(
   });
 }
 
-type RunKind = "BACKTEST" | "GRID" | "WALKFORWARD";
+type RunKind = "BACKTEST" | "GRID" | "WALKFORWARD" | "OPTIMIZE";
 
 export async function recordQueuedRun(params: {
   runId: string;
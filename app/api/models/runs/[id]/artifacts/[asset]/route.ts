@@ -23,6 +23,27 @@ const EXTENSIONS: Record<string, string> = {
   logs: "txt",
 };
 
+function isNotFound(error: unknown) {
+  return (
+    typeof error === "object" &&
+    error !== null &&
+    "$metadata" in error &&
+    (error as { $metadata?: { httpStatusCode?: number } }).$metadata
+      ?.httpStatusCode === 404
+  );
+}
+
+// Runs may be written with artifactFormats that omit plain CSV; fall back to
+// the gzip'd copy (stored with Content-Encoding: gzip) when it is missing.
+async function getArtifact(key: string, allowGzip: boolean) {
+  try {
+    return await s3.send(new GetObjectCommand({ Bucket: BUCKET, Key: key }));
+  } catch (error) {
+    if (!allowGzip || !isNotFound(error)) throw error;
+    return s3.send(new GetObjectCommand({ Bucket: BUCKET, Key: `${key}.gz` }));
+  }
+}
+
 export async function GET(
   _req: Request,
   ctx: { params: Promise<{ id: string; asset: string }> }
@@ -52,12 +73,7 @@ export async function GET(
   const key = `${prefix}${assetKey}.${extension}`;
 
   try {
-    const res = await s3.send(
-      new GetObjectCommand({
-        Bucket: BUCKET,
-        Key: key,
-      })
-    );
+    const res = await getArtifact(key, extension === "csv");
 
     if (!res.Body) {
       return Response.json({ error: "ArtifactEmpty" }, { status: 404 });
@@ -73,6 +89,9 @@ export async function GET(
       headers: {
         "content-type": type,
         "cache-control": "no-store",
+        ...(res.ContentEncoding
+          ? { "content-encoding": res.ContentEncoding }
+          : {}),
       },
     });
   } catch (error) {
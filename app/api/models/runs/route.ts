@@ -44,7 +44,8 @@ async function fetchRunsFromDb(
   if (!process.env.DATABASE_URL) return null;
   try {
     const rows = await prisma.run.findMany({
-      where: userId ? { ownerId: userId } : undefined,
+      // Grid members / walk-forward windows are listed under their parent run
+      where: { parentRunId: null, ...(userId ? { ownerId: userId } : {}) },
       include: { strategy: { select: { name: true } } },
       orderBy: { startedAt: "desc" },
       take: limit,
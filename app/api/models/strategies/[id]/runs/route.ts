@@ -60,7 +60,7 @@ async function fetchStrategyRuns(
     if (!strategy) return null;
 
     const runs = await prisma.run.findMany({
-      where: { strategyId: strategy.id },
+      where: { strategyId: strategy.id, parentRunId: null },
       include: { strategy: { select: { name: true } } },
       orderBy: { startedAt: "desc" },
       take: 50,
@@ -12,7 +12,7 @@ const API = "/api/models";
 type Run = {
     id: string;
     strategyName: string;
-    kind: "backtest" | "grid" | "walkforward";
+    kind: "backtest" | "grid" | "walkforward" | "optimize";
     status: "QUEUED" | "RUNNING" | "SUCCEEDED" | "FAILED";
     startedAt: string;
     finishedAt?: string | null;
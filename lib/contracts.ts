@@ -1,7 +1,7 @@
 // lib/contracts.ts
 import { z } from "zod";
 
-export const RunKind = z.enum(["backtest", "grid", "walkforward"]);
+export const RunKind = z.enum(["backtest", "grid", "walkforward", "optimize"]);
 export type RunKind = z.infer<typeof RunKind>;
 
 export const ParamSpec = z.object({
@@ -23,6 +23,11 @@ const FreqtradeConfig = z.object({
   startupCandleCount: z.number().default(50),
 });
 
+const VectorizedConfig = z.object({
+  signalFunction: z.string().default("populate_signals"), // (dataframe, params) -> enter_long/exit_long
+  fee: z.number().default(0.001), // per side
+});
+
 export const Manifest = z.object({
   name: z.string(),
   version: z.string(), // git commit or semver
@@ -30,9 +35,43 @@ export const Manifest = z.object({
   params: z.array(ParamSpec),
   entrypoint: z.string().default("main.py"), // inside zip
   freqtrade: FreqtradeConfig.optional(),
+  engine: z.enum(["freqtrade", "vectorized"]).default("freqtrade"),
+  vectorized: VectorizedConfig.optional(),
 });
 export type Manifest = z.infer<typeof Manifest>;
 export type FreqtradeConfig = z.infer<typeof FreqtradeConfig>;
+export type VectorizedConfig = z.infer<typeof VectorizedConfig>;
+
+export const ArtifactFormat = z.enum(["csv", "csv.gz", "parquet"]);
+export type ArtifactFormat = z.infer<typeof ArtifactFormat>;
+
+export const ResultCacheStats = z.object({
+  enabled: z.boolean(),
+  bypass: z.boolean(),
+  lookups: z.number(),
+  hits: z.number(),
+  hitRate: z.number().nullable(),
+});
+export type ResultCacheStats = z.infer<typeof ResultCacheStats>;
+
+export const OptimizeDimension = z.union([
+  z.object({
+    low: z.number(),
+    high: z.number(),
+    type: z.enum(["int", "float"]).optional(), // default int when both bounds are integers
+    log: z.boolean().optional(), // sample on a log scale (low > 0)
+  }),
+  z.object({ choices: z.array(z.unknown()).min(1) }),
+]);
+export type OptimizeDimension = z.infer<typeof OptimizeDimension>;
+
+export const OptimizeConfig = z.object({
+  space: z.record(z.string(), OptimizeDimension), // merged onto `params`
+  budget: z.number().int().min(1), // backtests to run
+  initial: z.number().int().min(1).optional(), // random sets before TPE, default max(5, budget / 5)
+  seed: z.number().int().optional(),
+});
+export type OptimizeConfig = z.infer<typeof OptimizeConfig>;
 
 export const MetricsJson = z.object({
   runId: z.string(),
@@ -58,6 +97,10 @@ export const MetricsJson = z.object({
     start: z.string(),
     end: z.string(),
   }),
+  artifactFormats: z.array(ArtifactFormat).optional(), // equity/drawdown/trades files written
+  cacheHit: z.boolean().optional(), // artifacts copied from an identical earlier run
+  cachedFrom: z.string().optional(), // that run's artifact prefix
+  resultCache: ResultCacheStats.optional(), // backtest and grid/walk-forward parents
 });
 export type MetricsJson = z.infer<typeof MetricsJson>;
 
@@ -71,6 +114,21 @@ export const ResearchJob = z.object({
   params: z.record(z.string(), z.unknown()).optional(), // <— add this
   spec: MetricsJson.shape.spec,
   ownerId: z.string().optional(),
+  dataFormat: z.enum(["feather", "parquet", "json"]).optional(), // freqtrade OHLCV storage
+  artifactFormats: z.array(ArtifactFormat).optional(), // default ["csv"]
+  objective: z
+    .enum(["netReturn", "cagr", "sharpe", "sortino", "maxDD", "winRate", "avgTrade", "trades"])
+    .optional(), // grid leaderboard ranking (higher is better), default GRID_OBJECTIVE
+  bypassCache: z.boolean().optional(), // re-run even if an identical result is cached
+  search: z.enum(["exhaustive", "halving"]).optional(), // grid search mode, default exhaustive
+  halving: z
+    .object({
+      eta: z.number().int().min(2).optional(), // keep the top 1/eta per rung (default 3)
+      rungs: z.number().int().min(1).optional(), // default 1 + floor(log_eta(members))
+      minDays: z.number().optional(), // shortest rung length (default 30)
+    })
+    .optional(),
+  optimize: OptimizeConfig.optional(), // kind "optimize"
 });
 export type ResearchJob = z.infer<typeof ResearchJob>;
 
@@ -13,14 +13,24 @@ export type KPIs = {
   trades?: number;
 };
 
+export type RunProgress = {
+  done: number;
+  total: number;
+  failed?: number;
+  objective?: string;
+  best?: { runId: string; index: number; value: number } | null;
+  updatedAt?: string;
+};
+
 export type RunRow = {
   id: string;
   strategyName: string;
-  kind: "backtest" | "grid" | "walkforward";
+  kind: "backtest" | "grid" | "walkforward" | "optimize";
   status: "QUEUED" | "RUNNING" | "SUCCEEDED" | "FAILED";
   startedAt: string;
   finishedAt?: string | null;
   kpis?: KPIs;
+  progress?: RunProgress | null;
 };
 
 type RunWithStrategy = Run & {
@@ -36,6 +46,7 @@ export function mapRunRow(run: RunWithStrategy): RunRow {
     startedAt: run.startedAt.toISOString(),
     finishedAt: run.finishedAt?.toISOString() ?? null,
     kpis: extractKpis(run.kpis),
+    progress: extractProgress(run.progress),
   };
 }
 
@@ -45,6 +56,8 @@ function mapKind(kind: RunKind): RunRow["kind"] {
       return "grid";
     case "WALKFORWARD":
       return "walkforward";
+    case "OPTIMIZE":
+      return "optimize";
     case "BACKTEST":
     default:
       return "backtest";
@@ -84,3 +97,16 @@ function extractKpis(value: Prisma.JsonValue | null | undefined): KPIs {
     trades: num("trades"),
   };
 }
+
+function extractProgress(
+  value: Prisma.JsonValue | null | undefined
+): RunProgress | null {
+  if (!value || typeof value !== "object" || Array.isArray(value)) {
+    return null;
+  }
+  const record = value as Record<string, unknown>;
+  if (typeof record.done !== "number" || typeof record.total !== "number") {
+    return null;
+  }
+  return record as unknown as RunProgress;
+}
@@ -0,0 +1,8 @@
+-- AlterTable
+ALTER TABLE "Run" ADD COLUMN     "parentRunId" TEXT;
+
+-- CreateIndex
+CREATE INDEX "Run_parentRunId_idx" ON "Run"("parentRunId");
+
+-- AddForeignKey
+ALTER TABLE "Run" ADD CONSTRAINT "Run_parentRunId_fkey" FOREIGN KEY ("parentRunId") REFERENCES "Run"("id") ON DELETE CASCADE ON UPDATE CASCADE;
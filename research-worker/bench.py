@@ -0,0 +1,339 @@
+"""
+Micro-benchmarks for the research worker's data paths.
+
+Runs against synthetic data on local disk only (no S3 / exchange access):
+
+    python research-worker/bench.py dataset --years 3 --timeframe 1m
+    python research-worker/bench.py market-read --years 3 --days 14
+    python research-worker/bench.py trades --count 100000
+    python research-worker/bench.py artifacts --count 200000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+os.environ.setdefault("AWS_REGION", "ap-southeast-2")
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import worker  # noqa: E402
+
+
+def synthetic_ohlcv(years: int, timeframe: str, seed: int = 7) -> pd.DataFrame:
+    """Random-walk candles indexed by UTC timestamp, shaped like ensure_market_data output."""
+    start = pd.Timestamp("2021-01-01", tz="UTC")
+    step = pd.Timedelta(milliseconds=worker.timeframe_to_ms(timeframe))
+    index = pd.date_range(start, start + pd.DateOffset(years=years), freq=step, inclusive="left")
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, len(index)))
+    return pd.DataFrame(
+        {
+            "open": close + rng.normal(0, 0.05, len(index)),
+            "high": close + 0.2,
+            "low": close - 0.2,
+            "close": close,
+            "volume": rng.uniform(0, 10, len(index)),
+        },
+        index=pd.DatetimeIndex(index, name="timestamp"),
+    )
+
+
+def timed(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def report(rows: List[Dict[str, object]]):
+    width = max(len(str(r["case"])) for r in rows)
+    for r in rows:
+        extras = "  ".join(f"{k}={v}" for k, v in r.items() if k != "case")
+        print(f"  {str(r['case']).ljust(width)}  {extras}")
+
+
+# --------------------------------------------------------------------
+# dataset: freqtrade OHLCV writer
+# --------------------------------------------------------------------
+def legacy_write_json_dataset(market: pd.DataFrame, path: Path):
+    """The original iterrows + json.dumps writer, kept for comparison."""
+    records = []
+    for ts, row in market.iterrows():
+        records.append(
+            {
+                "date": pd.Timestamp(ts).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "open": float(row["open"]),
+                "high": float(row["high"]),
+                "low": float(row["low"]),
+                "close": float(row["close"]),
+                "volume": float(row["volume"]),
+            }
+        )
+    path.write_text(json.dumps(records))
+
+
+def bench_dataset(args: argparse.Namespace):
+    market = synthetic_ohlcv(args.years, args.timeframe)
+    print(f"dataset writer: {len(market):,} candles ({args.years}y {args.timeframe})")
+    rows: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        if not args.skip_legacy:
+            legacy_path = tmp_path / "legacy.json"
+            elapsed, _ = timed(lambda: legacy_write_json_dataset(market, legacy_path))
+            rows.append({"case": "legacy iterrows json", "seconds": f"{elapsed:.2f}",
+                         "MB": f"{legacy_path.stat().st_size / 1e6:.1f}"})
+        for fmt in worker.DATASET_FORMATS:
+            out_dir = tmp_path / fmt
+            elapsed, path = timed(lambda: worker.write_freqtrade_dataset(
+                market, out_dir, "binance", "BTC/USDT", args.timeframe, fmt
+            ))
+            rows.append({"case": f"vectorised {fmt}", "seconds": f"{elapsed:.2f}",
+                         "MB": f"{path.stat().st_size / 1e6:.1f}"})
+    report(rows)
+
+
+# --------------------------------------------------------------------
+# market-read: cached partition reads
+# --------------------------------------------------------------------
+def bytes_read() -> int:
+    """Bytes this process has read through read(2) so far (Linux /proc accounting)."""
+    with open("/proc/self/io") as fh:
+        for line in fh:
+            if line.startswith("rchar:"):
+                return int(line.split()[1])
+    return 0
+
+
+def legacy_read_partition(path: Path, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """The original full read + to_datetime + boolean mask."""
+    df = pd.read_parquet(path)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
+    return df.loc[(df["timestamp"] >= start) & (df["timestamp"] <= end)]
+
+
+def bench_market_read(args: argparse.Namespace):
+    market = synthetic_ohlcv(args.years, args.timeframe).reset_index()
+    start = pd.Timestamp(args.start, tz="UTC")
+    end = start + pd.Timedelta(days=args.days)
+    print(f"market read: {args.days}d window from {len(market):,} candles ({args.years}y {args.timeframe})")
+    worker.BUCKET = None  # keep write_partition local
+    rows: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_paths, new_paths = [], []
+        for year, frame in market.groupby(market["timestamp"].dt.year):
+            legacy_path = Path(tmp) / f"legacy_{year}.parquet"
+            frame.to_parquet(legacy_path, index=False)
+            legacy_paths.append(legacy_path)
+            new_path = Path(tmp) / f"new_{year}.parquet"
+            worker.write_partition(frame, new_path, "unused", args.timeframe, int(year))
+            new_paths.append(new_path)
+        years_touched = range(start.year, end.year + 1)
+        cases = [
+            ("legacy full read + mask", lambda: [
+                legacy_read_partition(p, start, end) for p in legacy_paths if int(p.stem.split("_")[1]) in years_touched
+            ]),
+            ("pushdown read (row groups)", lambda: [
+                worker.read_partition(p, start, end) for p in new_paths if int(p.stem.split("_")[1]) in years_touched
+            ]),
+        ]
+        for name, fn in cases:
+            fn()  # warm the page cache so both cases measure decode, not disk
+            before = bytes_read()
+            elapsed, frames = timed(fn)
+            rows.append({
+                "case": name,
+                "ms": f"{elapsed * 1000:.1f}",
+                "MB read": f"{(bytes_read() - before) / 1e6:.1f}",
+                "rows": sum(len(f) for f in frames),
+            })
+    report(rows)
+
+
+# --------------------------------------------------------------------
+# trades: export loading + normalisation
+# --------------------------------------------------------------------
+def legacy_parse_trade_timestamp(value):
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        unit = "ms" if value > 1e12 else "s"
+        return pd.to_datetime(value, unit=unit, utc=True, errors="coerce")
+    if isinstance(value, str):
+        return pd.to_datetime(value, utc=True, errors="coerce")
+    return None
+
+
+def legacy_load_and_normalize(path: Path) -> List[Dict[str, object]]:
+    """The original json.loads + per-record parse + list sort."""
+    raw_trades = json.loads(path.read_text())["trades"]
+    normalized = []
+    for record in raw_trades:
+        profit = record.get("profit_ratio")
+        if profit is None:
+            pct = record.get("profit_pct")
+            if isinstance(pct, (int, float)):
+                profit = float(pct) / 100.0
+        if profit is None:
+            continue
+        close_ts = legacy_parse_trade_timestamp(
+            record.get("close_timestamp") or record.get("close_time") or record.get("close_date")
+        )
+        if close_ts is None:
+            continue
+        open_ts = legacy_parse_trade_timestamp(
+            record.get("open_timestamp") or record.get("open_time") or record.get("open_date")
+        )
+        normalized.append({
+            "pair": record.get("pair") or "",
+            "open_time": open_ts,
+            "close_time": close_ts,
+            "profit_ratio": float(profit),
+            "profit_abs": worker.safe_metric(record.get("profit_abs") or record.get("profit_amount")),
+            "duration": record.get("trade_duration") or record.get("duration") or record.get("duration_min"),
+        })
+    normalized.sort(key=lambda t: t["close_time"])
+    return normalized
+
+
+def synthetic_trades_export(path: Path, count: int, seed: int = 11):
+    rng = np.random.default_rng(seed)
+    close_ms = 1_609_459_200_000 + np.sort(rng.integers(0, 3 * 365 * 86_400_000, count))
+    profits = rng.normal(0.001, 0.02, count)
+    trades = [
+        {
+            "pair": "BTC/USDT",
+            "open_date": pd.Timestamp(int(c) - 3_600_000, unit="ms", tz="UTC").isoformat(),
+            "close_date": pd.Timestamp(int(c), unit="ms", tz="UTC").isoformat(),
+            "open_timestamp": int(c) - 3_600_000,
+            "close_timestamp": int(c),
+            "profit_ratio": float(p),
+            "profit_abs": float(p) * 1000,
+            "trade_duration": 60,
+        }
+        for c, p in zip(close_ms, profits)
+    ]
+    path.write_text(json.dumps({"trades": trades}))
+
+
+def bench_trades(args: argparse.Namespace):
+    print(f"trades: {args.count:,} trades")
+    rows: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "export.json"
+        synthetic_trades_export(path, args.count)
+        legacy_elapsed, legacy = timed(lambda: legacy_load_and_normalize(path))
+        rows.append({"case": "legacy per-record", "seconds": f"{legacy_elapsed:.2f}", "trades": len(legacy)})
+        elapsed, trades = timed(lambda: worker.normalize_trades(worker.load_trades(path)))
+        rows.append({"case": "columnar", "seconds": f"{elapsed:.2f}", "trades": len(trades),
+                     "speedup": f"{legacy_elapsed / elapsed:.0f}x"})
+        assert [t["close_time"] for t in legacy] == list(trades["close_time"])
+    report(rows)
+
+
+# --------------------------------------------------------------------
+# artifacts: equity/drawdown/trades formats
+# --------------------------------------------------------------------
+def upload_seconds(paths: List[Path]) -> Optional[float]:
+    """Time ArtifactUploader against moto's in-process S3, or None without moto."""
+    try:
+        from moto import mock_aws
+    except ImportError:
+        return None
+    with mock_aws():
+        worker.s3 = worker.mk_s3()
+        worker.BUCKET = "bench"
+        worker.s3.create_bucket(Bucket="bench", CreateBucketConfiguration={"LocationConstraint": worker.REGION})
+        elapsed, _ = timed(lambda: upload_all(paths))
+    return elapsed
+
+
+def upload_all(paths: List[Path]):
+    with worker.ArtifactUploader() as uploader:
+        for path in paths:
+            uploader.submit("bench", path)
+
+
+def bench_artifacts(args: argparse.Namespace):
+    rng = np.random.default_rng(13)
+    close = pd.Timestamp("2021-01-01", tz="UTC") + pd.to_timedelta(
+        np.sort(rng.integers(0, 3 * 365 * 86_400, args.count)), unit="s"
+    )
+    profits = rng.normal(0.0005, 0.01, args.count)
+    trades = pd.DataFrame({
+        "pair": "BTC/USDT",
+        "open_time": close - pd.Timedelta(minutes=45),
+        "close_time": close,
+        "profit_ratio": profits,
+        "profit_abs": profits * 1000,
+        "duration": 45,
+    })
+    series = worker.build_equity_series(trades, 10_000.0)
+    tables = {
+        "equity": series[["timestamp", "equity"]],
+        "drawdown": series[["timestamp", "drawdown"]],
+        "trades": trades,
+    }
+    print(f"artifacts: {args.count:,} trades (equity + drawdown + trades tables)")
+    worker.log = lambda msg: None
+    rows: List[Dict[str, object]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in worker.ARTIFACT_FORMAT_CHOICES:
+            out_dir = Path(tmp) / fmt
+            out_dir.mkdir()
+            elapsed, artifacts = timed(lambda: [
+                a for name, frame in tables.items() for a in worker.write_table_artifact(frame, out_dir, name, [fmt])
+            ])
+            paths = [Path(a["path"]) for a in artifacts]
+            size = sum(p.stat().st_size for p in paths)
+            row: Dict[str, object] = {
+                "case": fmt,
+                "write s": f"{elapsed:.2f}",
+                "MB": f"{size / 1e6:.1f}",
+                f"upload s @{args.mbps}Mbit": f"{size * 8 / (args.mbps * 1e6):.1f}",
+            }
+            uploaded = upload_seconds(paths)
+            if uploaded is not None:
+                row["moto upload s"] = f"{uploaded:.2f}"
+            rows.append(row)
+    report(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("dataset", help="freqtrade OHLCV dataset writer")
+    p.add_argument("--years", type=int, default=3)
+    p.add_argument("--timeframe", default="1m")
+    p.add_argument("--skip-legacy", action="store_true", help="skip the slow iterrows baseline")
+    p.set_defaults(func=bench_dataset)
+
+    p = sub.add_parser("market-read", help="cached OHLCV partition reads")
+    p.add_argument("--years", type=int, default=3)
+    p.add_argument("--timeframe", default="1m")
+    p.add_argument("--start", default="2022-06-01")
+    p.add_argument("--days", type=int, default=14)
+    p.set_defaults(func=bench_market_read)
+
+    p = sub.add_parser("trades", help="trades export loading + normalisation")
+    p.add_argument("--count", type=int, default=100_000)
+    p.set_defaults(func=bench_trades)
+
+    p = sub.add_parser("artifacts", help="equity/drawdown/trades artifact formats")
+    p.add_argument("--count", type=int, default=200_000)
+    p.add_argument("--mbps", type=int, default=50, help="uplink used for the upload-time estimate")
+    p.set_defaults(func=bench_artifacts)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
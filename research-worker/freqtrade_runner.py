@@ -0,0 +1,63 @@
+"""
+Warm freqtrade runner: the child process behind worker.FreqtradeRunner.
+
+Imports nothing beyond the standard library before freqtrade, so a warm
+runner costs freqtrade's own footprint rather than the research worker's
+(boto3, ccxt, pyarrow) on top of it:
+
+    python -u research-worker/freqtrade_runner.py
+"""
+import json
+import os
+import sys
+import traceback
+
+
+def main():
+    """
+    Read one request per line from stdin, run the freqtrade command
+    in-process (what `freqtrade.main` does, without re-importing anything)
+    with fds 1/2 redirected to the request's log file, and reply
+    {"returncode": N} on the original stdout.
+    """
+    replies = os.fdopen(os.dup(1), "w", buffering=1)
+    os.dup2(2, 1)  # stray prints must not corrupt the reply stream
+    try:
+        from freqtrade.commands import Arguments
+        from freqtrade.loggers import setup_logging_pre
+    except Exception as exc:
+        replies.write(json.dumps({"ready": False, "error": f"{type(exc).__name__}: {exc}"}) + "\n")
+        return
+    setup_logging_pre()
+    replies.write(json.dumps({"ready": True}) + "\n")
+
+    home = os.getcwd()
+    for line in sys.stdin:
+        request = json.loads(line)
+        os.environ.update(request.get("env") or {})
+        os.chdir(request["cwd"])
+        log_fd = os.open(request["logPath"], os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        saved = (os.dup(1), os.dup(2))
+        os.dup2(log_fd, 1)
+        os.dup2(log_fd, 2)
+        try:
+            args = Arguments(request["args"]).get_parsed_arg()
+            code = args["func"](args) or 0
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 1
+        except BaseException:
+            traceback.print_exc()
+            code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(saved[0], 1)
+            os.dup2(saved[1], 2)
+            for fd in (*saved, log_fd):
+                os.close(fd)
+            os.chdir(home)
+        replies.write(json.dumps({"returncode": code}) + "\n")
+
+
+if __name__ == "__main__":
+    main()
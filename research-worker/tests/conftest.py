@@ -0,0 +1,179 @@
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import ccxt
+import pandas as pd
+import pytest
+from moto import mock_aws
+
+# worker.py builds its boto3 clients at import time; give them a region and
+# dummy credentials so the tests never need a real AWS environment.
+os.environ.setdefault("AWS_REGION", "ap-southeast-2")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import worker  # noqa: E402
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def ms(value: str) -> int:
+    return pd.Timestamp(value, tz="UTC").value // 1_000_000
+
+
+class FakeExchange:
+    """Serves deterministic hourly candles between `first` and `last`, like ccxt's fetch_ohlcv."""
+
+    has = {"fetchOHLCV": True}
+    rateLimit = 0
+    first = ms("2021-01-01")
+    last = ms("2022-01-01")
+    calls = []
+    failures = {}
+    lock = threading.Lock()
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        with self.lock:
+            self.calls.append(since)
+            if self.failures.get(since, 0) > 0:
+                self.failures[since] -= 1
+                raise ccxt.NetworkError("flaky")
+        start = max(since, self.first)
+        start += (-(start - self.first)) % HOUR_MS
+        return [
+            [ts, 1.0, 2.0, 0.5, ts / HOUR_MS, 10.0]
+            for ts in range(start, min(start + limit * HOUR_MS, self.last), HOUR_MS)
+        ]
+
+
+@pytest.fixture
+def fake_exchange(monkeypatch):
+    monkeypatch.setattr(FakeExchange, "calls", [])
+    monkeypatch.setattr(FakeExchange, "failures", {})
+    monkeypatch.setattr(worker, "mk_exchange", lambda exchange_id: FakeExchange())
+    monkeypatch.setattr(worker, "_rate_limiters", {})
+    return FakeExchange
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Pins worker's wall clock; set `clock.now` to an ISO timestamp."""
+
+    class Clock:
+        now = "2030-01-01"
+
+    monkeypatch.setattr(worker.time, "time", lambda: ms(Clock.now) / 1000)
+    return Clock
+
+
+@pytest.fixture(autouse=True)
+def fresh_frame_cache(monkeypatch):
+    # The in-process frame cache is module state; keep tests independent
+    monkeypatch.setattr(worker, "frame_cache", worker.FrameCache(64 * 1024 * 1024))
+
+
+@pytest.fixture
+def bucket(monkeypatch, tmp_path):
+    """A moto S3 bucket wired into worker.s3 / worker.BUCKET; yields the client."""
+    with mock_aws():
+        client = worker.mk_s3()
+        client.create_bucket(Bucket="research-artifacts", CreateBucketConfiguration={"LocationConstraint": worker.REGION})
+        monkeypatch.setattr(worker, "s3", client)
+        monkeypatch.setattr(worker, "BUCKET", "research-artifacts")
+        monkeypatch.setattr(worker, "object_cache", worker.ObjectCache(tmp_path / "strategy-cache"))
+        yield client
+
+
+FAKE_FREQTRADE = '''
+import json, os, sys
+args = sys.argv[1:]
+config = json.load(open(args[args.index("--config") + 1]))
+params = json.dumps(config.get("model_params") or {}, sort_keys=True)
+if os.getenv("FAKE_FREQTRADE_FAIL") and os.environ["FAKE_FREQTRADE_FAIL"] in params:
+    sys.exit(2)
+profit = (sum(map(ord, params)) % 7 - 3) / 100
+trades = [{"pair": "BTC/USDT", "open_timestamp": 1641013200000 + i * 86400000,
+           "close_timestamp": 1641016800000 + i * 86400000, "profit_ratio": profit, "profit_abs": profit * 1000,
+           "trade_duration": 60} for i in range(5)]
+json.dump({"trades": trades}, open(args[args.index("--export-filename") + 1], "w"))
+print(f"datadir {config['datadir']}")
+print(f"ppid {os.getppid()}")
+'''
+
+
+@pytest.fixture
+def fake_freqtrade(monkeypatch, tmp_path):
+    """A `freqtrade` CLI stand-in (FREQTRADE_BIN) that writes five trades per run, also for spawned engine workers."""
+    path = tmp_path / "freqtrade"
+    path.write_text(f"#!{sys.executable}\n{FAKE_FREQTRADE}")
+    path.chmod(0o755)
+    monkeypatch.setenv("FREQTRADE_BIN", str(path))
+    monkeypatch.setenv("FREQTRADE_RUNNER", "cli")
+    monkeypatch.setattr(worker, "FREQTRADE_RUNNER", "cli")
+    return path
+
+
+class JobRunner:
+    """Runs kind handlers against the moto bucket with a stub engine; see the `job_runner` fixture."""
+
+    handlers = {"grid": "handle_grid", "walkforward": "handle_walkforward", "optimize": "handle_optimize"}
+
+    def __init__(self, client, monkeypatch, tmp_path, stub_dataset=True):
+        self.client = client
+        self.monkeypatch = monkeypatch
+        self.tmp_path = tmp_path
+        self.calls = []
+        client.put_object(Bucket=worker.BUCKET, Key="strategies/s/main.py", Body=b"class S:\n    pass\n")
+        if stub_dataset:
+            monkeypatch.setattr(worker, "prepare_dataset", lambda spec, workdir, fmt: workdir / "dataset")
+
+    def job(self, run_id="g", kind="grid", **fields):
+        return {"runId": run_id, "strategyId": "s", "manifestS3Key": "strategies/s/main.py",
+                "artifactPrefix": f"runs/{run_id}/", "kind": kind, "spec": {}, **fields}
+
+    def batch(self, fake_batch):
+        """Replace run_engine_batch outright, e.g. with a generator that crashes part-way."""
+        self.monkeypatch.setattr(worker, "run_engine_batch", fake_batch)
+
+    def engine(self, outcome, reverse=False):
+        """Each run's engine_out is `outcome(call)`; an exception it raises becomes that run's error."""
+        def fake_batch(calls, concurrency, pool=None):
+            for pos in reversed(range(len(calls))) if reverse else range(len(calls)):
+                self.calls.append(calls[pos])
+                try:
+                    engine_out = outcome(calls[pos])
+                except Exception as exc:
+                    yield pos, None, exc
+                    continue
+                yield pos, {"artifacts": [], **engine_out}, None
+        self.batch(fake_batch)
+
+    def kpis(self, score, reverse=False):
+        self.engine(lambda call: {"kpis": score(call)}, reverse)
+
+    def run(self, job, workdir=None, writer=None):
+        handler = getattr(worker, self.handlers[job["kind"]])
+        return handler(job, workdir or self.tmp_path / job["runId"], writer)
+
+    def get(self, key):
+        return self.client.get_object(Bucket=worker.BUCKET, Key=key)["Body"].read()
+
+    def get_json(self, key):
+        return json.loads(self.get(key))
+
+
+@pytest.fixture
+def job_runner(bucket, monkeypatch, tmp_path):
+    """Stub strategy in `bucket`, no dataset preparation, and a JobRunner to build and run jobs."""
+    return JobRunner(bucket, monkeypatch, tmp_path)
+
+
+@pytest.fixture
+def freqtrade_job_runner(bucket, fake_freqtrade, monkeypatch, tmp_path):
+    """A JobRunner whose jobs prepare real datasets and run the `fake_freqtrade` CLI."""
+    return JobRunner(bucket, monkeypatch, tmp_path, stub_dataset=False)
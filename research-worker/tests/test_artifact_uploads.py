@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import worker
+
+
+def keys(client, prefix=""):
+    return sorted(o["Key"] for o in client.list_objects_v2(Bucket=worker.BUCKET, Prefix=prefix).get("Contents", []))
+
+
+def test_streams_files_and_uses_multipart_for_large_ones(bucket, tmp_path):
+    small = tmp_path / "equity.csv"
+    small.write_text("timestamp,equity\n")
+    large = tmp_path / "trades.parquet"
+    large.write_bytes(b"x" * (20 * 1024 * 1024))
+
+    with worker.ArtifactUploader() as uploader:
+        uploader.submit("runs/r1/", small, content_type="text/csv")
+        uploader.submit("runs/r1", large, "big.parquet")
+
+    assert keys(bucket) == ["runs/r1/big.parquet", "runs/r1/equity.csv"]
+    head = bucket.head_object(Bucket=worker.BUCKET, Key="runs/r1/equity.csv")
+    assert head["ContentType"] == "text/csv"
+    big = bucket.head_object(Bucket=worker.BUCKET, Key="runs/r1/big.parquet")
+    assert big["ContentLength"] == 20 * 1024 * 1024
+    assert big["ETag"].strip('"').endswith("-3")  # three 8 MB parts
+
+
+def test_uploads_overlap_and_failures_surface_on_exit(bucket, tmp_path, monkeypatch):
+    active, peak = [0], [0]
+    lock = threading.Lock()
+    real_upload = worker.upload_file
+
+    def slow_upload(path, key, *args):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        real_upload(path, key, *args)
+
+    monkeypatch.setattr(worker, "upload_file", slow_upload)
+    files = []
+    for i in range(8):
+        files.append(tmp_path / f"{i}.csv")
+        files[-1].write_text(str(i))
+
+    with pytest.raises(FileNotFoundError):
+        with worker.ArtifactUploader(concurrency=4) as uploader:
+            for path in files:
+                uploader.submit("runs/r2", path)
+            uploader.submit("runs/r2", tmp_path / "missing.csv")
+
+    assert peak[0] == 4
+    assert len(keys(bucket, "runs/r2/")) == 8
+
+
+def test_grid_uploads_every_member_before_the_index(job_runner, monkeypatch):
+    def equity(call):
+        out = call["workdir"] / "equity.csv"
+        out.write_text("timestamp,equity\n")
+        artifacts = [{"path": str(out), "name": "equity.csv", "content_type": "text/csv"}]
+        return {"kpis": {"netReturn": call["params"]["p"] / 10, "trades": 1}, "artifacts": artifacts}
+
+    index_seen_with = []
+    real_put_json = worker.s3_put_json
+
+    def put_json(key, obj, **kwargs):
+        if key.endswith("grid/index.json"):
+            listed = [c["index"] for c in obj["children"]]
+            index_seen_with.append((obj["partial"], listed, keys(job_runner.client, "runs/g/grid/0")))
+        real_put_json(key, obj, **kwargs)
+
+    job_runner.engine(equity)
+    monkeypatch.setattr(worker, "s3_put_json", put_json)
+
+    job_runner.run(job_runner.job(grid=[{"p": i} for i in range(5)]))
+
+    # Every index write (partial after the first member, then the final one)
+    # only lists members whose artifacts are already in S3
+    assert [(partial, listed) for partial, listed, _ in index_seen_with] == [(True, [0]), (False, [0, 1, 2, 3, 4])]
+    for _, listed, uploaded in index_seen_with:
+        for i in listed:
+            assert {f"runs/g/grid/{i:03d}/equity.csv", f"runs/g/grid/{i:03d}/metrics.json"} <= set(uploaded)
+    assert job_runner.get_json("runs/g/grid/003/metrics.json")["kpis"]["netReturn"] == 0.3
+
+
+def test_compressed_formats_round_trip_and_upload_with_encoding(bucket, tmp_path):
+    trades = pd.DataFrame({
+        "pair": "BTC/USDT",
+        "open_time": pd.date_range("2022-01-01", periods=3, freq="h", tz="UTC"),
+        "close_time": pd.date_range("2022-01-01 00:30", periods=3, freq="h", tz="UTC"),
+        "profit_ratio": [0.01, -0.02, 0.03],
+        "profit_abs": [10.0, -20.0, 30.0],
+        "duration": [30, 30, 30],
+    })
+    period = (pd.Timestamp("2022-01-01", tz="UTC"), pd.Timestamp("2022-02-01", tz="UTC"))
+    out = worker.write_engine_outputs(
+        tmp_path, trades, 1000.0, period, tmp_path / "logs.txt", [], ["csv", "csv.gz", "parquet"]
+    )
+
+    assert out["artifactFormats"] == ["csv", "csv.gz", "parquet"]
+    assert pd.read_csv(tmp_path / "trades.csv.gz").equals(pd.read_csv(tmp_path / "trades.csv"))
+    assert pd.read_parquet(tmp_path / "trades.parquet").equals(trades)
+    equity = pd.read_parquet(tmp_path / "equity.parquet")
+    assert equity["equity"].tolist() == pd.read_csv(tmp_path / "equity.csv")["equity"].tolist()
+
+    with worker.ArtifactUploader() as uploader:
+        uploader.submit_artifacts("runs/f", out["artifacts"])
+    head = bucket.head_object(Bucket=worker.BUCKET, Key="runs/f/trades.csv.gz")
+    assert (head["ContentType"], head["ContentEncoding"]) == ("text/csv", "gzip")
+    assert len(keys(bucket, "runs/f/")) == 10
+
+
+def test_artifact_formats_resolution(monkeypatch):
+    monkeypatch.setattr(worker, "ARTIFACT_FORMATS", "csv, parquet")
+    assert worker.resolve_artifact_formats(None) == ["csv", "parquet"]
+    assert worker.resolve_artifact_formats(["CSV.GZ", "xlsx", "csv.gz"]) == ["csv.gz"]
+    assert worker.resolve_artifact_formats("xlsx") == ["csv"]
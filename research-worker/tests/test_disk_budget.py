@@ -0,0 +1,83 @@
+import os
+
+import worker
+
+
+def make_file(path, size, mtime):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def make_workdir(root, name, size, mtime):
+    workdir = root / name
+    make_file(workdir / "equity.csv", size, mtime)
+    os.utime(workdir, (mtime, mtime))
+    return workdir
+
+
+def budget(tmp_path, limit):
+    return worker.DiskBudget(limit, tmp_path / "market-data", tmp_path / "workdir", tmp_path / "strategy-cache")
+
+
+def test_evicts_least_recently_used_until_under_budget(tmp_path):
+    old = make_file(tmp_path / "market-data" / "a_2021.parquet", 400, 1_000)
+    mid = make_workdir(tmp_path / "workdir", "r_old", 400, 2_000)
+    new = make_file(tmp_path / "market-data" / "a_2022.parquet", 400, 3_000)
+
+    budget(tmp_path, 900).enforce()
+
+    assert not old.exists()
+    assert mid.exists()
+    assert new.exists()
+
+
+def test_cached_objects_are_evicted_but_not_in_progress_downloads(tmp_path):
+    stale = make_file(tmp_path / "strategy-cache" / ("a" * 32), 400, 1_000)
+    partition = make_file(tmp_path / "market-data" / "a_2021.parquet", 400, 2_000)
+    downloading = make_file(tmp_path / "strategy-cache" / ".b.tmp", 400, 500)
+
+    budget(tmp_path, 500).enforce()
+
+    assert not stale.exists()
+    assert partition.exists() and downloading.exists()
+
+
+def test_active_workdirs_are_never_evicted(tmp_path):
+    running = make_workdir(tmp_path / "workdir", "r_running", 500, 1_000)
+    partition = make_file(tmp_path / "market-data" / "a_2021.parquet", 500, 2_000)
+    db = budget(tmp_path, 600)
+    db.job_started(running)
+
+    db.enforce()
+
+    assert running.exists()
+    assert not partition.exists()
+    assert db.evictions == 1
+
+
+def test_finished_workdir_becomes_evictable(tmp_path):
+    finished = make_workdir(tmp_path / "workdir", "r_done", 500, 1_000)
+    db = budget(tmp_path, 100)
+    db.job_started(finished)
+    db.enforce()
+    assert finished.exists()
+
+    db.job_finished(finished)
+    db.enforce()
+    assert not finished.exists()
+
+
+def test_cache_hits_refresh_recency(tmp_path):
+    first = make_file(tmp_path / "market-data" / "a_2021.parquet", 400, 1_000)
+    second = make_file(tmp_path / "market-data" / "a_2022.parquet", 400, 2_000)
+    db = budget(tmp_path, 500)
+
+    db.record_partition(first, hit=True)
+    db.record_partition(tmp_path / "market-data" / "a_2023.parquet", hit=False)
+    db.enforce()
+
+    assert first.exists()
+    assert not second.exists()
+    assert (db.hits, db.misses, db.evictions) == (1, 1, 1)
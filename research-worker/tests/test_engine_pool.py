@@ -0,0 +1,28 @@
+import os
+from pathlib import Path
+
+import worker
+
+SPEC = {"exchange": "binance", "pair": "BTC/USDT", "timeframe": "1h", "start": "2022-01-01", "end": "2022-02-01"}
+
+
+def test_grid_members_run_in_worker_processes(fake_freqtrade, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_FREQTRADE_FAIL", '"p": 1')
+    strategy = tmp_path / "strategy_payload"
+    strategy.write_text("class S:\n    pass\n")
+    (tmp_path / "dataset").mkdir()
+    calls = []
+    for i in range(3):
+        (tmp_path / f"grid_{i}").mkdir()
+        calls.append({"strategy_path": strategy, "workdir": tmp_path / f"grid_{i}", "spec": SPEC,
+                      "params": {"p": i}, "dataset_dir": tmp_path / "dataset"})
+
+    results = {pos: (out, err) for pos, out, err in worker.run_engine_batch(calls, concurrency=2)}
+
+    assert sorted(results) == [0, 1, 2]
+    assert "freqtrade exited with 2" in str(results[1][1])
+    for pos in (0, 2):
+        out, err = results[pos]
+        assert err is None and out["kpis"]["trades"] == 5
+        logs = next(Path(a["path"]) for a in out["artifacts"] if a["name"] == "logs.txt").read_text()
+        assert f"ppid {os.getpid()}" not in logs and "ppid " in logs
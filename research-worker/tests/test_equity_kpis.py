@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import worker
+
+PERIOD = (pd.Timestamp("2021-01-01", tz="UTC"), pd.Timestamp("2022-06-30", tz="UTC"))
+
+
+# Reference implementations: the per-trade loops these functions replaced.
+def legacy_build_equity_series(trades, initial_cash):
+    equity = initial_cash
+    peak = initial_cash
+    equity_rows, drawdown_rows = [], []
+    for trade in trades:
+        equity *= 1 + float(trade["profit_ratio"])
+        if equity > peak:
+            peak = equity
+        dd = (equity / peak) - 1
+        timestamp = trade["close_time"].isoformat()
+        equity_rows.append({"timestamp": timestamp, "equity": equity})
+        drawdown_rows.append({"timestamp": timestamp, "drawdown": dd})
+    return equity_rows, drawdown_rows
+
+
+def legacy_compute_kpis(trades, equity_rows, drawdown_rows, period, initial_cash):
+    start, end = period
+    returns = [float(trade["profit_ratio"]) for trade in trades]
+    net_return = equity_rows[-1]["equity"] / initial_cash - 1 if equity_rows else 0.0
+    duration_days = max((end - start).total_seconds() / 86400.0, 1)
+    years = duration_days / 365.25
+    growth_base = 1 + net_return
+    cagr = net_return if growth_base <= 0 or years <= 0 else growth_base ** (1 / years) - 1
+    sharpe = sortino = 0.0
+    if returns:
+        mean_ret = float(np.mean(returns))
+        std_ret = float(np.std(returns))
+        downside = [r for r in returns if r < 0]
+        sharpe = (mean_ret / std_ret) * math.sqrt(len(returns)) if std_ret > 0 else 0.0
+        downside_std = float(np.std(downside)) if downside else 0.0
+        sortino = (mean_ret / downside_std) * math.sqrt(len(returns)) if downside_std > 0 else 0.0
+    max_dd = min((row["drawdown"] for row in drawdown_rows), default=0.0)
+    win_rate = sum(1 for r in returns if r > 0) / len(returns) if returns else 0.0
+    avg_trade = float(np.mean(returns)) if returns else 0.0
+    return {
+        "netReturn": worker.safe_metric(net_return),
+        "cagr": worker.safe_metric(cagr),
+        "sharpe": worker.safe_metric(sharpe),
+        "sortino": worker.safe_metric(sortino),
+        "maxDD": worker.safe_metric(max_dd),
+        "winRate": worker.safe_metric(win_rate),
+        "avgTrade": worker.safe_metric(avg_trade),
+        "trades": len(returns),
+    }
+
+
+def make_trades(profits):
+    close = pd.date_range("2021-01-01", periods=len(profits), freq="6h", tz="UTC")
+    return pd.DataFrame({
+        "pair": "BTC/USDT",
+        "open_time": close - pd.Timedelta(hours=1),
+        "close_time": close,
+        "profit_ratio": np.asarray(profits, dtype="float64"),
+        "profit_abs": 0.0,
+        "duration": 60,
+    })
+
+
+@pytest.mark.parametrize(
+    "profits",
+    [
+        np.random.default_rng(1).normal(0.001, 0.02, 5000),
+        np.random.default_rng(2).normal(-0.002, 0.05, 300),
+        [0.01, 0.02, 0.03],  # no losses -> sortino 0
+        [-0.5, -0.6, -0.99],  # deep drawdown
+        [0.0, 0.0],  # zero variance
+        [],
+    ],
+)
+def test_vectorised_series_and_kpis_match_the_loop(profits):
+    trades = make_trades(profits)
+    records = trades.to_dict("records")
+
+    series = worker.build_equity_series(trades, 10_000.0)
+    kpis = worker.compute_kpis(trades["profit_ratio"].to_numpy(), series, PERIOD, 10_000.0)
+
+    equity_rows, drawdown_rows = legacy_build_equity_series(records, 10_000.0)
+    assert list(series["equity"]) == [row["equity"] for row in equity_rows]
+    assert list(series["drawdown"]) == [row["drawdown"] for row in drawdown_rows]
+    assert list(worker.iso_utc(series["timestamp"])) == [row["timestamp"] for row in equity_rows]
+    assert kpis == legacy_compute_kpis(records, equity_rows, drawdown_rows, PERIOD, 10_000.0)
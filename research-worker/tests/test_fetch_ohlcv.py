@@ -0,0 +1,83 @@
+import threading
+
+import pandas as pd
+import pytest
+
+import worker
+from conftest import HOUR_MS, ms
+
+
+def expected_index():
+    return pd.date_range("2021-01-01", "2022-01-01", freq="1h", tz="UTC", inclusive="left")
+
+
+@pytest.mark.parametrize("concurrency", [1, 4, 16])
+def test_segments_are_stitched_in_order_without_duplicates(fake_exchange, monkeypatch, concurrency):
+    monkeypatch.setattr(worker, "OHLCV_FETCH_CONCURRENCY", concurrency)
+    df = worker.fetch_ohlcv_year("fake", "BTC/USDT", "1h", 2021)
+
+    assert list(df.columns) == ["timestamp", "open", "high", "low", "close", "volume"]
+    assert df["timestamp"].is_monotonic_increasing
+    assert df["timestamp"].is_unique
+    pd.testing.assert_index_equal(pd.DatetimeIndex(df["timestamp"]), expected_index(), check_names=False)
+
+
+def test_concurrent_fetch_matches_serial_fetch(fake_exchange, monkeypatch):
+    monkeypatch.setattr(worker, "OHLCV_FETCH_CONCURRENCY", 1)
+    serial = worker.fetch_ohlcv_year("fake", "BTC/USDT", "1h", 2021)
+    monkeypatch.setattr(worker, "OHLCV_FETCH_CONCURRENCY", 6)
+    concurrent = worker.fetch_ohlcv_year("fake", "BTC/USDT", "1h", 2021)
+    pd.testing.assert_frame_equal(serial, concurrent)
+
+
+def test_segment_boundaries_are_candle_aligned():
+    since = 0
+    until = 8760 * HOUR_MS
+    segments = worker.ohlcv_segments(since, until, HOUR_MS, 4)
+
+    assert segments[0][0] == since
+    assert segments[-1][1] == until
+    assert all(prev_end == start for (_, prev_end), (start, _) in zip(segments, segments[1:]))
+    assert all(start % HOUR_MS == 0 for start, _ in segments)
+    assert len(segments) == 4
+
+
+def test_small_ranges_are_not_split_below_one_page():
+    segments = worker.ohlcv_segments(0, 100 * HOUR_MS, HOUR_MS, 8)
+    assert segments == [(0, 100 * HOUR_MS)]
+
+
+def test_exchange_errors_are_retried(fake_exchange, monkeypatch):
+    monkeypatch.setattr(worker, "OHLCV_FETCH_CONCURRENCY", 1)
+    monkeypatch.setattr(worker.time, "sleep", lambda _seconds: None)
+    start = ms("2021-01-01")
+    fake_exchange.failures = {start: 2}
+
+    df = worker.fetch_ohlcv_year("fake", "BTC/USDT", "1h", 2021)
+
+    assert fake_exchange.calls[:3] == [start, start, start]
+    assert len(df) == len(expected_index())
+
+
+def test_rate_limiter_is_shared_per_exchange(monkeypatch):
+    monkeypatch.setattr(worker, "_rate_limiters", {})
+    a = worker.exchange_rate_limiter("binance", 0.05)
+    b = worker.exchange_rate_limiter("binance", 0.05)
+    c = worker.exchange_rate_limiter("kraken", 0.05)
+    assert a is b
+    assert a is not c
+
+
+def test_rate_limiter_spaces_calls_across_threads(monkeypatch):
+    slept = []
+    monkeypatch.setattr(worker.time, "sleep", slept.append)
+    monkeypatch.setattr(worker.time, "monotonic", lambda: 100.0)
+    limiter = worker.RateLimiter(0.5)
+
+    threads = [threading.Thread(target=limiter.wait) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(slept) == [0.5, 1.0, 1.5]
@@ -0,0 +1,74 @@
+import pandas as pd
+
+import worker
+
+KEY = ("binance", "btc-usdt", "1h", 2021)
+
+
+def ts(value):
+    return pd.Timestamp(value, tz="UTC")
+
+
+def make_loader(calls):
+    def loader(lo, hi):
+        calls.append((lo, hi))
+        index = pd.date_range(lo, hi, freq="1h")
+        return pd.DataFrame({"timestamp": index, "close": range(len(index))})
+
+    return loader
+
+
+def test_requests_inside_the_cached_range_are_sliced_from_memory():
+    cache = worker.FrameCache(10 * 1024 * 1024)
+    calls = []
+    first = cache.load(KEY, 1, ts("2021-03-01"), ts("2021-03-31"), make_loader(calls))
+    second = cache.load(KEY, 1, ts("2021-03-10"), ts("2021-03-12"), make_loader(calls))
+
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second["timestamp"].min() == ts("2021-03-10")
+    assert second["timestamp"].max() == ts("2021-03-12")
+    assert len(first) == 30 * 24 + 1
+
+
+def test_wider_request_reloads_the_union_range():
+    cache = worker.FrameCache(10 * 1024 * 1024)
+    calls = []
+    cache.load(KEY, 1, ts("2021-03-01"), ts("2021-03-31"), make_loader(calls))
+    cache.load(KEY, 1, ts("2021-04-01"), ts("2021-04-10"), make_loader(calls))
+    cache.load(KEY, 1, ts("2021-03-15"), ts("2021-04-05"), make_loader(calls))
+
+    assert calls[1] == (ts("2021-03-01"), ts("2021-04-10"))
+    assert len(calls) == 2
+
+
+def test_rewritten_partition_is_reloaded():
+    cache = worker.FrameCache(10 * 1024 * 1024)
+    calls = []
+    cache.load(KEY, 1, ts("2021-03-01"), ts("2021-03-31"), make_loader(calls))
+    cache.load(KEY, 2, ts("2021-03-01"), ts("2021-03-31"), make_loader(calls))
+    assert len(calls) == 2
+
+
+def test_evicts_least_recently_used_entries_by_bytes():
+    calls = []
+    probe = make_loader([])(ts("2021-01-01"), ts("2021-01-31"))
+    entry_bytes = int(probe.memory_usage(index=True).sum())
+    cache = worker.FrameCache(int(entry_bytes * 2.5))
+
+    for year in (2019, 2020, 2021):
+        cache.load(("x", "y", "1h", year), 1, ts("2021-01-01"), ts("2021-01-31"), make_loader(calls))
+    cache.load(("x", "y", "1h", 2020), 1, ts("2021-01-01"), ts("2021-01-31"), make_loader(calls))
+    cache.load(("x", "y", "1h", 2019), 1, ts("2021-01-01"), ts("2021-01-31"), make_loader(calls))
+
+    assert cache.bytes <= cache.max_bytes
+    assert len(calls) == 4  # 2019 had been evicted, 2020 was still cached
+
+
+def test_frames_larger_than_the_budget_are_not_cached():
+    cache = worker.FrameCache(1024)
+    calls = []
+    cache.load(KEY, 1, ts("2021-03-01"), ts("2021-03-31"), make_loader(calls))
+    cache.load(KEY, 1, ts("2021-03-01"), ts("2021-03-31"), make_loader(calls))
+    assert len(calls) == 2
+    assert cache.bytes == 0
@@ -0,0 +1,49 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import worker
+
+SPEC = {"exchange": "binance", "pair": "BTC/USDT", "timeframe": "1h", "start": "2022-01-01", "end": "2022-02-01"}
+
+
+def market_frame():
+    index = pd.date_range("2022-01-01", "2022-02-01", freq="1h", tz="UTC", name="timestamp")
+    close = 100 + np.arange(len(index)) * 0.01
+    return pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 2.0},
+                        index=index)
+
+
+def test_grid_members_share_one_prepared_dataset(freqtrade_job_runner, tmp_path, monkeypatch):
+    loads = []
+    monkeypatch.setattr(worker, "ensure_market_data", lambda spec, cache_dir: loads.append(spec) or market_frame())
+    monkeypatch.setattr(worker, "GRID_CONCURRENCY", 1)
+    job = freqtrade_job_runner.job(grid=[{"p": i} for i in range(3)], spec=SPEC)
+
+    freqtrade_job_runner.run(job, tmp_path)
+
+    assert len(loads) == 1
+    assert (tmp_path / "dataset" / "binance" / "BTC_USDT-1h.feather").exists()
+    for i in range(3):
+        logs = freqtrade_job_runner.get(f"runs/g/grid/{i:03d}/logs.txt").decode()
+        assert f"datadir {tmp_path / 'dataset'}" in logs
+        assert not (tmp_path / f"grid_{i:03d}" / "freqtrade" / "user_data" / "data" / "binance").exists()
+
+
+@pytest.mark.parametrize("data_format", worker.DATASET_FORMATS)
+def test_dataset_formats_round_trip(tmp_path, data_format):
+    market = market_frame()
+
+    path = worker.write_freqtrade_dataset(market, tmp_path, "Binance", "BTC/USDT", "1h", data_format)
+
+    assert path == tmp_path / "binance" / f"BTC_USDT-1h.{data_format}"
+    if data_format == "json":
+        rows = json.loads(path.read_text())
+        assert rows[0] == [1640995200000, 100.0, 101.0, 99.0, 100.0, 2.0] and len(rows) == len(market)
+        return
+    frame = pd.read_feather(path) if data_format == "feather" else pd.read_parquet(path)
+    assert list(frame.columns) == ["date", "open", "high", "low", "close", "volume"]
+    assert frame["date"].tolist() == list(market.index)
+    assert np.array_equal(frame[["open", "high", "low", "close", "volume"]].to_numpy(), market.to_numpy())
@@ -0,0 +1,113 @@
+import re
+import threading
+
+import pytest
+
+import worker
+
+FAKE_COMMANDS = '''
+import os
+import sys
+
+ballast = []
+
+
+class Arguments:
+    def __init__(self, args):
+        self.args = args
+
+    def get_parsed_arg(self):
+        return {"func": backtest, "argv": self.args}
+
+
+def backtest(args):
+    argv = args["argv"]
+    print("pid", os.getpid(), " ".join(argv))
+    print("userdir", os.environ.get("FREQTRADE_USERDIR"), file=sys.stderr)
+    print("heavy", sorted(m for m in ("boto3", "ccxt", "pyarrow", "pandas") if m in sys.modules))
+    if "--fail" in argv:
+        raise SystemExit(2)
+    if "--crash" in argv:
+        os._exit(9)
+    if "--grow" in argv:
+        ballast.append(b"x" * 64 * 1024 * 1024)
+    return 0
+'''
+
+
+@pytest.fixture
+def fake_freqtrade_package(tmp_path, monkeypatch):
+    pkg = tmp_path / "site" / "freqtrade"
+    (pkg / "commands").mkdir(parents=True)
+    (pkg / "__init__.py").write_text("")
+    (pkg / "loggers.py").write_text("def setup_logging_pre():\n    pass\n")
+    (pkg / "commands" / "__init__.py").write_text(FAKE_COMMANDS)
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path / "site"))
+    return pkg
+
+
+@pytest.fixture
+def runner():
+    runner = worker.FreqtradeRunner(max_runs=3, max_rss_mb=4096)
+    yield runner
+    runner.stop()
+
+
+def backtest(runner, tmp_path, *args):
+    log_path = tmp_path / "logs.txt"
+    log_path.write_text("$ freqtrade\n")
+    code = runner.run(["backtesting", *args], tmp_path, log_path, {"FREQTRADE_USERDIR": "/ud"})
+    text = log_path.read_text()
+    return code, int(re.search(r"pid (\d+)", text).group(1)), text
+
+
+def test_runs_share_one_warm_process_and_capture_output(fake_freqtrade_package, runner, tmp_path):
+    code, first_pid, text = backtest(runner, tmp_path, "--strategy", "S")
+    assert code == 0
+    assert text.startswith("$ freqtrade\n") and "backtesting --strategy S" in text and "userdir /ud" in text
+    assert "heavy []" in text  # the runner does not carry the worker's imports
+
+    code, pid, _ = backtest(runner, tmp_path, "--fail")
+    assert (code, pid) == (2, first_pid)
+
+
+def test_recycled_after_max_runs(fake_freqtrade_package, runner, tmp_path):
+    pids = [backtest(runner, tmp_path)[1] for _ in range(4)]
+    assert pids[0] == pids[1] == pids[2] != pids[3]
+
+
+def test_recycled_above_memory_threshold(fake_freqtrade_package, runner, tmp_path):
+    _, first_pid, _ = backtest(runner, tmp_path)
+    runner.max_rss_mb = worker.rss_mb(first_pid) + 32
+    assert backtest(runner, tmp_path, "--grow")[1] == first_pid
+    assert backtest(runner, tmp_path)[1] != first_pid
+
+
+def test_dead_runner_is_replaced(fake_freqtrade_package, runner, tmp_path):
+    _, first_pid, _ = backtest(runner, tmp_path)
+    with pytest.raises(RuntimeError, match="died"):
+        backtest(runner, tmp_path, "--crash")
+    assert backtest(runner, tmp_path)[1] != first_pid
+
+
+def test_falls_back_to_cli_without_freqtrade(tmp_path, monkeypatch):
+    pkg = tmp_path / "freqtrade"
+    pkg.mkdir()
+    (pkg / "__init__.py").write_text("raise ImportError('no talib')\n")
+    monkeypatch.setenv("PYTHONPATH", str(tmp_path))
+    monkeypatch.setattr(worker, "FREQTRADE_RUNNER", "warm")
+    monkeypatch.setattr(worker, "_freqtrade_runners", threading.local())
+    assert worker.warm_freqtrade_runner() is None
+    assert "no talib" in worker._freqtrade_runners.runner.unavailable
+
+
+def test_warm_runners_count_against_the_engine_memory_budget(monkeypatch):
+    monkeypatch.setattr(worker, "ENGINE_MEMORY_BUDGET_MB", 2000)
+    monkeypatch.setattr(worker, "ENGINE_RUN_MEMORY_MB", 300)
+    monkeypatch.setattr(worker, "FREQTRADE_RUNNER_MAX_RSS_MB", 500)
+    monkeypatch.setattr(worker, "FREQTRADE_RUNNER", "warm")
+
+    assert worker.engine_concurrency(8) == 2
+    assert worker.engine_concurrency(8, {"engine": "vectorized"}) == 6
+    monkeypatch.setattr(worker, "FREQTRADE_RUNNER", "cli")
+    assert worker.engine_concurrency(8) == 6
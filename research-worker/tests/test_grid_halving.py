@@ -0,0 +1,63 @@
+import io
+
+import pandas as pd
+import pytest
+
+import worker
+
+SPEC = {"exchange": "binance", "pair": "BTC/USDT", "timeframe": "1h", "start": "2022-01-01", "end": "2023-01-01"}
+
+
+def test_rungs_are_growing_prefixes_no_shorter_than_min_days():
+    eta, specs = worker.halving_rungs(SPEC, None, 27)
+
+    # log3(27) + 1 = 4 rungs would start with a 13.5-day slice; minDays=30 drops one
+    assert eta == 3
+    assert [(s["start"], s["end"]) for s in specs] == [
+        ("2022-01-01", "2022-02-11"),
+        ("2022-01-01", "2022-05-03"),
+        ("2022-01-01", "2023-01-01"),
+    ]
+    assert specs[-1] is SPEC
+    assert len(worker.halving_rungs(SPEC, {"eta": 2, "rungs": 2, "minDays": 0}, 27)[1]) == 2
+    assert worker.halving_rungs(SPEC, {"minDays": 400}, 27)[1] == [SPEC]
+
+
+def test_survivors_are_the_top_fraction_in_grid_order():
+    kpis = {0: {"sharpe": 1.0}, 1: {}, 2: {"sharpe": 3.0}, 3: {"sharpe": float("nan")}, 4: {"sharpe": 1.0}}
+
+    assert worker.halving_survivors(kpis, "sharpe", 3) == [0, 2]  # ceil(5/3) = 2; ties keep grid order
+    assert worker.halving_survivors(kpis, "sharpe", 2) == [0, 2, 4]
+    assert worker.halving_survivors({0: {}}, "sharpe", 3) == [0]
+
+
+def test_unknown_search_mode_is_rejected():
+    with pytest.raises(ValueError, match="unsupported grid search"):
+        worker.resolve_search("random")
+
+
+def test_halving_grid_prunes_members_and_reports_rungs(job_runner):
+    job_runner.kpis(lambda call: {"sharpe": float(call["params"]["p"]), "trades": 1})
+    job = job_runner.job(grid=[{"p": i} for i in range(9)], spec=SPEC, objective="sharpe",
+                         search="halving", halving={"eta": 3, "minDays": 0})
+
+    parent = job_runner.run(job)
+
+    # 9 members on 1/9 of the year, 3 on 1/3, 1 on the full range: 13 runs, ~2.3 full-range equivalents
+    ran = [(call["spec"]["end"], call["params"]["p"]) for call in job_runner.calls]
+    assert [end for end, _ in ran] == ["2022-02-11"] * 9 + ["2022-05-03"] * 3 + ["2023-01-01"]
+    assert [p for end, p in ran if end == "2023-01-01"] == [8]
+
+    index = job_runner.get_json("runs/g/grid/index.json")
+    assert [c.get("prunedAtRung") for c in index["children"]] == [0] * 6 + [1, 1, None]
+    assert index["children"][7]["kpis"] == {} and index["children"][7]["rungKpis"]["sharpe"] == 7.0
+    assert [(r["members"], r["kept"], r.get("pruned")) for r in index["search"]["rungs"]] == [
+        (9, 3, [0, 1, 2, 3, 4, 5]), (3, 1, [6, 7]), (1, 1, None)
+    ]
+    assert parent["search"]["mode"] == "halving" and parent["leaderboard"][0]["index"] == 8
+    assert parent["kpis"]["trades"] == 1  # aggregated over full-range members only
+
+    pruned = job_runner.get_json("runs/g/grid/006/metrics.json")
+    assert pruned["prunedAtRung"] == 1 and pruned["spec"]["end"] == "2022-05-03"
+    results = pd.read_parquet(io.BytesIO(job_runner.get("runs/g/grid/results.parquet")))
+    assert results["prunedAtRung"].tolist()[6:] == [1, 1, pd.NA]
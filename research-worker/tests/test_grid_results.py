@@ -0,0 +1,49 @@
+import io
+
+import pandas as pd
+
+import worker
+
+
+def child(i, params, kpis):
+    return {"index": i, "runId": f"g_{i:03d}", "artifactPrefix": f"runs/g/grid/{i:03d}/", "params": params, "kpis": kpis}
+
+
+def test_results_frame_flattens_params_and_ranks_by_objective():
+    children = [
+        child(0, {"fast": 5, "mode": 3, "bands": {"k": 2.0}}, {"sharpe": 1.0, "netReturn": 0.4, "trades": 10}),
+        child(1, {"fast": 8, "mode": "ema", "bands": {"k": 2.5}}, {}),
+        child(2, {"fast": 13, "mode": 3, "bands": {"k": 3.0}}, {"sharpe": 2.0, "netReturn": 0.1, "trades": 7}),
+        child(3, {"fast": 21, "mode": [1, 2], "bands": {"k": 3.5}}, {"sharpe": 1.0, "netReturn": 0.2, "trades": 3}),
+    ]
+
+    results = worker.grid_results_frame(children, "sharpe")
+
+    assert results["index"].tolist() == [0, 1, 2, 3]
+    assert results["rank"].tolist() == [2, 4, 1, 3]  # missing KPI last, ties in grid order
+    assert results["params.fast"].tolist() == [5, 8, 13, 21]
+    assert results["params.bands.k"].tolist() == [2.0, 2.5, 3.0, 3.5]
+    assert results["params.mode"].tolist() == ["3", '"ema"', "3", "[1, 2]"]  # mixed types as JSON
+    assert worker.grid_results_frame(children, "netReturn")["rank"].tolist() == [1, 4, 3, 2]
+
+    buf = io.BytesIO()
+    results.to_parquet(buf, index=False)
+    assert pd.read_parquet(buf).equals(results)
+
+    top = worker.grid_leaderboard(children, results, 2)
+    assert [(row["rank"], row["runId"]) for row in top] == [(1, "g_002"), (2, "g_000")]
+    assert top[0]["params"] == children[2]["params"]
+
+
+def test_grid_writes_results_table_and_leaderboard(job_runner, monkeypatch):
+    job_runner.kpis(lambda call: {"sharpe": call["params"]["p"] % 4, "trades": 1}, reverse=True)
+    monkeypatch.setattr(worker, "GRID_LEADERBOARD_SIZE", 3)
+
+    parent = job_runner.run(job_runner.job(grid=[{"p": i} for i in range(10)], objective="sharpe"))
+
+    results = pd.read_parquet(io.BytesIO(job_runner.get("runs/g/grid/results.parquet")))
+    assert len(results) == 10 and results["params.p"].tolist() == list(range(10))
+    leaderboard = job_runner.get_json("runs/g/grid/leaderboard.json")
+    assert leaderboard["objective"] == "sharpe" and leaderboard["members"] == 10
+    assert [row["index"] for row in leaderboard["leaderboard"]] == [3, 7, 2]
+    assert parent["leaderboard"] == leaderboard["leaderboard"]
@@ -0,0 +1,87 @@
+import json
+import threading
+
+import pytest
+
+import worker
+
+
+@pytest.fixture
+def queue(bucket, tmp_path, monkeypatch):
+    """A moto SQS queue wired into worker.main, with fast polls and no failure backoff."""
+    client = worker.mk_sqs()
+    url = client.create_queue(QueueName="research-jobs")["QueueUrl"]
+    monkeypatch.setattr(worker, "sqs", client)
+    monkeypatch.setattr(worker, "mk_sqs", lambda: client)
+    monkeypatch.setattr(worker, "QUEUE_URL", url)
+    monkeypatch.setattr(worker, "SQS_WAIT_SECONDS", 0)
+    monkeypatch.setattr(worker, "STOP", False)
+    monkeypatch.setattr(worker, "WORKDIR_ROOT", tmp_path / "work")
+    monkeypatch.setattr(worker, "disk_budget", worker.DiskBudget(1 << 40, tmp_path / "md", tmp_path / "work"))
+    monkeypatch.setattr(worker.time, "sleep", lambda seconds: None)
+    return client, url
+
+
+def send(queue, body):
+    client, url = queue
+    client.send_message(QueueUrl=url, MessageBody=body if isinstance(body, str) else json.dumps(body))
+
+
+def remaining(queue):
+    client, url = queue
+    attrs = client.get_queue_attributes(
+        QueueUrl=url,
+        AttributeNames=["ApproximateNumberOfMessages", "ApproximateNumberOfMessagesNotVisible"],
+    )["Attributes"]
+    return int(attrs["ApproximateNumberOfMessages"]) + int(attrs["ApproximateNumberOfMessagesNotVisible"])
+
+
+def test_jobs_run_concurrently_and_only_successes_are_deleted(queue, monkeypatch):
+    monkeypatch.setattr(worker, "JOB_SLOTS", 3)
+    all_running = threading.Barrier(3, timeout=10)
+    workdirs = []
+
+    def handle(job, workdir):
+        workdirs.append(workdir)
+        all_running.wait()  # raises BrokenBarrierError unless three jobs overlap
+        if job["runId"] == "bad":
+            raise RuntimeError("engine failed")
+        worker.STOP = True
+        return {"kpis": {}}
+
+    monkeypatch.setattr(worker, "handle_backtest", handle)
+    for run_id in ("a", "b", "bad"):
+        send(queue, {"runId": run_id, "kind": "backtest"})
+
+    worker.main()
+
+    assert sorted(w.name for w in workdirs) == ["a", "b", "bad"]
+    # the two successes are deleted; the failed job stays in flight for a retry
+    assert remaining(queue) == 1
+
+
+def test_sigterm_drains_in_flight_jobs(queue, monkeypatch):
+    monkeypatch.setattr(worker, "JOB_SLOTS", 2)
+    started, release, finished = threading.Semaphore(0), threading.Event(), []
+
+    def handle(job, workdir):
+        started.release()
+        release.wait(10)
+        finished.append(job["runId"])
+        return {"kpis": {}}
+
+    monkeypatch.setattr(worker, "handle_backtest", handle)
+    send(queue, {"runId": "a"})
+    send(queue, {"runId": "b"})
+
+    def stop_when_busy():
+        started.acquire(timeout=10)
+        started.acquire(timeout=10)
+        worker.handle_sigterm(None, None)
+        release.set()
+
+    threading.Thread(target=stop_when_busy).start()
+    worker.main()
+
+    assert sorted(finished) == ["a", "b"]
+    assert remaining(queue) == 0
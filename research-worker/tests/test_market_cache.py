@@ -0,0 +1,106 @@
+import pandas as pd
+import pyarrow.parquet as pq
+
+import worker
+from conftest import HOUR_MS, ms
+
+SPEC = {"exchange": "fake", "pair": "BTC/USDT", "timeframe": "1h"}
+
+
+def partition_path(cache_dir, year=2021):
+    return cache_dir / f"fake_btc-usdt_1h_{year}.parquet"
+
+
+def test_current_year_partition_is_extended_with_only_the_missing_tail(tmp_path, fake_exchange, clock):
+    clock.now = "2021-06-01"
+    worker.ensure_market_data({**SPEC, "start": "2021-05-01", "end": "2021-05-31"}, tmp_path)
+    coverage = worker.partition_coverage(partition_path(tmp_path), "1h", 2021)
+    assert coverage["complete"] is False
+    assert coverage["lastCandle"] < ms("2021-06-01")
+
+    fake_exchange.calls.clear()
+    clock.now = "2021-07-01"
+    df = worker.ensure_market_data({**SPEC, "start": "2021-06-01", "end": "2021-06-30"}, tmp_path)
+
+    assert min(fake_exchange.calls) == coverage["lastCandle"] + HOUR_MS
+    assert df.index.max() == pd.Timestamp("2021-06-30", tz="UTC")
+    refreshed = worker.partition_coverage(partition_path(tmp_path), "1h", 2021)
+    assert refreshed["lastCandle"] > coverage["lastCandle"]
+    full = pd.read_parquet(partition_path(tmp_path))
+    assert full["timestamp"].is_unique
+    assert full["timestamp"].is_monotonic_increasing
+
+
+def test_covered_range_does_not_touch_the_exchange(tmp_path, fake_exchange, clock):
+    clock.now = "2021-06-01"
+    worker.ensure_market_data({**SPEC, "start": "2021-05-01", "end": "2021-05-31"}, tmp_path)
+    fake_exchange.calls.clear()
+
+    clock.now = "2021-09-01"
+    worker.ensure_market_data({**SPEC, "start": "2021-03-01", "end": "2021-05-20"}, tmp_path)
+
+    assert fake_exchange.calls == []
+
+
+def test_closed_year_is_marked_complete(tmp_path, fake_exchange, clock):
+    clock.now = "2022-03-01"
+    worker.ensure_market_data({**SPEC, "start": "2021-01-01", "end": "2021-12-31"}, tmp_path)
+    assert worker.partition_coverage(partition_path(tmp_path), "1h", 2021)["complete"] is True
+
+    fake_exchange.calls.clear()
+    worker.ensure_market_data({**SPEC, "start": "2021-01-01", "end": "2021-12-31"}, tmp_path)
+    assert fake_exchange.calls == []
+
+
+def test_partitions_without_coverage_metadata_are_still_refreshed(tmp_path, fake_exchange, clock):
+    clock.now = "2021-06-01"
+    legacy = worker.fetch_ohlcv_year("fake", "BTC/USDT", "1h", 2021)
+    legacy.to_parquet(partition_path(tmp_path), index=False)
+    assert worker.PARTITION_COVERAGE_KEY not in (pq.read_schema(partition_path(tmp_path)).metadata or {})
+
+    clock.now = "2021-07-01"
+    df = worker.ensure_market_data({**SPEC, "start": "2021-06-01", "end": "2021-06-30"}, tmp_path)
+
+    assert df.index.max() == pd.Timestamp("2021-06-30", tz="UTC")
+    assert worker.PARTITION_COVERAGE_KEY in pq.read_schema(partition_path(tmp_path)).metadata
+
+
+def test_partial_legacy_partition_of_a_closed_year_stays_incomplete(tmp_path, fake_exchange, clock):
+    clock.now = "2021-06-01"
+    worker.fetch_ohlcv_year("fake", "BTC/USDT", "1h", 2021).to_parquet(partition_path(tmp_path), index=False)
+
+    clock.now = "2022-03-01"
+    worker.ensure_market_data({**SPEC, "start": "2021-01-01", "end": "2021-03-31"}, tmp_path)
+    assert worker.partition_coverage(partition_path(tmp_path), "1h", 2021)["complete"] is False
+
+    fake_exchange.calls.clear()
+    df = worker.ensure_market_data({**SPEC, "start": "2021-09-01", "end": "2021-10-31"}, tmp_path)
+
+    assert fake_exchange.calls and df.index.min() == pd.Timestamp("2021-09-01", tz="UTC")
+    assert worker.partition_coverage(partition_path(tmp_path), "1h", 2021)["complete"] is True
+
+
+def test_open_candle_is_never_stored(tmp_path, fake_exchange, clock):
+    clock.now = "2021-06-01 10:30"
+    worker.ensure_market_data({**SPEC, "start": "2021-05-01", "end": "2021-06-02"}, tmp_path)
+    last = pd.read_parquet(partition_path(tmp_path))["timestamp"].max()
+    assert last + pd.Timedelta(hours=1) <= pd.Timestamp("2021-06-01 10:30", tz="UTC")
+
+
+def test_partitions_are_written_in_prunable_row_groups(tmp_path, clock):
+    clock.now = "2022-03-01"
+    index = pd.date_range("2021-01-01", "2022-01-01", freq="1min", tz="UTC", inclusive="left")
+    df = pd.DataFrame({"timestamp": index, "open": 1.0, "high": 1.0, "low": 1.0, "close": 1.0, "volume": 1.0})
+    path = tmp_path / "fake_btc-usdt_1m_2021.parquet"
+    worker.write_partition(df, path, "unused", "1m", 2021)
+
+    meta = pq.ParquetFile(path).metadata
+    assert meta.num_row_groups == -(-len(df) // worker.partition_row_group_size("1m"))
+
+    start = pd.Timestamp("2021-03-01", tz="UTC")
+    end = pd.Timestamp("2021-03-14", tz="UTC")
+    window = worker.read_partition(path, start, end, columns=["timestamp", "close"])
+    assert list(window.columns) == ["timestamp", "close"]
+    assert window["timestamp"].min() == start
+    assert window["timestamp"].max() == end
+    assert len(window) == 13 * 24 * 60 + 1
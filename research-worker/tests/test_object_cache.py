@@ -0,0 +1,63 @@
+import json
+
+import worker
+
+
+def spy_get_object(monkeypatch, client):
+    requested = []
+    real = client.get_object
+
+    def get_object(**kwargs):
+        requested.append((kwargs["Key"], "IfNoneMatch" in kwargs))
+        return real(**kwargs)
+
+    monkeypatch.setattr(client, "get_object", get_object)
+    return requested
+
+
+def test_unchanged_objects_are_revalidated_not_downloaded(bucket, monkeypatch):
+    bucket.put_object(Bucket=worker.BUCKET, Key="strategies/s/v1/main.py", Body=b"version 1")
+    requested = spy_get_object(monkeypatch, bucket)
+    cache = worker.object_cache
+
+    first = cache.fetch("strategies/s/v1/main.py")
+    again = cache.fetch("strategies/s/v1/main.py")
+    assert again == first and first.read_bytes() == b"version 1"
+    assert (cache.misses, cache.hits) == (1, 1)
+    assert requested == [("strategies/s/v1/main.py", False), ("strategies/s/v1/main.py", True)]
+
+    bucket.put_object(Bucket=worker.BUCKET, Key="strategies/s/v1/main.py", Body=b"version 2")
+    updated = cache.fetch("strategies/s/v1/main.py")
+    assert updated != first and updated.read_bytes() == b"version 2"
+    assert not first.exists()  # the superseded version does not pile up on disk
+    assert cache.read("strategies/s/v1/main.py") == b"version 2"
+
+    assert cache.fetch("strategies/s/v1/missing.py") is None
+
+
+def test_backtest_fetches_strategy_and_manifest_once(bucket, tmp_path, monkeypatch):
+    bucket.put_object(Bucket=worker.BUCKET, Key="strategies/s/v1/main.py", Body=b"class S:\n    pass\n")
+    bucket.put_object(Bucket=worker.BUCKET, Key="strategies/s/v1/manifest.json",
+                      Body=json.dumps({"engine": "vectorized"}).encode())
+    requested = spy_get_object(monkeypatch, bucket)
+    manifests = []
+
+    def fake_run_engine(**call):
+        manifests.append(call["manifest"])
+        return {"kpis": {"trades": 0}, "artifacts": []}
+
+    monkeypatch.setattr(worker, "run_engine", fake_run_engine)
+    job = {"runId": "r", "strategyId": "s", "manifestS3Key": "strategies/s/v1/main.py", "artifactPrefix": "runs/r/",
+           "kind": "backtest", "spec": {}}
+
+    worker.handle_backtest(job, tmp_path / "r1")
+    worker.handle_backtest(job, tmp_path / "r2")
+
+    assert manifests == [{"engine": "vectorized"}] * 2
+    assert (tmp_path / "r2" / "strategy_payload").read_bytes() == b"class S:\n    pass\n"
+    assert requested == [
+        ("strategies/s/v1/main.py", False),
+        ("strategies/s/v1/manifest.json", False),
+        ("strategies/s/v1/main.py", True),
+        ("strategies/s/v1/manifest.json", True),
+    ]
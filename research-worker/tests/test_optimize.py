@@ -0,0 +1,126 @@
+from concurrent.futures import Future
+
+import numpy as np
+import pytest
+
+import worker
+
+SPEC = {"exchange": "binance", "pair": "BTC/USDT", "timeframe": "1h", "start": "2023-01-01", "end": "2023-06-01"}
+
+
+def optimize_job(job_runner, run_id, optimize, **extra):
+    return job_runner.job(run_id, "optimize", optimize=optimize, spec=SPEC, **extra)
+
+
+def ran(job_runner):
+    return [call["params"] for call in job_runner.calls]
+
+
+class InlineExecutor:
+    """Stands in for the spawned ProcessPoolExecutor; counts how many get created."""
+
+    created = 0
+
+    def __init__(self, max_workers, mp_context):
+        InlineExecutor.created += 1
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        pass
+
+
+def test_space_parsing():
+    dims = worker.optimize_space({
+        "fast": {"low": 5, "high": 50},
+        "stop": {"low": 0.001, "high": 0.1, "log": True},
+        "mode": {"choices": ["ema", "sma"]},
+    })
+    assert [d.get("int") for d in dims] == [True, False, None]
+    assert worker.from_unit(dims[0], 0.5) == 28 and worker.from_unit(dims[1], 0.5) == pytest.approx(0.01)
+    assert worker.to_unit(dims[1], 0.01) == pytest.approx(0.5)
+
+    for bad in ({}, {"p": {"low": 3, "high": 3}}, {"p": {"low": 0, "high": 1, "log": True}}, {"p": {"choices": []}}):
+        with pytest.raises(ValueError):
+            worker.optimize_space(bad)
+
+
+def test_tpe_concentrates_near_the_optimum():
+    dims = worker.optimize_space({"x": {"low": 0.0, "high": 1.0}, "y": {"low": 0.0, "high": 1.0}})
+
+    def score(p):
+        return -((p["x"] - 0.7) ** 2 + (p["y"] - 0.2) ** 2)
+
+    def search(seed):
+        rng, seen = np.random.default_rng(seed), set()
+        history = [(p, score(p)) for p in worker.random_candidates(dims, rng, 10, seen)]
+        while len(history) < 60:
+            history.extend((p, score(p)) for p in worker.tpe_candidates(dims, history, rng, 4, seen))
+        return history
+
+    wins = 0
+    for seed in range(5):
+        history = search(seed)
+        random_best = max(score(p) for p in worker.random_candidates(dims, np.random.default_rng(seed + 100), 60, set()))
+        wins += max(value for _, value in history) > random_best
+        assert np.median([value for _, value in history[-20:]]) > -0.01
+    assert wins >= 4
+    assert len({worker.params_key(p) for p, _ in history}) == len(history)
+
+
+def test_optimize_writes_grid_layout(job_runner):
+    job_runner.kpis(lambda call: {"sharpe": -float((call["params"]["fast"] - 13) ** 2)})
+
+    metrics = job_runner.run(optimize_job(
+        job_runner, "o", {"space": {"fast": {"low": 2, "high": 60}}, "budget": 12, "initial": 4, "seed": 3},
+        params={"slow": 100},
+    ))
+
+    params = ran(job_runner)
+    assert len(params) == 12 and all(p["slow"] == 100 for p in params)
+    assert len({p["fast"] for p in params}) == 12
+    assert metrics["kind"] == "optimize" and len(metrics["members"]) == 12
+    best = max(params, key=lambda p: -(p["fast"] - 13) ** 2)
+    assert metrics["optimize"]["bestParams"] == best and metrics["optimize"]["seed"] == 3
+    assert metrics["leaderboard"][0]["params"] == best
+
+    index = job_runner.get_json("runs/o/grid/index.json")
+    assert index["kind"] == "optimize" and index["partial"] is False and index["done"] == index["total"] == 12
+    assert [c["params"] for c in index["children"]] == params
+    member = job_runner.get_json("runs/o/grid/011/metrics.json")
+    assert member["kind"] == "optimize:member" and member["parentRunId"] == "o"
+    job_runner.client.head_object(Bucket=worker.BUCKET, Key="runs/o/grid/results.parquet")
+
+
+def test_optimize_stops_when_a_discrete_space_runs_out(job_runner):
+    job_runner.kpis(lambda call: {"sharpe": 1.0})
+
+    metrics = job_runner.run(optimize_job(job_runner, "d", {"space": {"mode": {"choices": ["a", "b", "c"]}}, "budget": 10}))
+
+    assert sorted(p["mode"] for p in ran(job_runner)) == ["a", "b", "c"]
+    assert metrics["optimize"]["evaluations"] == 3 and metrics["optimize"]["budget"] == 10
+
+
+def test_optimize_batches_share_one_engine_pool(job_runner, monkeypatch):
+    monkeypatch.setattr(InlineExecutor, "created", 0)
+    monkeypatch.setattr(worker, "ProcessPoolExecutor", InlineExecutor)
+    monkeypatch.setattr(worker, "GRID_CONCURRENCY", 2)
+    monkeypatch.setattr(worker, "ENGINE_MEMORY_BUDGET_MB", 4096)
+    scores = []
+
+    def fake_run_engine(**call):
+        scores.append(call["params"]["x"])
+        return {"kpis": {"sharpe": -call["params"]["x"]}, "artifacts": []}
+
+    monkeypatch.setattr(worker, "run_engine", fake_run_engine)
+
+    metrics = job_runner.run(optimize_job(
+        job_runner, "p", {"space": {"x": {"low": 0, "high": 100}}, "budget": 12, "initial": 4, "seed": 1},
+    ))
+
+    # 4 random proposals, then four TPE batches of 2: five batches, one pool
+    assert metrics["optimize"]["evaluations"] == 12 and len(scores) == 12
+    assert InlineExecutor.created == 1
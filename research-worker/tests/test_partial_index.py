@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+import worker
+
+
+def test_partial_index_flushes_first_member_then_rate_limits(bucket, monkeypatch):
+    clock = iter([0.0, 10.0, 31.0, 31.0])
+    monkeypatch.setattr(worker.time, "monotonic", lambda: next(clock))
+    index = {"runId": "g", "kind": "grid", "children": []}
+    written = []
+
+    with worker.ArtifactUploader() as uploader:
+        partial = worker.PartialIndex("runs/g/grid/index.json", uploader, "children", interval=30)
+        members = {}
+        for i in range(3):
+            members[i] = {"index": i}
+            partial.update(index, members, 3)
+            written.append(json.loads(bucket.get_object(Bucket=worker.BUCKET, Key="runs/g/grid/index.json")["Body"].read()))
+
+    assert [w["done"] for w in written] == [1, 1, 3]
+    assert all(w["partial"] and w["total"] == 3 for w in written)
+    assert index["children"] == []  # the caller's index is left alone
+
+
+def test_crashed_walkforward_leaves_a_partial_index(job_runner, monkeypatch):
+    def crashing_batch(calls, concurrency, pool=None):
+        yield 0, {"kpis": {"netReturn": 0.1, "trades": 2}, "artifacts": []}, None
+        yield 1, None, RuntimeError("window failed")
+        raise MemoryError("worker killed")
+
+    job_runner.batch(crashing_batch)
+    monkeypatch.setattr(worker, "INDEX_FLUSH_SECONDS", 0)
+    job = job_runner.job("w", "walkforward", walkforward={"trainMonths": 1, "testMonths": 1, "stepMonths": 1},
+                         spec={"start": "2022-01-01", "end": "2022-06-01"})
+
+    with pytest.raises(MemoryError):
+        job_runner.run(job)
+
+    index = job_runner.get_json("runs/w/wf/index.json")
+    assert index["partial"] is True and (index["done"], index["total"]) == (2, 4)
+    assert [w.get("error") for w in index["windows"]] == [None, "window failed"]
@@ -0,0 +1,80 @@
+import worker
+
+SPEC = {"exchange": "binance", "pair": "BTC/USDT", "timeframe": "1h", "start": "2023-01-01", "end": "2023-06-01"}
+
+
+def grid_job(job_runner, run_id, grid, **extra):
+    return job_runner.job(run_id, grid=grid, spec=SPEC, **extra)
+
+
+def recorded_artifacts(call):
+    """Writes a trades and a log artifact per run, so cache hits have files to copy."""
+    workdir, p = call["workdir"], call["params"]["p"]
+    (workdir / "trades.csv.gz").write_bytes(f"trades {p}".encode())
+    (workdir / "logs.txt").write_text(f"log {p}")
+    artifacts = [
+        {"path": str(workdir / "trades.csv.gz"), "name": "trades.csv.gz", "content_type": "text/csv",
+         "content_encoding": "gzip"},
+        {"path": str(workdir / "logs.txt"), "name": "logs.txt", "content_type": "text/plain"},
+    ]
+    return {"kpis": {"sharpe": p}, "artifacts": artifacts}
+
+
+def ran(job_runner):
+    return [call["params"]["p"] for call in job_runner.calls]
+
+
+def test_grid_reuses_members_computed_by_earlier_runs(job_runner):
+    job_runner.engine(recorded_artifacts)
+
+    first = job_runner.run(grid_job(job_runner, "a", [{"p": 0}, {"p": 1}, {"p": 2}]))
+    assert ran(job_runner) == [0, 1, 2]
+    assert first["resultCache"] == {"enabled": True, "bypass": False, "lookups": 3, "hits": 0, "hitRate": 0.0}
+
+    job_runner.calls.clear()
+    second = job_runner.run(grid_job(job_runner, "b", [{"p": 2}, {"p": 3}, {"p": 0}, {"p": 1}]))
+    assert ran(job_runner) == [3]
+    assert second["resultCache"]["hits"] == 3 and second["resultCache"]["hitRate"] == 0.75
+    children = job_runner.get_json("runs/b/grid/index.json")["children"]
+    assert [c["kpis"]["sharpe"] for c in children] == [2, 3, 0, 1]
+
+    copied = job_runner.client.get_object(Bucket=worker.BUCKET, Key="runs/b/grid/000/trades.csv.gz")
+    assert copied["Body"].read() == b"trades 2"
+    assert copied["ContentType"] == "text/csv" and copied["ContentEncoding"] == "gzip"
+    member = job_runner.get_json("runs/b/grid/000/metrics.json")
+    assert member["runId"] == "b_000" and member["cacheHit"] is True and member["cachedFrom"] == "runs/a/grid/002/"
+    fresh = job_runner.get_json("runs/b/grid/001/metrics.json")
+    assert fresh["cacheHit"] is False and "cachedFrom" not in fresh
+
+    job_runner.calls.clear()
+    bypassed = job_runner.run(grid_job(job_runner, "c", [{"p": 0}, {"p": 3}], bypassCache=True))
+    assert ran(job_runner) == [0, 3]
+    assert bypassed["resultCache"]["lookups"] == 0 and bypassed["resultCache"]["hitRate"] is None
+
+
+def test_deleted_source_run_is_a_miss(job_runner):
+    job_runner.engine(recorded_artifacts)
+
+    job_runner.run(grid_job(job_runner, "a", [{"p": 0}]))
+    job_runner.client.delete_object(Bucket=worker.BUCKET, Key="runs/a/grid/000/logs.txt")
+    again = job_runner.run(grid_job(job_runner, "b", [{"p": 0}]))
+
+    assert ran(job_runner) == [0, 0] and again["resultCache"]["hits"] == 0
+
+
+def test_key_covers_inputs_and_skips_open_ranges(bucket, tmp_path):
+    strategy = tmp_path / "main.py"
+    strategy.write_bytes(b"class S:\n    pass\n")
+    cache = worker.ResultCache(strategy, {"engine": "vectorized"}, enabled=True)
+    call = {"spec": SPEC, "params": {"p": 1, "q": 2}, "artifact_formats": ["csv"]}
+
+    key = cache.key(call)
+    assert key
+    assert cache.key({**call, "params": {"q": 2, "p": 1}}) == key
+    assert cache.key({**call, "spec": {k: v for k, v in SPEC.items() if k != "exchange"}}) == key  # default filled in
+    assert cache.key({**call, "params": {"p": 2, "q": 2}}) != key
+    assert cache.key({**call, "artifact_formats": ["parquet"]}) != key
+    assert cache.key({**call, "spec": {**SPEC, "end": "2100-01-01"}}) is None
+
+    strategy.write_bytes(b"class S:\n    x = 1\n")
+    assert worker.ResultCache(strategy, {"engine": "vectorized"}, enabled=True).key(call) != key
@@ -0,0 +1,115 @@
+import contextlib
+import threading
+
+import psycopg
+import pytest
+
+import worker
+
+
+class FakeConnection:
+    def __init__(self, statements):
+        self.statements = statements
+        self.closed = False
+        self.broken = False
+
+    def execute(self, query, params=None):
+        if self.broken:
+            raise psycopg.OperationalError("server closed the connection unexpectedly")
+        self.statements.append((" ".join(query.split()), params))
+
+    def executemany(self, query, rows):
+        for row in rows:
+            self.execute(query, row)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        self.statements.append(("BEGIN", None))
+        yield
+        self.statements.append(("COMMIT", None))
+
+    @contextlib.contextmanager
+    def cursor(self):
+        yield self
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    statements, opened = [], []
+
+    def connect(self):
+        conn = FakeConnection(statements)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(worker.ConnectionPool, "_connect", connect)
+    return statements, opened
+
+
+def test_dropped_connection_is_replaced_and_the_update_retried(connections):
+    statements, opened = connections
+    store = worker.RunStore("postgresql://db", pool_size=2)
+    assert len(opened) == 1
+
+    opened[0].broken = True
+    store.mark_running("r1")
+
+    assert len(opened) == 2 and opened[0].closed
+    assert statements[-1][0].startswith('UPDATE "Run" SET status=%s') and statements[-1][1] == ("RUNNING", "r1")
+    assert store.pool.opened == 1 and store.pool.idle[0][0] is opened[1]
+
+
+def test_idle_connections_are_health_checked(connections, monkeypatch):
+    statements, opened = connections
+    store = worker.RunStore("postgresql://db", pool_size=1)
+    store.mark_failed("r1")
+    assert "SELECT 1" not in [q for q, _ in statements]
+
+    monkeypatch.setattr(worker, "DB_HEALTHCHECK_SECONDS", -1)
+    store.mark_failed("r2")
+    assert [q for q, _ in statements][-2] == "SELECT 1" and len(opened) == 1
+
+    opened[0].broken = True
+    store.mark_failed("r3")
+    assert len(opened) == 2 and statements[-1][1][-1] == "r3"
+
+
+def test_pool_never_opens_more_than_its_size(connections):
+    _, opened = connections
+    pool = worker.ConnectionPool("postgresql://db", size=1)
+    acquired = threading.Event()
+
+    with pool.connection() as first:
+        def other():
+            with pool.connection() as conn:
+                assert conn is first
+                acquired.set()
+
+        thread = threading.Thread(target=other)
+        thread.start()
+        assert not acquired.wait(0.2)
+    thread.join(timeout=5)
+    assert acquired.is_set() and len(opened) == 1
+
+
+def test_children_are_upserted_in_one_transaction(connections):
+    statements, _ = connections
+    store = worker.RunStore("postgresql://db")
+    job = {"runId": "g", "strategyId": "s", "ownerId": "u", "spec": {"pair": "BTC/USDT"}}
+    children = [
+        {"runId": "g_000", "artifactPrefix": "runs/g/grid/000/", "params": {"p": 1}, "kpis": {"sharpe": 1.5}},
+        {"runId": "g_001", "artifactPrefix": "runs/g/grid/001/", "params": {"p": 2}, "kpis": {}, "error": "boom"},
+    ]
+
+    store.record_children(job, "grid", children)
+
+    assert [q for q, _ in statements[-4:]][0::3] == ["BEGIN", "COMMIT"]
+    inserts = [params for q, params in statements if q.startswith('INSERT INTO "Run"')]
+    assert [(row[0], row[1], row[4], row[5], row[6]) for row in inserts] == [
+        ("g_000", "g", "GRID", "SUCCEEDED", "runs/g/grid/000/"),
+        ("g_001", "g", "GRID", "FAILED", "runs/g/grid/001/"),
+    ]
+    assert inserts[0][9].obj == {"sharpe": 1.5} and inserts[1][9] is None
@@ -0,0 +1,138 @@
+import threading
+
+import psycopg
+
+import worker
+
+
+class RecordingStore:
+    def __init__(self):
+        self.calls = []
+        self.failures = 0
+        self.error = psycopg.OperationalError("connection refused")
+        self.children_error = None
+        self.gate = threading.Event()
+        self.gate.set()
+
+    def enabled(self):
+        return True
+
+    def ensure_run(self, job, artifact_prefix, kind):
+        self.calls.append(("ensure", job["runId"], kind))
+
+    def record_children(self, job, kind, children):
+        if self.children_error:
+            raise self.children_error
+        self.calls.append(("children", job["runId"], [c["runId"] for c in children]))
+
+    def update_run(self, run_id, **fields):
+        self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            raise self.error
+        self.calls.append(("update", run_id, fields))
+
+
+def test_updates_for_a_run_are_coalesced_into_one_write():
+    store = RecordingStore()
+    writer = worker.RunStatusWriter(store)
+    writer.ensure_run({"runId": "g"}, "runs/g/", "GRID")
+    writer.mark_running("g")
+    for done in range(1, 4):
+        writer.progress("g", {"done": done, "total": 3})
+    writer.record_children({"runId": "g"}, "grid", [{"runId": "g_000"}])
+    writer.mark_succeeded("g", {"sharpe": 1.2}, "runs/g/")
+
+    writer.flush()
+
+    assert store.calls[:2] == [("ensure", "g", "GRID"), ("children", "g", ["g_000"])]
+    (_, run_id, fields), = store.calls[2:]
+    assert run_id == "g" and fields["status"] == "SUCCEEDED" and fields["kpis"] == {"sharpe": 1.2}
+    assert fields["progress"]["done"] == 3 and fields["artifact_prefix"] == "runs/g/"
+
+
+def test_job_threads_do_not_wait_for_the_database_and_final_status_flushes_at_once():
+    store = RecordingStore()
+    store.gate.clear()  # the database is "slow" until the gate opens
+    writer = worker.RunStatusWriter(store, interval=60).start()
+    try:
+        writer.mark_running("a")
+        writer.mark_failed("b")  # wakes the writer thread, which blocks in update_run
+        writer.progress("a", {"done": 1, "total": 2})
+        assert store.calls == []
+
+        store.gate.set()
+        writer.mark_succeeded("a", None, None)
+    finally:
+        writer.close()
+    assert ("update", "b", {"status": "FAILED"}) in store.calls
+    assert [fields.get("status") for _, run_id, fields in store.calls if run_id == "a"][-1] == "SUCCEEDED"
+
+
+def test_failed_writes_are_kept_and_merged_with_newer_updates():
+    store = RecordingStore()
+    store.failures = 1
+    writer = worker.RunStatusWriter(store)
+    writer.ensure_run({"runId": "r"}, "runs/r/", "BACKTEST")
+    writer.mark_running("r")
+    writer.flush()
+    assert writer.pending["r"]["status"] == "RUNNING" and "ensure" in writer.pending["r"]
+
+    writer.mark_succeeded("r", {"trades": 4}, None)
+    writer.flush()
+    assert writer.pending == {}
+    assert store.calls[-1] == ("update", "r", {"status": "SUCCEEDED", "kpis": {"trades": 4}})
+
+
+def test_writes_that_would_fail_again_are_dropped():
+    store = RecordingStore()
+    store.failures, store.error = 1, psycopg.errors.CheckViolation("bad status")
+    writer = worker.RunStatusWriter(store)
+    writer.mark_running("r")
+    writer.mark_running("s")
+    writer.flush()
+
+    assert writer.pending == {}
+    assert store.calls == [("update", "s", {"status": "RUNNING"})]
+
+
+def test_a_rejected_part_never_takes_the_final_status_with_it():
+    store = RecordingStore()
+    store.children_error = psycopg.errors.ForeignKeyViolation("no parent")
+    writer = worker.RunStatusWriter(store)
+    writer.record_children({"runId": "p"}, "grid", [{"runId": "p_000"}])
+    writer.mark_succeeded("p", {"sharpe": 1.0}, None)
+    writer.flush()
+    assert store.calls == [("update", "p", {"status": "SUCCEEDED", "kpis": {"sharpe": 1.0}})]
+
+    store.failures, store.error = 1, psycopg.errors.UndefinedColumn('column "progress" does not exist')
+    writer.progress("q", {"done": 1, "total": 2})
+    writer.mark_failed("q")
+    writer.flush()
+    assert writer.pending == {} and store.calls[-1] == ("update", "q", {"status": "FAILED"})
+
+
+def test_a_connection_error_keeps_everything_but_rejected_parts():
+    store = RecordingStore()
+    store.children_error = psycopg.errors.ForeignKeyViolation("no parent")
+    store.failures = 1
+    writer = worker.RunStatusWriter(store)
+    writer.ensure_run({"runId": "p"}, "runs/p/", "GRID")
+    writer.record_children({"runId": "p"}, "grid", [{"runId": "p_000"}])
+    writer.mark_running("p")
+    writer.flush()
+
+    assert set(writer.pending["p"]) == {"ensure", "status"}
+
+
+def test_grid_reports_progress_with_the_best_member(job_runner, monkeypatch):
+    job_runner.kpis(lambda call: {"sharpe": [0.5, 2.0, 1.0][call["params"]["p"]]}, reverse=True)
+    reported = []
+    writer = worker.RunStatusWriter(RecordingStore())
+    monkeypatch.setattr(writer, "progress", lambda run_id, progress: reported.append(dict(progress)))
+
+    job_runner.run(job_runner.job(grid=[{"p": i} for i in range(3)]), writer=writer)
+
+    assert [(p["done"], p["total"], p["best"]["index"]) for p in reported] == [(1, 3, 2), (2, 3, 1), (3, 3, 1)]
+    assert reported[-1]["objective"] == "sharpe" and reported[-1]["best"]["value"] == 2.0
+    assert writer.pending["g"]["children"][0][2][0]["runId"] == "g_000"
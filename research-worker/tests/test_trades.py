@@ -0,0 +1,71 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+import worker
+
+
+def ts(value):
+    return pd.Timestamp(value, tz="UTC")
+
+
+def test_normalize_trades_resolves_fallbacks_column_wise():
+    raw = pd.DataFrame.from_records(
+        [
+            # epoch ms, explicit ratio
+            {"pair": "BTC/USDT", "open_timestamp": 1609462800000, "close_timestamp": 1609470000000,
+             "profit_ratio": 0.02, "profit_abs": 20.0, "trade_duration": 120},
+            # epoch seconds, percentage fallback, profit_amount fallback
+            {"pair": "ETH/USDT", "open_time": 1609380000, "close_time": 1609383600,
+             "profit_pct": -1.5, "profit_amount": -15.0, "duration": 60},
+            # ISO strings, zero close_timestamp falls through to close_date
+            {"open_date": "2021-01-02 00:00:00+00:00", "close_timestamp": 0,
+             "close_date": "2021-01-02T06:00:00Z", "profit_ratio": 0.01, "duration_min": 360},
+            # no profit at all -> dropped
+            {"pair": "BTC/USDT", "close_timestamp": 1609470000000},
+            # unparseable close time -> dropped
+            {"pair": "BTC/USDT", "close_date": "not a date", "profit_ratio": 0.5},
+        ]
+    )
+
+    trades = worker.normalize_trades(raw)
+
+    assert list(trades.columns) == worker.TRADE_COLUMNS
+    assert list(trades["pair"]) == ["ETH/USDT", "BTC/USDT", ""]
+    assert list(trades["close_time"]) == [ts("2020-12-31 03:00"), ts("2021-01-01 03:00"), ts("2021-01-02 06:00")]
+    assert list(trades["open_time"]) == [ts("2020-12-31 02:00"), ts("2021-01-01 01:00"), ts("2021-01-02 00:00")]
+    np.testing.assert_allclose(trades["profit_ratio"], [-0.015, 0.02, 0.01])
+    np.testing.assert_allclose(trades["profit_abs"], [-15.0, 20.0, 0.0])
+    assert list(trades["duration"]) == [60, 120, 360]
+
+
+def test_normalize_trades_handles_empty_exports():
+    trades = worker.normalize_trades(pd.DataFrame())
+    assert trades.empty
+    assert list(trades.columns) == worker.TRADE_COLUMNS
+    assert list(worker.iso_utc(trades["close_time"])) == []
+
+
+def test_load_trades_understands_freqtrade_result_layout(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps({
+        "metadata": {},
+        "strategy": {"MyStrategy": {"trades": [{"pair": "BTC/USDT", "profit_ratio": 0.1}]}},
+    }))
+    raw = worker.load_trades(path)
+    assert raw.to_dict("records") == [{"pair": "BTC/USDT", "profit_ratio": 0.1}]
+
+
+def test_load_trades_accepts_plain_lists_and_wrappers(tmp_path):
+    for payload in ([{"a": 1}], {"trades": [{"a": 1}]}, {"results": [{"a": 1}]}):
+        path = tmp_path / "export.json"
+        path.write_text(json.dumps(payload))
+        assert worker.load_trades(path).to_dict("records") == [{"a": 1}]
+    assert worker.load_trades(tmp_path / "missing.json").empty
+
+
+def test_iso_utc_matches_isoformat():
+    stamps = pd.Series([ts("2021-01-01 10:00"), pd.NaT], dtype="datetime64[ns, UTC]")
+    assert worker.iso_utc(stamps).iloc[0] == ts("2021-01-01 10:00").isoformat()
+    assert pd.isna(worker.iso_utc(stamps).iloc[1])
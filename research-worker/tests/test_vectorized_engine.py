@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import worker
+
+STRATEGY = '''
+def populate_signals(dataframe, params):
+    fast = dataframe["close"].rolling(params["fast"]).mean()
+    slow = dataframe["close"].rolling(params["slow"]).mean()
+    dataframe["enter_long"] = fast > slow
+    dataframe["exit_long"] = fast < slow
+    if params.get("fail"):
+        raise ValueError("bad params")
+    return dataframe
+'''
+
+SPEC = {"exchange": "binance", "pair": "BTC/USDT", "timeframe": "1h", "start": "2022-01-01", "end": "2022-03-01"}
+MANIFEST = {"engine": "vectorized", "vectorized": {"fee": 0.001}, "freqtrade": {"startupCandleCount": 10}}
+
+
+def loop_trades(market, enter, exit_, first, fee):
+    """Candle-by-candle reference for simulate_signals/vectorized_trades."""
+    opens, closes = market["open"].to_numpy(), market["close"].to_numpy()
+    trades, entry, pending = [], None, None
+    for i in range(len(market)):
+        if pending == "enter" and entry is None:
+            entry = i
+        elif pending == "exit" and entry is not None:
+            trades.append(opens[i] * (1 - fee) / (opens[entry] * (1 + fee)) - 1)
+            entry = None
+        pending = None
+        if i >= first:
+            pending = "exit" if exit_[i] else "enter" if enter[i] else None
+    if entry is not None:
+        trades.append(closes[-1] * (1 - fee) / (opens[entry] * (1 + fee)) - 1)
+    return trades
+
+
+@pytest.fixture
+def market(monkeypatch):
+    index = pd.date_range("2022-01-01", "2022-03-01", freq="1h", tz="UTC", name="timestamp")
+    close = 100 + np.cumsum(np.random.default_rng(3).normal(0, 1, len(index)))
+    frame = pd.DataFrame(
+        {"open": close + 0.1, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0},
+        index=index,
+    )
+    monkeypatch.setattr(worker, "ensure_market_data", lambda spec, cache_dir: frame)
+    return frame
+
+
+@pytest.fixture
+def strategy(tmp_path):
+    path = tmp_path / "strategy_payload"
+    path.write_text(STRATEGY)
+    return path
+
+
+def test_simulation_matches_candle_loop(market):
+    rng = np.random.default_rng(5)
+    enter = rng.random((4, len(market))) < 0.05
+    exit_ = rng.random((4, len(market))) < 0.05
+    rows, entry_cols, exit_cols = worker.simulate_signals(enter, exit_, 10)
+    for row in range(4):
+        trades = worker.vectorized_trades(market, "BTC/USDT", "1h", 0.001, 1000, rows, entry_cols, exit_cols, row)
+        assert trades["profit_ratio"].tolist() == pytest.approx(loop_trades(market, enter[row], exit_[row], 10, 0.001))
+        assert (trades["close_time"] > trades["open_time"]).all()
+
+
+def test_batch_runs_param_sets_in_one_pass(market, strategy, tmp_path):
+    grid = [{"fast": 5, "slow": 20}, {"fast": 10, "slow": 50}, {"fast": 5, "slow": 20, "fail": True}]
+    calls = []
+    for i, params in enumerate(grid):
+        (tmp_path / str(i)).mkdir()
+        calls.append({"strategy_path": strategy, "workdir": tmp_path / str(i), "spec": SPEC,
+                      "params": params, "manifest": MANIFEST})
+
+    results = {pos: (out, err) for pos, out, err in worker.run_engine_batch(calls, concurrency=4)}
+
+    assert str(results[2][1]) == "bad params"
+    single = worker.run_engine(strategy, tmp_path / "0", SPEC, grid[0], manifest=MANIFEST)
+    assert results[0][0]["kpis"] == single["kpis"]
+    assert results[0][0]["kpis"] != results[1][0]["kpis"]
+    assert results[0][0]["kpis"]["trades"] > 0
+    names = sorted(a["name"] for a in single["artifacts"])
+    assert names == ["drawdown.csv", "equity.csv", "logs.txt", "trades.csv"]
+    trades = pd.read_csv(tmp_path / "0" / "trades.csv")
+    assert list(trades.columns) == worker.TRADE_COLUMNS
+    assert len(trades) == single["kpis"]["trades"]
+
+
+def test_missing_signal_function_fails_every_run(market, tmp_path):
+    path = tmp_path / "strategy_payload"
+    path.write_text("class S:\n    pass\n")
+    calls = [{"strategy_path": path, "workdir": tmp_path, "spec": SPEC, "params": {}, "manifest": MANIFEST}] * 2
+    errors = [err for _, _, err in worker.run_engine_batch(calls, concurrency=1)]
+    assert len(errors) == 2 and all("populate_signals" in str(err) for err in errors)
+
+
+def test_engine_defaults_to_freqtrade():
+    assert worker.engine_name({}) == "freqtrade"
+    assert worker.engine_name({"engine": "Vectorized"}) == "vectorized"
+    assert worker.engine_name({"engine": "zipline"}) == "freqtrade"
+
+
+def test_strategy_exit_and_hang_fail_runs_without_killing_the_worker(market, tmp_path, monkeypatch):
+    exiting = tmp_path / "exiting.py"
+    exiting.write_text("import sys\n\ndef populate_signals(dataframe, params):\n    sys.exit(3)\n")
+    hanging = tmp_path / "hanging.py"
+    hanging.write_text("import time\n\ndef populate_signals(dataframe, params):\n    time.sleep(600)\n")
+    monkeypatch.setattr(worker, "VECTORIZED_TIMEOUT_SECONDS", 8)
+
+    calls = [{"strategy_path": exiting, "workdir": tmp_path, "spec": SPEC, "params": {}, "manifest": MANIFEST}] * 2
+    errors = [err for _, _, err in worker.run_engine_batch(calls, concurrency=1)]
+    assert len(errors) == 2 and all("strategy aborted: SystemExit: 3" in str(err) for err in errors)
+
+    with pytest.raises(TimeoutError):
+        worker.run_engine(hanging, tmp_path, SPEC, {}, manifest=MANIFEST)
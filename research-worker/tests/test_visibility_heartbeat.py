@@ -0,0 +1,80 @@
+import json
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+import worker
+
+
+class RecordingSQS:
+    def __init__(self, fail_with=None):
+        self.calls = []
+        self.lock = threading.Lock()
+        self.fail_with = fail_with
+
+    def change_message_visibility(self, **kwargs):
+        with self.lock:
+            self.calls.append(("extend", kwargs["VisibilityTimeout"]))
+        if self.fail_with:
+            raise ClientError({"Error": {"Code": self.fail_with}}, "ChangeMessageVisibility")
+
+    def delete_message(self, **kwargs):
+        with self.lock:
+            self.calls.append(("delete", kwargs["ReceiptHandle"]))
+
+
+def test_heartbeat_keeps_message_invisible_until_stopped(bucket, monkeypatch):
+    client = worker.mk_sqs()
+    url = client.create_queue(QueueName="heartbeat")["QueueUrl"]
+    monkeypatch.setattr(worker, "sqs", client)
+    monkeypatch.setattr(worker, "QUEUE_URL", url)
+    client.send_message(QueueUrl=url, MessageBody="{}")
+    msg = client.receive_message(QueueUrl=url, VisibilityTimeout=1)["Messages"][0]
+
+    heartbeat = worker.VisibilityHeartbeat(msg["ReceiptHandle"], extension=2, interval=0.3)
+    heartbeat.start()
+    time.sleep(1.5)  # past the original 1s timeout
+    assert "Messages" not in client.receive_message(QueueUrl=url)
+    heartbeat.stop()
+    time.sleep(2.2)
+    assert len(client.receive_message(QueueUrl=url)["Messages"]) == 1
+
+
+def test_heartbeat_gives_up_on_invalid_receipt(monkeypatch):
+    stub = RecordingSQS(fail_with="ReceiptHandleIsInvalid")
+    monkeypatch.setattr(worker, "sqs", stub)
+    heartbeat = worker.VisibilityHeartbeat("r", extension=900, interval=0.01)
+    heartbeat.start()
+    heartbeat._thread.join(1)
+    assert not heartbeat._thread.is_alive() and len(stub.calls) == 1
+
+
+def test_job_heartbeats_stop_before_delete_and_reset_on_failure(tmp_path, monkeypatch):
+    stub = RecordingSQS()
+    monkeypatch.setattr(worker, "sqs", stub)
+    monkeypatch.setattr(worker, "visibility_extension", lambda job: 0.03)  # 10ms interval
+    monkeypatch.setattr(worker, "disk_budget", worker.DiskBudget(1 << 40, tmp_path / "md", tmp_path))
+    monkeypatch.setattr(worker.time, "sleep", lambda seconds: None)
+
+    def handle(job, workdir):
+        threading.Event().wait(0.1)  # time.sleep is patched out above
+        if job.get("fail"):
+            raise RuntimeError("boom")
+        return {"kpis": {}}
+
+    monkeypatch.setattr(worker, "handle_backtest", handle)
+    writer = worker.RunStatusWriter(worker.RunStore(None))
+
+    worker.process_message({"ReceiptHandle": "ok", "Body": json.dumps({"runId": "a"})}, writer, tmp_path)
+    kinds = [kind for kind, _ in stub.calls]
+    assert kinds.count("extend") >= 3 and kinds[-1] == "delete"
+
+    stub.calls.clear()
+    worker.process_message({"ReceiptHandle": "bad", "Body": json.dumps({"runId": "b", "fail": True})}, writer, tmp_path)
+    count = len(stub.calls)
+    threading.Event().wait(0.05)
+    assert count >= 4 and len(stub.calls) == count
+    assert all(kind == "extend" for kind, _ in stub.calls)
+    assert stub.calls[-1] == ("extend", worker.VISIBILITY_TIMEOUT)
+    assert worker.VISIBILITY_TIMEOUT not in [timeout for _, timeout in stub.calls[:-1]]
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+import worker
+
+SPEC = {"exchange": "binance", "pair": "BTC/USDT", "timeframe": "1h", "start": "2022-01-01", "end": "2022-05-01"}
+
+
+def test_failed_window_does_not_abort_the_others(freqtrade_job_runner, monkeypatch):
+    index = pd.date_range("2022-01-01", "2022-05-01", freq="1h", tz="UTC", name="timestamp")
+    close = 100 + np.arange(len(index)) * 0.01
+    market = pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0},
+                          index=index)
+    monkeypatch.setattr(worker, "ensure_market_data", lambda spec, cache_dir: market)
+    monkeypatch.setattr(worker, "WALKFORWARD_CONCURRENCY", 2)
+    monkeypatch.setenv("FAKE_FREQTRADE_FAIL", '"testStart": "2022-03-01"')
+    job = freqtrade_job_runner.job("w", "walkforward", spec=SPEC,
+                                   walkforward={"trainMonths": 1, "testMonths": 1, "stepMonths": 1})
+
+    metrics = freqtrade_job_runner.run(job)
+
+    assert metrics["failedWindows"] == [1] and metrics["windows"] == ["w_wf_000", "w_wf_001", "w_wf_002"]
+    index = freqtrade_job_runner.get_json("runs/w/wf/index.json")
+    assert [bool(w.get("error")) for w in index["windows"]] == [False, True, False]
+    assert "freqtrade exited with 2" in index["windows"][1]["error"]
+    assert index["windows"][0]["kpis"]["trades"] == 5 and index["windows"][2]["kpis"]["trades"] == 5
+    freqtrade_job_runner.client.head_object(Bucket=worker.BUCKET, Key="runs/w/wf/002/metrics.json")
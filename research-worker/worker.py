@@ -1,23 +1,36 @@
 import os
 import ast
+import atexit
 import json
 import time
+import hashlib
+import importlib.metadata
 import uuid
 import signal
 import sys
 import math
+import runpy
 import shutil
 import subprocess
 import traceback
+import threading
+import multiprocessing
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Iterable, Tuple
+from typing import Dict, Any, Callable, List, Optional, Iterable, Iterator, Set, Tuple
 
 import boto3
 import ccxt
 import numpy as np
 import pandas as pd
 import psycopg
+import pyarrow as pa
+import pyarrow.parquet as pq
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import BotoCoreError, ClientError
 from dateutil.relativedelta import relativedelta  # pip install python-dateutil
 from psycopg.types.json import Json
@@ -29,6 +42,76 @@ REGION = os.getenv("AWS_REGION", "ap-southeast-2")
 QUEUE_URL = os.getenv("SQS_RESEARCH_JOBS_URL")
 BUCKET = os.getenv("S3_BUCKET")
 DATABASE_URL = os.getenv("DATABASE_URL")
+MARKET_CACHE_DIR = Path("/tmp/market-data")
+STRATEGY_CACHE_DIR = Path("/tmp/strategy-cache")
+WORKDIR_ROOT = Path("/tmp/workdir")
+# Ephemeral disk shared by the market-data cache, the strategy cache and
+# finished job workdirs
+DISK_BUDGET_MB = int(os.getenv("DISK_BUDGET_MB", "12288"))
+# Decoded OHLCV partitions kept in memory across jobs (0 disables)
+FRAME_CACHE_MB = int(os.getenv("FRAME_CACHE_MB", "128"))
+# Default freqtrade OHLCV storage (feather | parquet | json); jobs may override via `dataFormat`.
+DATASET_FORMAT = os.getenv("DATASET_FORMAT", "feather")
+# equity/drawdown/trades artifact formats, comma separated: csv, csv.gz, parquet
+ARTIFACT_FORMATS = os.getenv("ARTIFACT_FORMATS", "csv")
+
+# Parallel engine runs (grid members / walk-forward windows). 0 = one process
+# per available CPU, further capped so that concurrency * per-run estimate
+# fits the memory budget.
+GRID_CONCURRENCY = int(os.getenv("GRID_CONCURRENCY", "0"))
+WALKFORWARD_CONCURRENCY = int(os.getenv("WALKFORWARD_CONCURRENCY", "0"))
+ENGINE_MEMORY_BUDGET_MB = int(os.getenv("ENGINE_MEMORY_BUDGET_MB", "768"))
+ENGINE_RUN_MEMORY_MB = int(os.getenv("ENGINE_RUN_MEMORY_MB", "320"))
+# Vectorised strategy code runs in an engine worker process, which is killed
+# if one pass over a spec takes longer than this
+VECTORIZED_TIMEOUT_SECONDS = float(os.getenv("VECTORIZED_TIMEOUT_SECONDS", "600"))
+# Jobs processed at once; each slot gets its share of the CPUs and engine memory budget
+JOB_SLOTS = max(1, int(os.getenv("JOB_SLOTS", "1")))
+SQS_WAIT_SECONDS = 20
+VISIBILITY_TIMEOUT = 900
+# In-flight messages are kept invisible by a heartbeat; each extension is the
+# job's estimated runtime clamped to [VISIBILITY_TIMEOUT, MAX_VISIBILITY_EXTENSION]
+MAX_VISIBILITY_EXTENSION = int(os.getenv("MAX_VISIBILITY_EXTENSION", "3600"))
+JOB_SECONDS_PER_RUN = float(os.getenv("JOB_SECONDS_PER_RUN", "20"))
+JOB_SECONDS_PER_BAR = float(os.getenv("JOB_SECONDS_PER_BAR", "0.0002"))
+# Postgres connections shared by the job slots; idle ones are pinged before reuse
+DB_POOL_SIZE = max(1, int(os.getenv("DB_POOL_SIZE", str(JOB_SLOTS))))
+DB_HEALTHCHECK_SECONDS = 30
+DB_CONNECT_TIMEOUT = 10
+# Run status/progress updates are coalesced per run and written by a
+# background thread at most this often (final statuses are flushed at once)
+STATUS_FLUSH_SECONDS = float(os.getenv("STATUS_FLUSH_SECONDS", "2"))
+# Grid leaderboard: KPI to rank members by (higher is better) and rows kept
+GRID_OBJECTIVE = os.getenv("GRID_OBJECTIVE", "sharpe")
+GRID_LEADERBOARD_SIZE = int(os.getenv("GRID_LEADERBOARD_SIZE", "20"))
+# Grid/walk-forward index.json is rewritten (marked partial) as members finish,
+# right after the first one and then at most this often
+INDEX_FLUSH_SECONDS = float(os.getenv("INDEX_FLUSH_SECONDS", "30"))
+# "warm": backtests go to a long-lived freqtrade process per engine worker;
+# "cli": one `freqtrade backtesting` subprocess per run (FREQTRADE_BIN)
+FREQTRADE_RUNNER = os.getenv("FREQTRADE_RUNNER", "warm").lower()
+# A warm runner is replaced after this many backtests or once its RSS exceeds
+# this; while warm, each engine run also counts this much against
+# ENGINE_MEMORY_BUDGET_MB for the runner it keeps alive
+FREQTRADE_RUNNER_MAX_RUNS = int(os.getenv("FREQTRADE_RUNNER_MAX_RUNS", "25"))
+FREQTRADE_RUNNER_MAX_RSS_MB = int(os.getenv("FREQTRADE_RUNNER_MAX_RSS_MB", "512"))
+# Artifact files uploaded at once; each file above 8 MB goes up as a multipart transfer
+ARTIFACT_UPLOAD_CONCURRENCY = int(os.getenv("ARTIFACT_UPLOAD_CONCURRENCY", "8"))
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=4,
+)
+# Content-addressed engine results: identical (strategy, manifest, spec, params)
+# runs copy a prior run's artifacts instead of re-running the engine
+RESULT_CACHE = os.getenv("RESULT_CACHE", "on").lower() not in {"0", "off", "false", "no"}
+RESULT_CACHE_PREFIX = "cache/results"
+# Bump when KPI maths or artifact layout change so older entries stop matching
+RESULT_CACHE_VERSION = 1
+# Concurrent time segments per OHLCV year download (shared rate limit per exchange)
+OHLCV_FETCH_CONCURRENCY = int(os.getenv("OHLCV_FETCH_CONCURRENCY", "4"))
+OHLCV_PAGE_LIMIT = 500
+OHLCV_COLUMNS = ["timestamp", "open", "high", "low", "close", "volume"]
 
 def mk_sqs():
     return boto3.client("sqs", region_name=REGION)
@@ -50,7 +133,7 @@ def log(msg: str):
 def handle_sigterm(_signo, _frame):
     global STOP
     STOP = True
-    log("Received SIGTERM, will exit after current iteration…")
+    log("Received SIGTERM, draining in-flight jobs before exit…")
 
 signal.signal(signal.SIGTERM, handle_sigterm)
 signal.signal(signal.SIGINT, handle_sigterm)
@@ -83,23 +166,19 @@ def ensure_env_ready() -> bool:
         log("WARN: DATABASE_URL is not set; run status updates will be skipped")
     return ok
 
-def s3_put_json(key: str, obj: Any):
-    body = json.dumps(obj, indent=2).encode("utf-8")
+def s3_put_json(key: str, obj: Any, indent: Optional[int] = 2):
+    body = json.dumps(obj, indent=indent).encode("utf-8")
     s3.put_object(Bucket=BUCKET, Key=key, Body=body, ContentType="application/json")
     log(f"Uploaded s3://{BUCKET}/{key}")
 
-def upload_artifact(prefix: str, filename: str, content: bytes, content_type: str = "application/octet-stream"):
-    key = f"{prefix.rstrip('/')}/{filename}"
-    s3.put_object(Bucket=BUCKET, Key=key, Body=content, ContentType=content_type)
-    log(f"Uploaded s3://{BUCKET}/{key}")
-
 def download_strategy(manifest_key: str, dest_path: Path):
-    """Fetch strategy file/zip from S3 and save locally."""
-    log(f"Downloading strategy s3://{BUCKET}/{manifest_key}")
+    """Fetch strategy file/zip from S3 (through the local ETag cache) and save locally."""
+    body = object_cache.read(manifest_key)
+    if body is None:
+        raise FileNotFoundError(f"strategy s3://{BUCKET}/{manifest_key} does not exist")
     os.makedirs(dest_path.parent, exist_ok=True)
-    with open(dest_path, "wb") as f:
-        s3.download_fileobj(BUCKET, manifest_key, f)
-    log(f"Saved strategy to {dest_path}")
+    dest_path.write_bytes(body)
+    log(f"Saved strategy s3://{BUCKET}/{manifest_key} to {dest_path}")
 
 def safe_pair(pair: str) -> str:
     return pair.replace("/", "-").replace(":", "-").lower()
@@ -119,43 +198,297 @@ def timeframe_to_ms(timeframe: str) -> int:
         return value * 7 * 24 * 60 * 60 * 1000
     return 60 * 60 * 1000
 
+def temp_sibling(path: Path) -> Path:
+    """Unique temp path next to `path`, for write-then-rename updates."""
+    return path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+
 def download_if_exists(key: str, dest: Path) -> bool:
     if not BUCKET:
         return False
+    tmp = temp_sibling(dest)
     try:
-        with open(dest, "wb") as fh:
+        with open(tmp, "wb") as fh:
             s3.download_fileobj(BUCKET, key, fh)
+        os.replace(tmp, dest)
         log(f"Cached s3://{BUCKET}/{key} -> {dest}")
         return True
     except ClientError as exc:
         if exc.response.get("Error", {}).get("Code") in {"NoSuchKey", "404"}:
             return False
         raise
+    finally:
+        tmp.unlink(missing_ok=True)
+
+class ObjectCache:
+    """
+    Local copies of small S3 objects that are re-read job after job
+    (strategy payloads, manifests). Every fetch is a conditional GET with
+    the cached ETag, so an unchanged object costs one bodiless 304; files
+    are named by (key, ETag), so a concurrent update never mixes versions.
+    A superseded version is deleted once its replacement is in place, and
+    the directory is part of the disk budget, which evicts idle copies.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.entries: Dict[str, Tuple[str, Path]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, key: str) -> Optional[Path]:
+        """Local path holding the current s3://BUCKET/key, or None if it does not exist."""
+        with self._lock:
+            cached = self.entries.get(key)
+        if cached and not cached[1].exists():
+            cached = None
+        request = {"Bucket": BUCKET, "Key": key}
+        if cached:
+            request["IfNoneMatch"] = cached[0]
+        try:
+            obj = s3.get_object(**request)
+        except ClientError as exc:
+            code = exc.response.get("Error", {}).get("Code")
+            if cached and code in {"304", "NotModified"}:
+                with self._lock:
+                    self.hits += 1
+                try:
+                    os.utime(cached[1])  # recency for the disk budget
+                except FileNotFoundError:
+                    pass
+                return cached[1]
+            if code in {"NoSuchKey", "404"}:
+                return None
+            raise
+
+        etag = obj["ETag"]
+        digest = hashlib.sha256(f"{key}\0{etag}".encode("utf-8")).hexdigest()[:32]
+        path = self.root / digest
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = temp_sibling(path)
+        try:
+            with open(tmp, "wb") as fh:
+                shutil.copyfileobj(obj["Body"], fh)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        with self._lock:
+            previous = self.entries.get(key)
+            self.entries[key] = (etag, path)
+            self.misses += 1
+        if previous and previous[1] != path:
+            previous[1].unlink(missing_ok=True)
+        log(f"Cached s3://{BUCKET}/{key} (ETag {etag}) -> {path}")
+        return path
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Contents of the current s3://BUCKET/key, or None if it does not exist."""
+        for attempt in range(2):
+            path = self.fetch(key)
+            if path is None:
+                return None
+            try:
+                return path.read_bytes()
+            except FileNotFoundError:
+                # Replaced or evicted between fetch and read; fetch again
+                if attempt:
+                    raise
+        return None
 
-def upload_file(path: Path, key: str, content_type: str = "application/octet-stream"):
+
+object_cache = ObjectCache(STRATEGY_CACHE_DIR)
+
+
+def upload_file(
+    path: Path,
+    key: str,
+    content_type: str = "application/octet-stream",
+    content_encoding: Optional[str] = None,
+):
     if not BUCKET:
         return
     extra = {"ContentType": content_type}
-    s3.upload_file(str(path), BUCKET, key, ExtraArgs=extra)
+    if content_encoding:
+        extra["ContentEncoding"] = content_encoding
+    s3.upload_file(str(path), BUCKET, key, ExtraArgs=extra, Config=TRANSFER_CONFIG)
     log(f"Uploaded file s3://{BUCKET}/{key}")
 
-def fetch_ohlcv_year(exchange_id: str, symbol: str, timeframe: str, year: int) -> pd.DataFrame:
+
+def copy_object(
+    source_key: str,
+    key: str,
+    content_type: str = "application/octet-stream",
+    content_encoding: Optional[str] = None,
+):
+    """Server-side S3 copy (multipart above the transfer threshold) with explicit headers."""
+    if not BUCKET:
+        return
+    # Multipart copies do not carry the source's metadata over, so set it for both paths
+    extra = {"MetadataDirective": "REPLACE", "ContentType": content_type}
+    if content_encoding:
+        extra["ContentEncoding"] = content_encoding
+    s3.copy({"Bucket": BUCKET, "Key": source_key}, BUCKET, key, ExtraArgs=extra, Config=TRANSFER_CONFIG)
+    log(f"Copied s3://{BUCKET}/{source_key} -> {key}")
+
+
+class ArtifactUploader:
+    """
+    Streams artifact files from disk to S3 on a bounded thread pool, so a
+    handler can hand off one member's uploads and go on to the next. Leaving
+    the `with` block waits for every upload and re-raises the first failure;
+    if the block itself raises, uploads that have not started are cancelled.
+    """
+
+    def __init__(self, concurrency: int = ARTIFACT_UPLOAD_CONCURRENCY):
+        self.pool = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="upload")
+        self.futures = []
+
+    def __enter__(self) -> "ArtifactUploader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            return False
+        try:
+            self.wait()
+        finally:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+        return False
+
+    def submit(self, prefix: str, path: Path, name: Optional[str] = None,
+               content_type: str = "application/octet-stream", content_encoding: Optional[str] = None):
+        key = f"{prefix.rstrip('/')}/{name or path.name}"
+        self.futures.append(self.pool.submit(upload_file, path, key, content_type, content_encoding))
+
+    def submit_copy(self, source_key: str, prefix: str, name: str,
+                    content_type: str = "application/octet-stream", content_encoding: Optional[str] = None):
+        key = f"{prefix.rstrip('/')}/{name}"
+        self.futures.append(self.pool.submit(copy_object, source_key, key, content_type, content_encoding))
+
+    def submit_artifacts(self, prefix: str, artifacts: List[Dict[str, Any]]):
+        """
+        Queue the artifacts listed in a run_engine result (missing files are
+        skipped). Entries with a `source_key` (result cache hits) are copied
+        server-side from that key instead of uploaded.
+        """
+        for a in artifacts:
+            if a.get("source_key"):
+                self.submit_copy(
+                    a["source_key"],
+                    prefix,
+                    a["name"],
+                    a.get("content_type", "application/octet-stream"),
+                    a.get("content_encoding"),
+                )
+                continue
+            p = Path(a["path"])
+            if p.exists():
+                self.submit(
+                    prefix,
+                    p,
+                    a.get("name", p.name),
+                    a.get("content_type", "application/octet-stream"),
+                    a.get("content_encoding"),
+                )
+
+    def wait(self):
+        futures, self.futures = self.futures, []
+        for fut in futures:
+            fut.result()
+
+
+class PartialIndex:
+    """
+    Rewrites a grid/walk-forward index.json while its members are still
+    running: right after the first member and then at most every
+    `interval` seconds, with "partial": true plus done/total counts. Each
+    rewrite first waits for the uploads queued so far, so a listed member's
+    artifacts are always readable.
+    """
+
+    def __init__(self, key: str, uploader: ArtifactUploader, entries_key: str, interval: Optional[float] = None):
+        self.key = key
+        self.uploader = uploader
+        self.entries_key = entries_key
+        self.interval = INDEX_FLUSH_SECONDS if interval is None else interval
+        self.last_flush: Optional[float] = None
+
+    def update(self, index: Dict[str, Any], entries: Dict[int, Dict[str, Any]], total: int):
+        if self.last_flush is not None and time.monotonic() - self.last_flush < self.interval:
+            return
+        self.uploader.wait()
+        partial = {
+            **index,
+            self.entries_key: [entries[i] for i in sorted(entries)],
+            "partial": True,
+            "done": len(entries),
+            "total": total,
+        }
+        s3_put_json(self.key, partial)
+        self.last_flush = time.monotonic()
+
+def mk_exchange(exchange_id: str):
     exchange_cls = getattr(ccxt, exchange_id, None)
     if not exchange_cls:
         raise RuntimeError(f"Unsupported exchange: {exchange_id}")
-    exchange = exchange_cls({"enableRateLimit": True})
+    # Throttling is handled by the shared per-exchange RateLimiter, which
+    # also covers concurrent segment fetches.
+    exchange = exchange_cls({"enableRateLimit": False})
     if not exchange.has.get("fetchOHLCV"):
         raise RuntimeError(f"{exchange_id} does not support fetchOHLCV")
-
-    since = int(pd.Timestamp(year=year, month=1, day=1, tz="UTC").timestamp() * 1000)
-    until = int(pd.Timestamp(year=year + 1, month=1, day=1, tz="UTC").timestamp() * 1000)
+    return exchange
+
+
+class RateLimiter:
+    """Spaces calls at least `interval` seconds apart across every thread sharing it."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+def exchange_rate_limiter(exchange_id: str, interval: float) -> RateLimiter:
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(exchange_id)
+        if limiter is None:
+            limiter = _rate_limiters[exchange_id] = RateLimiter(interval)
+        return limiter
+
+def ohlcv_segments(since: int, until: int, timeframe_ms: int, count: int) -> List[Tuple[int, int]]:
+    """Split [since, until) into at most `count` candle-aligned ranges of at least one page each."""
+    candles = max(math.ceil((until - since) / timeframe_ms), 1)
+    per_segment = max(math.ceil(candles / max(count, 1)), OHLCV_PAGE_LIMIT)
+    step = per_segment * timeframe_ms
+    return [(start, min(start + step, until)) for start in range(since, until, step)]
+
+def fetch_ohlcv_range(
+    exchange,
+    limiter: RateLimiter,
+    symbol: str,
+    timeframe: str,
+    since: int,
+    until: int,
+) -> List[List[float]]:
     timeframe_ms = timeframe_to_ms(timeframe)
-
     rows: List[List[float]] = []
     cursor = since
     while cursor < until:
+        limiter.wait()
         try:
-            batch = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=cursor, limit=500)
+            batch = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=cursor, limit=OHLCV_PAGE_LIMIT)
         except ccxt.BaseError as exc:
             log(f"fetch_ohlcv error {exc}; sleeping")
             time.sleep(1)
@@ -164,21 +497,247 @@ def fetch_ohlcv_year(exchange_id: str, symbol: str, timeframe: str, year: int) -
         if not batch:
             break
 
-        rows.extend(batch)
+        rows.extend(row for row in batch if since <= row[0] < until)
         next_cursor = batch[-1][0] + timeframe_ms
         if next_cursor <= cursor:
             next_cursor = cursor + timeframe_ms
         cursor = next_cursor
-        if exchange.rateLimit:
-            time.sleep(exchange.rateLimit / 1000)
+    return rows
+
+def year_bounds_ms(year: int) -> Tuple[int, int]:
+    since = int(pd.Timestamp(year=year, month=1, day=1, tz="UTC").timestamp() * 1000)
+    until = int(pd.Timestamp(year=year + 1, month=1, day=1, tz="UTC").timestamp() * 1000)
+    return since, until
+
+def year_closed(year: int, timeframe: str) -> bool:
+    """True once the last candle of `year` has closed."""
+    return year_bounds_ms(year)[1] <= int(time.time() * 1000) - timeframe_to_ms(timeframe)
+
+def fetch_ohlcv_year(exchange_id: str, symbol: str, timeframe: str, year: int) -> pd.DataFrame:
+    since, until = year_bounds_ms(year)
+    return fetch_ohlcv_between(exchange_id, symbol, timeframe, since, until, label=str(year))
 
+def fetch_ohlcv_between(
+    exchange_id: str,
+    symbol: str,
+    timeframe: str,
+    since: int,
+    until: int,
+    label: str = "",
+) -> pd.DataFrame:
+    """Fetch closed candles with since <= timestamp < until (ms)."""
+    exchange = mk_exchange(exchange_id)
+    limiter = exchange_rate_limiter(exchange_id, (exchange.rateLimit or 0) / 1000)
+
+    timeframe_ms = timeframe_to_ms(timeframe)
+    # Never store the still-open candle; it would be frozen with partial values
+    until = min(until, int(time.time() * 1000) - timeframe_ms)
+    if until <= since:
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
+
+    segments = ohlcv_segments(since, until, timeframe_ms, OHLCV_FETCH_CONCURRENCY)
+    if len(segments) <= 1:
+        parts = [fetch_ohlcv_range(exchange, limiter, symbol, timeframe, since, until)]
+    else:
+        log(f"Fetching {exchange_id} {symbol} {timeframe} {label} in {len(segments)} segments")
+
+        def fetch_segment(segment: Tuple[int, int]) -> List[List[float]]:
+            # ccxt clients are not thread-safe; one per segment
+            return fetch_ohlcv_range(mk_exchange(exchange_id), limiter, symbol, timeframe, *segment)
+
+        with ThreadPoolExecutor(max_workers=min(OHLCV_FETCH_CONCURRENCY, len(segments))) as pool:
+            parts = list(pool.map(fetch_segment, segments))
+
+    rows = [row for part in parts for row in part]
     if not rows:
-        return pd.DataFrame(columns=["timestamp", "open", "high", "low", "close", "volume"])
+        return pd.DataFrame(columns=OHLCV_COLUMNS)
 
-    df = pd.DataFrame(rows, columns=["timestamp", "open", "high", "low", "close", "volume"])
+    df = pd.DataFrame(rows, columns=OHLCV_COLUMNS)
+    df = df.drop_duplicates(subset="timestamp", keep="first").sort_values("timestamp", kind="stable")
     df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms", utc=True)
+    return df.reset_index(drop=True)
+
+PARTITION_COVERAGE_KEY = b"mh.coverage"
+# Row groups span about a week of candles so range reads can skip the rest
+# of the year; coarse timeframes keep a floor to avoid tiny groups.
+PARTITION_ROW_GROUP_SPAN_MS = 7 * 24 * 60 * 60 * 1000
+PARTITION_MIN_ROW_GROUP = 4096
+
+def partition_row_group_size(timeframe: str) -> int:
+    return max(PARTITION_ROW_GROUP_SPAN_MS // timeframe_to_ms(timeframe), PARTITION_MIN_ROW_GROUP)
+
+def write_partition(
+    df: pd.DataFrame,
+    local_path: Path,
+    s3_key: str,
+    timeframe: str,
+    year: int,
+    complete: Optional[bool] = None,
+):
+    """
+    Write a year partition with its coverage (last candle, complete flag) in
+    the parquet footer. The file is renamed into place so readers never see a
+    partial write, then uploaded to S3 (a single atomic PUT). `complete`
+    overrides the flag for rows that did not come from a fresh fetch.
+    """
+    timestamps = pd.to_datetime(df["timestamp"], utc=True)
+    last_candle = int(timestamps.max().value // 1_000_000)
+    coverage = {
+        "lastCandle": last_candle,
+        # Partitions are written right after a fetch, so the year is complete
+        # once it has closed, even if the market stopped trading earlier.
+        "complete": year_closed(year, timeframe) if complete is None else complete,
+        "updatedAt": datetime.utcnow().isoformat() + "Z",
+    }
+    table = pa.Table.from_pandas(df.reset_index(drop=True), preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[PARTITION_COVERAGE_KEY] = json.dumps(coverage).encode("utf-8")
+    table = table.replace_schema_metadata(metadata)
+
+    tmp = temp_sibling(local_path)
+    try:
+        pq.write_table(table, tmp, row_group_size=partition_row_group_size(timeframe))
+        os.replace(tmp, local_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    upload_file(local_path, s3_key, "application/octet-stream")
+
+def partition_coverage(local_path: Path, timeframe: str, year: int) -> Dict[str, Any]:
+    """Coverage recorded by write_partition, derived from the data for older files."""
+    raw = (pq.read_schema(local_path).metadata or {}).get(PARTITION_COVERAGE_KEY)
+    if raw:
+        return json.loads(raw)
+    timestamps = pd.to_datetime(pd.read_parquet(local_path, columns=["timestamp"])["timestamp"], utc=True)
+    if timestamps.empty:
+        return {"lastCandle": None, "complete": False}
+    last_candle = int(timestamps.max().value // 1_000_000)
+    _, year_end = year_bounds_ms(year)
+    return {
+        "lastCandle": last_candle,
+        "complete": last_candle + timeframe_to_ms(timeframe) >= year_end,
+        "derived": True,
+    }
+
+def read_partition(
+    local_path: Path,
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+    columns: Optional[List[str]] = None,
+) -> pd.DataFrame:
+    """
+    Read candles with start <= timestamp <= end. The range filter and column
+    projection are pushed into pyarrow, so row groups outside the range are
+    skipped using their min/max statistics instead of being decoded.
+    """
+    table = pq.read_table(
+        local_path,
+        columns=columns or OHLCV_COLUMNS,
+        filters=[("timestamp", ">=", start), ("timestamp", "<=", end)],
+    )
+    df = table.to_pandas()
+    if not isinstance(df["timestamp"].dtype, pd.DatetimeTZDtype):
+        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
     return df
 
+def refresh_partition_tail(
+    local_path: Path,
+    s3_key: str,
+    exchange_id: str,
+    symbol: str,
+    timeframe: str,
+    year: int,
+    last_candle: int,
+):
+    """Append candles after `last_candle` to an open (current-year) partition."""
+    _, year_end = year_bounds_ms(year)
+    tail = fetch_ohlcv_between(
+        exchange_id, symbol, timeframe, last_candle + timeframe_to_ms(timeframe), year_end, label=f"{year} tail"
+    )
+    if tail.empty and not year_closed(year, timeframe):
+        return
+    # An empty tail on a closed year is still written once, to mark it complete
+    existing = pd.read_parquet(local_path)
+    existing["timestamp"] = pd.to_datetime(existing["timestamp"], utc=True)
+    merged = pd.concat([existing, tail]).drop_duplicates(subset="timestamp", keep="last").sort_values("timestamp")
+    write_partition(merged, local_path, s3_key, timeframe, year)
+    log(f"Appended {len(tail)} candles to {s3_key}")
+
+class FrameCache:
+    """
+    Memory-bounded LRU of decoded OHLCV partitions keyed by
+    (exchange, pair, timeframe, year). Each entry remembers the timestamp
+    range it holds; a request inside that range is sliced from memory, and a
+    wider request re-reads the union so the entry only grows. Entries are tied
+    to the partition file's identity, so a rewritten partition is reloaded.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Any, ...], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(
+        self,
+        key: Tuple[Any, ...],
+        version: Any,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        loader: Callable[[pd.Timestamp, pd.Timestamp], pd.DataFrame],
+    ) -> pd.DataFrame:
+        frame = None
+        lo, hi = start, end
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry["version"] != version:
+                self._drop(key)
+                entry = None
+            if entry is not None and entry["start"] <= start and entry["end"] >= end:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                frame = entry["frame"]
+            else:
+                self.misses += 1
+                if entry is not None:
+                    lo, hi = min(lo, entry["start"]), max(hi, entry["end"])
+        if frame is None:
+            frame = loader(lo, hi)
+            self._put(key, version, lo, hi, frame)
+        ts = frame["timestamp"]
+        return frame.iloc[ts.searchsorted(start, "left"):ts.searchsorted(end, "right")]
+
+    def _put(self, key, version, start, end, frame: pd.DataFrame):
+        size = int(frame.memory_usage(index=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return
+            self._entries[key] = {"version": version, "start": start, "end": end, "frame": frame, "bytes": size}
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry["bytes"]
+
+    def stats(self) -> str:
+        return (
+            f"hits={self.hits} misses={self.misses} entries={len(self._entries)} "
+            f"size={self.bytes / 1e6:.1f}/{self.max_bytes / 1e6:.1f} MB"
+        )
+
+
+frame_cache = FrameCache(FRAME_CACHE_MB * 1024 * 1024)
+
+def partition_version(local_path: Path) -> Tuple[int, int]:
+    # Partitions are replaced by rename, so a rewrite always changes the inode
+    st = local_path.stat()
+    return st.st_ino, st.st_size
+
 def ensure_market_data(spec: Dict[str, Any], cache_dir: Path) -> pd.DataFrame:
     exchange_id = (spec.get("exchange") or "binance").lower()
     symbol = spec.get("pair") or "BTC/USDT"
@@ -192,31 +751,48 @@ def ensure_market_data(spec: Dict[str, Any], cache_dir: Path) -> pd.DataFrame:
     frames: List[pd.DataFrame] = []
     cache_dir.mkdir(parents=True, exist_ok=True)
     pair_slug = safe_pair(symbol)
+    timeframe_ms = timeframe_to_ms(timeframe)
+    end_ms = int(end.value // 1_000_000)
 
     for year in years:
         local_path = cache_dir / f"{exchange_id}_{pair_slug}_{timeframe}_{year}.parquet"
         s3_key = f"data/{exchange_id}/{pair_slug}/{timeframe}/{year}.parquet"
+        disk_budget.record_partition(local_path, hit=local_path.exists())
         if not local_path.exists():
             downloaded = download_if_exists(s3_key, local_path)
             if not downloaded:
                 df_year = fetch_ohlcv_year(exchange_id, symbol, timeframe, year)
                 if df_year.empty:
                     continue
-                df_year.to_parquet(local_path, index=False)
-                upload_file(local_path, s3_key, "application/octet-stream")
+                write_partition(df_year, local_path, s3_key, timeframe, year)
         try:
-            df = pd.read_parquet(local_path)
+            coverage = partition_coverage(local_path, timeframe, year)
+            last_candle = coverage.get("lastCandle")
+            if not coverage.get("complete") and last_candle is not None and last_candle + timeframe_ms <= end_ms:
+                refresh_partition_tail(local_path, s3_key, exchange_id, symbol, timeframe, year, last_candle)
+            elif coverage.get("derived"):
+                # Older partitions: one huge row group and no coverage; rewrite once,
+                # keeping the coverage derived from the rows actually in the file
+                write_partition(
+                    pd.read_parquet(local_path), local_path, s3_key, timeframe, year, complete=coverage["complete"]
+                )
+            df = frame_cache.load(
+                (exchange_id, pair_slug, timeframe, year),
+                partition_version(local_path),
+                start,
+                end,
+                lambda lo, hi: read_partition(local_path, lo, hi),
+            )
         except Exception:
             log(f"Failed to read cache {local_path}, refetching…")
             df = fetch_ohlcv_year(exchange_id, symbol, timeframe, year)
             if df.empty:
                 continue
-            df.to_parquet(local_path, index=False)
-            upload_file(local_path, s3_key, "application/octet-stream")
-        df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True)
-        mask = (df["timestamp"] >= start) & (df["timestamp"] <= end)
-        frames.append(df.loc[mask])
+            write_partition(df, local_path, s3_key, timeframe, year)
+            df = df.loc[(df["timestamp"] >= start) & (df["timestamp"] <= end)]
+        frames.append(df)
 
+    log(f"Frame cache: {frame_cache.stats()}")
     if not frames:
         raise RuntimeError("No historical data available")
 
@@ -224,93 +800,489 @@ def ensure_market_data(spec: Dict[str, Any], cache_dir: Path) -> pd.DataFrame:
     merged = merged.set_index("timestamp")
     return merged
 
+# --------------------------------------------------------------------
+# Disk budget (market-data cache + job workdirs)
+# --------------------------------------------------------------------
+def path_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                pass
+    return total
+
+
+class DiskBudget:
+    """
+    Keeps /tmp/market-data, /tmp/strategy-cache and /tmp/workdir under a
+    byte budget. Market partitions, cached S3 objects and finished job
+    workdirs are evicted least-recently-used first (recency = mtime, bumped
+    on every cache hit); workdirs of jobs still in flight are never touched.
+    """
+
+    def __init__(self, budget_bytes: int, market_dir: Path, workdir_root: Path, object_dir: Optional[Path] = None):
+        self.budget_bytes = budget_bytes
+        self.market_dir = market_dir
+        self.workdir_root = workdir_root
+        self.object_dir = object_dir
+        self.active: Set[Path] = set()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def record_partition(self, path: Path, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if hit:
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+
+    def job_started(self, workdir: Path):
+        with self._lock:
+            self.active.add(workdir)
+
+    def job_finished(self, workdir: Path):
+        """Call once the job's artifacts are uploaded; the workdir becomes evictable."""
+        with self._lock:
+            self.active.discard(workdir)
+        if workdir.exists():
+            os.utime(workdir)
+
+    def entries(self) -> List[Tuple[float, int, Path, bool]]:
+        """(recency, size, path, evictable) for every cached partition, object and workdir."""
+        found: List[Tuple[float, int, Path, bool]] = []
+        if self.market_dir.exists():
+            for path in self.market_dir.glob("*.parquet"):
+                try:
+                    found.append((path.stat().st_mtime, path_size(path), path, True))
+                except FileNotFoundError:
+                    pass
+        if self.object_dir and self.object_dir.exists():
+            for path in self.object_dir.iterdir():
+                if path.name.startswith("."):
+                    continue  # a download still being written
+                try:
+                    found.append((path.stat().st_mtime, path_size(path), path, True))
+                except FileNotFoundError:
+                    pass
+        if self.workdir_root.exists():
+            with self._lock:
+                active = set(self.active)
+            for path in self.workdir_root.iterdir():
+                try:
+                    found.append((path.stat().st_mtime, path_size(path), path, path not in active))
+                except FileNotFoundError:
+                    pass
+        return found
+
+    def enforce(self):
+        entries = self.entries()
+        usage = sum(size for _, size, _, _ in entries)
+        evicted = 0
+        for _mtime, size, path, evictable in sorted(entries, key=lambda e: e[0]):
+            if usage <= self.budget_bytes:
+                break
+            if not evictable:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+            usage -= size
+            evicted += 1
+            log(f"Disk budget: evicted {path} ({size / 1e6:.1f} MB)")
+        with self._lock:
+            self.evictions += evicted
+        log(
+            f"Disk budget: {usage / 1e6:.1f}/{self.budget_bytes / 1e6:.1f} MB used; "
+            f"market-data hits={self.hits} misses={self.misses} evictions={self.evictions}"
+        )
+
+
+disk_budget = DiskBudget(DISK_BUDGET_MB * 1024 * 1024, MARKET_CACHE_DIR, WORKDIR_ROOT, STRATEGY_CACHE_DIR)
+
 # --------------------------------------------------------------------
 # Run store (Postgres)
 # --------------------------------------------------------------------
+class ConnectionPool:
+    """
+    Up to `size` autocommit psycopg connections shared across threads.
+    A connection idle for longer than DB_HEALTHCHECK_SECONDS is pinged
+    before reuse, and closed/broken connections are dropped and replaced
+    with fresh ones on demand, so a restarted database or a dropped link
+    only costs the statement that hit it.
+    """
+
+    def __init__(self, url: str, size: int = DB_POOL_SIZE):
+        self.url = url
+        self.size = max(1, size)
+        self.idle: List[Tuple[Any, float]] = []
+        self.opened = 0
+        self._cond = threading.Condition()
+
+    def _connect(self):
+        return psycopg.connect(self.url, autocommit=True, connect_timeout=DB_CONNECT_TIMEOUT)
+
+    @staticmethod
+    def _usable(conn) -> bool:
+        return not conn.closed and not conn.broken
+
+    def _healthy(self, conn) -> bool:
+        try:
+            conn.execute("SELECT 1")
+            return True
+        except psycopg.Error:
+            return False
+
+    def _acquire(self):
+        with self._cond:
+            while not self.idle and self.opened >= self.size:
+                self._cond.wait()
+            if self.idle:
+                conn, since = self.idle.pop()
+            else:
+                conn, since = None, 0.0
+                self.opened += 1
+        if conn is not None and (
+            not self._usable(conn)
+            or (time.monotonic() - since > DB_HEALTHCHECK_SECONDS and not self._healthy(conn))
+        ):
+            log("Postgres connection failed its health check; reconnecting")
+            conn.close()
+            conn = None
+        if conn is None:
+            try:
+                conn = self._connect()
+            except BaseException:
+                self._release(None)
+                raise
+        return conn
+
+    def _release(self, conn):
+        with self._cond:
+            if conn is not None and self._usable(conn):
+                self.idle.append((conn, time.monotonic()))
+            else:
+                if conn is not None:
+                    conn.close()
+                self.opened -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
+        try:
+            yield conn
+        except psycopg.OperationalError:
+            conn.close()
+            raise
+        finally:
+            self._release(conn)
+
+    def close(self):
+        with self._cond:
+            idle, self.idle = self.idle, []
+            self.opened -= len(idle)
+        for conn, _ in idle:
+            conn.close()
+
+
 class RunStore:
-    def __init__(self, url: Optional[str]):
+    def __init__(self, url: Optional[str], pool_size: int = DB_POOL_SIZE):
         self.url = url
-        self.conn = None
-        if url:
+        self.pool = ConnectionPool(url, pool_size) if url else None
+        if self.pool:
             try:
-                self.conn = psycopg.connect(url)
-                self.conn.autocommit = True
-                log("Connected to Postgres for run status updates")
+                with self.pool.connection():
+                    log("Connected to Postgres for run status updates")
             except Exception as exc:
-                log(f"ERROR: failed to connect to Postgres: {exc}")
-                self.conn = None
+                # Keep the pool: the next update reconnects instead of the
+                # worker running without status updates until it restarts
+                log(f"ERROR: failed to connect to Postgres (will retry per update): {exc}")
 
     def enabled(self) -> bool:
-        return self.conn is not None
+        return self.pool is not None
+
+    def _with_retry(self, fn: Callable[[Any], Any]) -> Any:
+        """Run fn(conn), retrying once on a fresh connection if the first one has dropped."""
+        if not self.pool:
+            return None
+        for attempt in range(2):
+            try:
+                with self.pool.connection() as conn:
+                    return fn(conn)
+            except psycopg.OperationalError as exc:
+                if attempt:
+                    raise
+                log(f"WARN: Postgres connection lost ({exc}); retrying on a new connection")
 
     def ensure_run(self, job: Dict[str, Any], artifact_prefix: str, kind: str):
-        if not self.conn:
-            return
         spec = job.get("spec") or {}
         params = job.get("params") or {}
-        with self.conn.cursor() as cur:
-            cur.execute(
-                '''
-                INSERT INTO "Run" ("id","strategyId","ownerId","kind","status","artifactPrefix","spec","params")
-                VALUES (%s,%s,%s,%s,%s,%s,%s,%s)
-                ON CONFLICT ("id") DO NOTHING
-                ''',
-                (
-                    job.get("runId"),
-                    job.get("strategyId"),
-                    job.get("ownerId"),
-                    kind.upper(),
-                    "QUEUED",
-                    artifact_prefix,
-                    Json(spec),
-                    Json(params),
-                ),
-            )
-
-    def mark_running(self, run_id: str):
         self._execute(
-            'UPDATE "Run" SET status=%s, "startedAt"=COALESCE("startedAt", NOW()), "updatedAt"=NOW() WHERE id=%s',
-            ("RUNNING", run_id),
+            '''
+            INSERT INTO "Run" ("id","strategyId","ownerId","kind","status","artifactPrefix","spec","params","updatedAt")
+            VALUES (%s,%s,%s,%s,%s,%s,%s,%s,NOW())
+            ON CONFLICT ("id") DO NOTHING
+            ''',
+            (
+                job.get("runId"),
+                job.get("strategyId"),
+                job.get("ownerId"),
+                kind.upper(),
+                "QUEUED",
+                artifact_prefix,
+                Json(spec),
+                Json(params),
+            ),
         )
 
-    def mark_succeeded(
+    def record_children(self, job: Dict[str, Any], kind: str, children: List[Dict[str, Any]]):
+        """
+        Upsert one "Run" row per grid member / walk-forward window (runId,
+        artifactPrefix, params, kpis, optional error) under the parent run,
+        in a single transaction with pipelined inserts.
+        """
+        if not children:
+            return
+        spec = Json(job.get("spec") or {})
+        rows = [
+            (
+                child["runId"],
+                job.get("runId"),
+                job.get("strategyId"),
+                job.get("ownerId"),
+                kind.upper(),
+                "FAILED" if child.get("error") else "SUCCEEDED",
+                child["artifactPrefix"],
+                spec,
+                Json(child.get("params") or {}),
+                Json(child["kpis"]) if child.get("kpis") else None,
+            )
+            for child in children
+        ]
+
+        def write(conn):
+            with conn.transaction(), conn.cursor() as cur:
+                cur.executemany(
+                    '''
+                    INSERT INTO "Run" ("id","parentRunId","strategyId","ownerId","kind","status","artifactPrefix",
+                                       "spec","params","kpis","startedAt","finishedAt","updatedAt")
+                    VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,NOW(),NOW(),NOW())
+                    ON CONFLICT ("id") DO UPDATE SET
+                        "status"=EXCLUDED."status", "artifactPrefix"=EXCLUDED."artifactPrefix",
+                        "params"=EXCLUDED."params", "kpis"=EXCLUDED."kpis",
+                        "finishedAt"=EXCLUDED."finishedAt", "updatedAt"=NOW()
+                    ''',
+                    rows,
+                )
+
+        self._with_retry(write)
+        log(f"Recorded {len(rows)} child runs of {job.get('runId')}")
+
+    def update_run(
         self,
         run_id: str,
-        kpis: Optional[Dict[str, Any]],
-        artifact_prefix: Optional[str],
+        status: Optional[str] = None,
+        kpis: Optional[Dict[str, Any]] = None,
+        artifact_prefix: Optional[str] = None,
+        progress: Optional[Dict[str, Any]] = None,
     ):
-        assignments = ['status=%s', '"finishedAt"=NOW()']
-        values: List[Any] = ["SUCCEEDED"]
+        """One UPDATE for any mix of status, KPIs, artifact prefix and progress."""
+        assignments: List[str] = []
+        values: List[Any] = []
+        if status:
+            assignments.append("status=%s")
+            values.append(status)
+            if status == "RUNNING":
+                assignments.append('"startedAt"=COALESCE("startedAt", NOW())')
+            elif status in {"SUCCEEDED", "FAILED"}:
+                assignments.append('"finishedAt"=NOW()')
         if kpis is not None:
             assignments.append('"kpis"=%s')
             values.append(Json(kpis))
         if artifact_prefix:
             assignments.append('"artifactPrefix"=%s')
             values.append(artifact_prefix)
+        if progress is not None:
+            assignments.append('"progress"=%s')
+            values.append(Json(progress))
         self._update(run_id, assignments, values)
 
+    def mark_running(self, run_id: str):
+        self.update_run(run_id, status="RUNNING")
+
+    def mark_succeeded(
+        self,
+        run_id: str,
+        kpis: Optional[Dict[str, Any]],
+        artifact_prefix: Optional[str],
+    ):
+        self.update_run(run_id, status="SUCCEEDED", kpis=kpis, artifact_prefix=artifact_prefix)
+
     def mark_failed(self, run_id: str):
-        self._update(run_id, ['status=%s', '"finishedAt"=NOW()'], ["FAILED"])
+        self.update_run(run_id, status="FAILED")
 
     def _execute(self, query: str, params: tuple):
-        if not self.conn:
-            return
-        with self.conn.cursor() as cur:
-            cur.execute(query, params)
+        self._with_retry(lambda conn: conn.execute(query, params))
 
     def _update(self, run_id: str, assignments: List[str], values: List[Any]):
-        if not self.conn or not assignments:
+        if not assignments:
             return
         set_clause = ", ".join(assignments + ['"updatedAt"=NOW()'])
-        with self.conn.cursor() as cur:
-            cur.execute(
-                f'UPDATE "Run" SET {set_clause} WHERE id=%s',
-                (*values, run_id),
-            )
+        self._execute(f'UPDATE "Run" SET {set_clause} WHERE id=%s', (*values, run_id))
+
+    def close(self):
+        if self.pool:
+            self.pool.close()
+
+
+class RunStatusWriter:
+    """
+    Non-blocking front for a RunStore. Job threads enqueue run inserts,
+    status changes, progress and child rows; updates for the same run are
+    coalesced (latest status/progress wins, child batches accumulate), so
+    pending state is bounded by the number of runs in flight rather than by
+    the update rate. A background thread writes everything every
+    STATUS_FLUSH_SECONDS, or right away once a run reaches a final status.
+    A run's parent row, child rows and run update are written separately.
+    Parts that fail on the connection (OperationalError) stay pending and are
+    retried on the next flush; a part failing with any other error would fail
+    again, so only that part is logged and dropped. A rejected run update is
+    retried without progress, so the status and KPIs are never lost with it.
+    close() flushes what is left.
+    """
+
+    FINAL = {"SUCCEEDED", "FAILED"}
+
+    def __init__(self, store: RunStore, interval: float = STATUS_FLUSH_SECONDS):
+        self.store = store
+        self.interval = interval
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def enabled(self) -> bool:
+        return self.store.enabled()
+
+    def start(self) -> "RunStatusWriter":
+        if self.enabled() and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="run-status", daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    @staticmethod
+    def _merge(entry: Dict[str, Any], newer: Dict[str, Any]) -> Dict[str, Any]:
+        merged = {**entry, **newer}
+        if "children" in entry and "children" in newer:
+            merged["children"] = entry["children"] + newer["children"]
+        return merged
+
+    def _enqueue(self, run_id: str, **update: Any):
+        if not self.enabled():
+            return
+        with self._lock:
+            self.pending[run_id] = self._merge(self.pending.get(run_id, {}), update)
+        if update.get("status") in self.FINAL:
+            self._wake.set()
+
+    def ensure_run(self, job: Dict[str, Any], artifact_prefix: str, kind: str):
+        self._enqueue(job.get("runId"), ensure=(job, artifact_prefix, kind))
+
+    def mark_running(self, run_id: str):
+        self._enqueue(run_id, status="RUNNING")
+
+    def progress(self, run_id: str, progress: Dict[str, Any]):
+        self._enqueue(run_id, progress={**progress, "updatedAt": datetime.utcnow().isoformat() + "Z"})
+
+    def mark_succeeded(self, run_id: str, kpis: Optional[Dict[str, Any]], artifact_prefix: Optional[str]):
+        update: Dict[str, Any] = {"status": "SUCCEEDED"}
+        if kpis is not None:
+            update["kpis"] = kpis
+        if artifact_prefix:
+            update["artifact_prefix"] = artifact_prefix
+        self._enqueue(run_id, **update)
+
+    def mark_failed(self, run_id: str):
+        self._enqueue(run_id, status="FAILED")
+
+    def record_children(self, job: Dict[str, Any], kind: str, children: List[Dict[str, Any]]):
+        if children:
+            self._enqueue(job.get("runId"), children=[(job, kind, children)])
+
+    def _write(self, run_id: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Write `entry`; returns what to retry on the next flush (all but rejected parts)."""
+        dropped: Set[str] = set()
+
+        def attempt(keys: Tuple[str, ...], write: Callable[[], Any]) -> bool:
+            try:
+                write()
+            except psycopg.OperationalError:
+                raise
+            except Exception as exc:
+                log(f"ERROR: run status write for {run_id} failed, dropping {', '.join(keys)}: {exc}")
+                dropped.update(keys)
+                return False
+            return True
+
+        status = {k: entry[k] for k in ("status", "kpis", "artifact_prefix") if k in entry}
+        fields = {**status, **({"progress": entry["progress"]} if "progress" in entry else {})}
+        try:
+            # Parent row first: child rows reference it
+            if "ensure" in entry:
+                attempt(("ensure",), lambda: self.store.ensure_run(*entry["ensure"]))
+            if entry.get("children"):
+                attempt(("children",), lambda: [
+                    self.store.record_children(job, kind, children) for job, kind, children in entry["children"]
+                ])
+            if status and "progress" in fields:
+                # One UPDATE normally; if it is rejected (e.g. no progress column
+                # yet), the status and KPIs still go through on their own
+                if not attempt(("progress",), lambda: self.store.update_run(run_id, **fields)):
+                    attempt(tuple(status), lambda: self.store.update_run(run_id, **status))
+            elif fields:
+                attempt(tuple(fields), lambda: self.store.update_run(run_id, **fields))
+        except psycopg.OperationalError as exc:
+            log(f"WARN: run status write for {run_id} failed, will retry: {exc}")
+            return {k: v for k, v in entry.items() if k not in dropped}
+        return {}
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                pending, self.pending = self.pending, {}
+            for run_id, entry in pending.items():
+                retry = self._write(run_id, entry)
+                if retry:
+                    with self._lock:
+                        self.pending[run_id] = self._merge(retry, self.pending.get(run_id, {}))
 
     def close(self):
-        if self.conn:
-            self.conn.close()
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
 
 
 def aggregate_kpis(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -342,6 +1314,284 @@ def aggregate_kpis(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
     return agg
 
 
+KPI_KEYS = ("netReturn", "cagr", "sharpe", "sortino", "maxDD", "winRate", "avgTrade", "trades")
+
+
+def resolve_objective(value: Optional[str]) -> str:
+    objective = value or GRID_OBJECTIVE
+    if objective not in KPI_KEYS:
+        log(f"WARN: unknown grid objective {objective!r}; ranking by sharpe")
+        return "sharpe"
+    return objective
+
+
+def parquet_safe(frame: pd.DataFrame) -> pd.DataFrame:
+    """Params can mix types across members (1, "fast", [1, 2]); store such columns as JSON text."""
+    for col in frame.columns:
+        if frame[col].dtype != object:
+            continue
+        try:
+            pa.array(frame[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            frame[col] = frame[col].map(lambda v: None if v is None else json.dumps(v, sort_keys=True, default=str))
+    return frame
+
+
+def grid_results_frame(children: List[Dict[str, Any]], objective: str) -> pd.DataFrame:
+    """
+    One row per grid member: index, runId, artifactPrefix, `params.<key>`
+    and `kpis.<key>` columns (nested params flattened with dots), the
+    halving rung a member was pruned at (null if it ran the full range) and
+    the member's `rank` by `objective`, best first. Members without the
+    objective KPI rank last; ties keep grid order.
+    """
+    rows = [
+        {
+            "index": child["index"],
+            "runId": child["runId"],
+            "artifactPrefix": child.get("artifactPrefix"),
+            "prunedAtRung": child.get("prunedAtRung"),
+            "params": child.get("params") or {},
+            "kpis": {key: child.get("kpis", {}).get(key) for key in KPI_KEYS},
+        }
+        for child in children
+    ]
+    frame = pd.json_normalize(rows, sep=".") if rows else pd.DataFrame(columns=["index", "runId", "artifactPrefix"])
+    frame["prunedAtRung"] = pd.array(frame.get("prunedAtRung", []), dtype="Int64")
+    for key in KPI_KEYS:
+        frame[f"kpis.{key}"] = pd.to_numeric(frame.get(f"kpis.{key}"), errors="coerce")
+    order = frame.sort_values([f"kpis.{objective}", "index"], ascending=[False, True], na_position="last", kind="stable")
+    frame["rank"] = 0
+    frame.loc[order.index, "rank"] = np.arange(1, len(frame) + 1)
+    return parquet_safe(frame.sort_values("index", kind="stable").reset_index(drop=True))
+
+
+def grid_leaderboard(children: List[Dict[str, Any]], results: pd.DataFrame, size: int) -> List[Dict[str, Any]]:
+    """Top `size` members in rank order, with their params and KPIs as JSON objects."""
+    by_index = {child["index"]: child for child in children}
+    top = results.nsmallest(size, "rank")
+    return [
+        {
+            "rank": int(row.rank),
+            "index": int(row.index_),
+            "runId": by_index[row.index_]["runId"],
+            "artifactPrefix": by_index[row.index_].get("artifactPrefix"),
+            "params": by_index[row.index_].get("params") or {},
+            "kpis": by_index[row.index_].get("kpis") or {},
+        }
+        for row in top.rename(columns={"index": "index_"}).itertuples(index=False)
+    ]
+
+
+GRID_SEARCH_MODES = ("exhaustive", "halving")
+
+
+def resolve_search(value: Optional[str]) -> str:
+    mode = str(value or "exhaustive").strip().lower()
+    if mode not in GRID_SEARCH_MODES:
+        raise ValueError(f"unsupported grid search {value!r}; expected one of {', '.join(GRID_SEARCH_MODES)}")
+    return mode
+
+
+def halving_rungs(spec: Dict[str, Any], config: Optional[Dict[str, Any]], members: int) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    (eta, rung specs) for successive halving. Rung r of k covers the first
+    1/eta^(k-1-r) of the spec's range, so the last rung is the spec itself.
+    By default k = 1 + floor(log_eta(members)), reduced until the shortest
+    rung spans at least `minDays` (default 30).
+    """
+    config = config or {}
+    eta = max(2, int(config.get("eta", 3)))
+    _, start, end = timerange_from_spec(spec)
+    days = (end - start) / pd.Timedelta(days=1)
+    rungs = int(config.get("rungs") or 1 + math.floor(math.log(max(members, 1), eta) + 1e-9))
+    min_days = float(config.get("minDays", 30))
+    while rungs > 1 and days / eta ** (rungs - 1) < min_days:
+        rungs -= 1
+    specs: List[Dict[str, Any]] = []
+    for r in range(rungs - 1):
+        rung_end = (start + (end - start) / eta ** (rungs - 1 - r)).ceil("D")
+        specs.append({**spec, "start": start.strftime("%Y-%m-%d"), "end": rung_end.strftime("%Y-%m-%d")})
+    specs.append(spec)
+    return eta, specs
+
+
+def halving_survivors(kpis: Dict[int, Dict[str, Any]], objective: str, eta: int) -> List[int]:
+    """Members (in grid order) in the top ceil(n / eta) by `objective`; missing values rank last."""
+    def rank_key(i: int):
+        value = kpis[i].get(objective)
+        missing = value is None or (isinstance(value, float) and math.isnan(value))
+        return (missing, 0.0 if missing else -float(value), i)
+
+    keep = max(1, math.ceil(len(kpis) / eta))
+    return sorted(sorted(kpis, key=rank_key)[:keep])
+
+
+# Adaptive optimisation (kind = "optimize"): TPE candidates scored per proposal
+# and the share of evaluations treated as "good"
+OPTIMIZE_CANDIDATES = 24
+OPTIMIZE_GAMMA = 0.1
+
+
+def optimize_space(space: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Parse `optimize.space` into dimensions. Each entry is either
+    {"choices": [...]} or {"low", "high", "type": "int" | "float", "log"};
+    `type` defaults to int when both bounds are ints.
+    """
+    if not isinstance(space, dict) or not space:
+        raise ValueError("optimize.space is empty")
+    dims: List[Dict[str, Any]] = []
+    for name, dim in space.items():
+        if not isinstance(dim, dict):
+            raise ValueError(f"optimize.space.{name} must be an object")
+        if "choices" in dim:
+            choices = list(dim["choices"] or [])
+            if not choices:
+                raise ValueError(f"optimize.space.{name}.choices is empty")
+            dims.append({"name": name, "choices": choices})
+            continue
+        try:
+            low, high = float(dim["low"]), float(dim["high"])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"optimize.space.{name} needs numeric low/high or choices")
+        kind = dim.get("type") or ("int" if isinstance(dim["low"], int) and isinstance(dim["high"], int) else "float")
+        if kind not in {"int", "float"}:
+            raise ValueError(f"optimize.space.{name}.type must be int or float")
+        log_scale = bool(dim.get("log"))
+        if not high > low or (log_scale and low <= 0):
+            raise ValueError(f"optimize.space.{name} has an empty or invalid range")
+        dims.append({"name": name, "low": low, "high": high, "int": kind == "int", "log": log_scale})
+    return dims
+
+
+def space_bounds(dim: Dict[str, Any]) -> Tuple[float, float]:
+    if dim["log"]:
+        return math.log(dim["low"]), math.log(dim["high"])
+    return dim["low"], dim["high"]
+
+
+def to_unit(dim: Dict[str, Any], value: Any) -> float:
+    """A numeric dimension's value mapped to [0, 1] (log-scaled when `log`)."""
+    lo, hi = space_bounds(dim)
+    v = math.log(float(value)) if dim["log"] else float(value)
+    return min(max((v - lo) / (hi - lo), 0.0), 1.0)
+
+
+def from_unit(dim: Dict[str, Any], u: float) -> Any:
+    lo, hi = space_bounds(dim)
+    v = lo + float(u) * (hi - lo)
+    v = math.exp(v) if dim["log"] else v
+    if dim["int"]:
+        return int(min(max(round(v), math.ceil(dim["low"])), math.floor(dim["high"])))
+    return float(min(max(v, dim["low"]), dim["high"]))
+
+
+def params_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def random_candidates(
+    dims: List[Dict[str, Any]], rng: np.random.Generator, count: int, seen: Set[str]
+) -> List[Dict[str, Any]]:
+    """Up to `count` uniformly drawn param sets not in `seen` (fewer once a discrete space runs out)."""
+    out: List[Dict[str, Any]] = []
+    for _ in range(count * 20):
+        if len(out) >= count:
+            break
+        params = {
+            d["name"]: d["choices"][int(rng.integers(len(d["choices"])))] if "choices" in d
+            else from_unit(d, rng.random())
+            for d in dims
+        }
+        key = params_key(params)
+        if key not in seen:
+            seen.add(key)
+            out.append(params)
+    return out
+
+
+def parzen_bandwidth(points: np.ndarray) -> float:
+    if len(points) < 2:
+        return 0.25
+    # Scott's rule, floored so the good density keeps exploring once its points cluster
+    return float(min(max(1.06 * np.std(points) * len(points) ** -0.2, 0.1), 0.5))
+
+
+def parzen_log_density(x: np.ndarray, points: np.ndarray, bandwidth: float) -> np.ndarray:
+    """Log density on [0, 1] of Gaussians at `points` mixed with one uniform prior component."""
+    density = np.ones_like(x)
+    if len(points):
+        z = (x[:, None] - points[None, :]) / bandwidth
+        density = density + (np.exp(-0.5 * z ** 2) / (bandwidth * math.sqrt(2 * math.pi))).sum(axis=1)
+    return np.log(density / (len(points) + 1))
+
+
+def tpe_candidates(
+    dims: List[Dict[str, Any]],
+    history: List[Tuple[Dict[str, Any], float]],
+    rng: np.random.Generator,
+    count: int,
+    seen: Set[str],
+) -> List[Dict[str, Any]]:
+    """
+    Tree-structured Parzen estimator proposals. Evaluated (params, value)
+    pairs are split into the top OPTIMIZE_GAMMA by value ("good") and the
+    rest; each dimension gets a Parzen density per group (Gaussians in unit
+    space, smoothed frequencies for choices). Each requested set is the
+    unseen one with the highest l(x)/g(x) among its own OPTIMIZE_CANDIDATES
+    draws from the good densities, so a batch does not collapse onto one
+    point; sets still missing are drawn at random.
+    """
+    ranked = sorted(history, key=lambda h: -h[1])
+    n_good = max(1, math.ceil(OPTIMIZE_GAMMA * len(ranked)))
+    good, bad = [p for p, _ in ranked[:n_good]], [p for p, _ in ranked[n_good:]]
+    n = count * OPTIMIZE_CANDIDATES
+    draws: Dict[str, np.ndarray] = {}
+    score = np.zeros(n)
+    for d in dims:
+        name = d["name"]
+        if "choices" in d:
+            choices = d["choices"]
+            l = np.bincount([choices.index(p[name]) for p in good], minlength=len(choices)) + 1.0
+            g = np.bincount([choices.index(p[name]) for p in bad], minlength=len(choices)) + 1.0
+            l, g = l / l.sum(), g / g.sum()
+            picks = rng.choice(len(choices), size=n, p=l)
+            score += np.log(l[picks]) - np.log(g[picks])
+            draws[name] = picks
+            continue
+        good_x = np.array([to_unit(d, p[name]) for p in good])
+        bad_x = np.array([to_unit(d, p[name]) for p in bad])
+        bw_good, bw_bad = parzen_bandwidth(good_x), parzen_bandwidth(bad_x)
+        # Each draw comes from one mixture component: a good point or the uniform prior
+        component = rng.integers(len(good_x) + 1, size=n)
+        from_prior = component == len(good_x)
+        centers = good_x[np.minimum(component, len(good_x) - 1)]
+        x = np.abs(centers + rng.normal(0.0, bw_good, size=n))
+        x = np.where(x > 1.0, 2.0 - x, x).clip(0.0, 1.0)  # reflected at the bounds
+        x[from_prior] = rng.random(int(from_prior.sum()))
+        score += parzen_log_density(x, good_x, bw_good) - parzen_log_density(x, bad_x, bw_bad)
+        draws[name] = x
+
+    out: List[Dict[str, Any]] = []
+    for slot in range(count):
+        pool = np.arange(slot * OPTIMIZE_CANDIDATES, (slot + 1) * OPTIMIZE_CANDIDATES)
+        for pos in pool[np.argsort(-score[pool], kind="stable")]:
+            params = {
+                d["name"]: d["choices"][int(draws[d["name"]][pos])] if "choices" in d
+                else from_unit(d, draws[d["name"]][pos])
+                for d in dims
+            }
+            key = params_key(params)
+            if key not in seen:
+                seen.add(key)
+                out.append(params)
+                break
+    if len(out) < count:
+        out.extend(random_candidates(dims, rng, count - len(out), seen))
+    return out
+
+
 def manifest_key_from_strategy(main_key: Optional[str]) -> Optional[str]:
     if not main_key or "/" not in main_key:
         return None
@@ -353,15 +1603,11 @@ def load_strategy_manifest(main_key: Optional[str]) -> Dict[str, Any]:
     manifest_key = manifest_key_from_strategy(main_key)
     if not manifest_key or not BUCKET:
         return {}
+    body = object_cache.read(manifest_key)
+    if body is None:
+        return {}
     try:
-        obj = s3.get_object(Bucket=BUCKET, Key=manifest_key)
-    except ClientError as exc:
-        code = exc.response.get("Error", {}).get("Code")
-        if code in {"NoSuchKey", "404"}:
-            return {}
-        raise
-    try:
-        return json.loads(obj["Body"].read().decode("utf-8"))
+        return json.loads(body.decode("utf-8"))
     except Exception as exc:
         log(f"WARN: failed to parse manifest {manifest_key}: {exc}")
         return {}
@@ -408,30 +1654,53 @@ def prepare_freqtrade_workspace(workdir: Path) -> Dict[str, Path]:
     }
 
 
+DATASET_FORMATS = ("feather", "parquet", "json")
+
+
+def resolve_dataset_format(value: Optional[str]) -> str:
+    fmt = (value or DATASET_FORMAT or "feather").lower()
+    if fmt not in DATASET_FORMATS:
+        log(f"WARN: unsupported dataset format {fmt!r}; using feather")
+        return "feather"
+    return fmt
+
+
 def write_freqtrade_dataset(
     market: pd.DataFrame,
     data_dir: Path,
     exchange: str,
     pair: str,
     timeframe: str,
+    data_format: str = "feather",
 ) -> Path:
+    """
+    Write `market` in freqtrade's OHLCV layout (<datadir>/<exchange>/<PAIR>-<tf>.<ext>)
+    straight from the DataFrame columns. `data_format` must match the
+    `dataformat_ohlcv` setting of the freqtrade config.
+    """
     exchange_dir = data_dir / exchange.lower()
     exchange_dir.mkdir(parents=True, exist_ok=True)
-    filename = f"{pair.replace('/', '_')}-{timeframe}.json"
+    filename = f"{pair.replace('/', '_')}-{timeframe}.{data_format}"
     dataset_path = exchange_dir / filename
-    records = []
-    for ts, row in market.iterrows():
-        records.append(
-            {
-                "date": pd.Timestamp(ts).strftime("%Y-%m-%dT%H:%M:%SZ"),
-                "open": float(row["open"]),
-                "high": float(row["high"]),
-                "low": float(row["low"]),
-                "close": float(row["close"]),
-                "volume": float(row["volume"]),
-            }
-        )
-    dataset_path.write_text(json.dumps(records))
+
+    frame = pd.DataFrame(
+        {
+            "date": pd.DatetimeIndex(market.index),
+            "open": market["open"].to_numpy(dtype="float64"),
+            "high": market["high"].to_numpy(dtype="float64"),
+            "low": market["low"].to_numpy(dtype="float64"),
+            "close": market["close"].to_numpy(dtype="float64"),
+            "volume": market["volume"].to_numpy(dtype="float64"),
+        }
+    )
+    if data_format == "feather":
+        frame.to_feather(dataset_path, compression="lz4")
+    elif data_format == "parquet":
+        frame.to_parquet(dataset_path, index=False)
+    else:
+        # freqtrade's json handler stores rows as [ms, open, high, low, close, volume]
+        frame["date"] = frame["date"].astype("int64") // 1_000_000
+        frame.to_json(dataset_path, orient="values")
     return dataset_path
 
 
@@ -439,7 +1708,7 @@ def timerange_from_spec(spec: Dict[str, Any]) -> Tuple[str, pd.Timestamp, pd.Tim
     start = pd.to_datetime(spec.get("start"), utc=True, errors="coerce")
     end = pd.to_datetime(spec.get("end"), utc=True, errors="coerce")
     if pd.isna(start):
-        start = pd.Timestamp.utcnow().tz_localize("UTC") - pd.Timedelta(days=90)
+        start = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=90)
     if pd.isna(end) or end <= start:
         end = start + pd.Timedelta(days=90)
     timerange = f"{start.strftime('%Y%m%d')}-{end.strftime('%Y%m%d')}"
@@ -462,103 +1731,168 @@ def resolve_trades_file(candidate: Path, results_dir: Path) -> Path:
     raise FileNotFoundError(f"Unable to locate freqtrade trades export near {candidate}")
 
 
-def parse_trade_timestamp(value: Any) -> Optional[pd.Timestamp]:
-    if value is None:
-        return None
-    if isinstance(value, (int, float)):
-        unit = "s"
-        if value > 1e12:
-            unit = "ms"
-        return pd.to_datetime(value, unit=unit, utc=True, errors="coerce")
-    if isinstance(value, str):
-        return pd.to_datetime(value, utc=True, errors="coerce")
-    return None
-
-
-def normalize_trades(raw_trades: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    normalized: List[Dict[str, Any]] = []
-    for record in raw_trades:
-        profit = record.get("profit_ratio")
-        if profit is None:
-            pct = record.get("profit_pct")
-            if isinstance(pct, (int, float)):
-                profit = float(pct) / 100.0
-        if profit is None:
-            continue
-        close_ts = parse_trade_timestamp(
-            record.get("close_timestamp") or record.get("close_time") or record.get("close_date")
-        )
-        if close_ts is None:
+TRADE_COLUMNS = ["pair", "open_time", "close_time", "profit_ratio", "profit_abs", "duration"]
+
+
+def first_present(frame: pd.DataFrame, columns: List[str]) -> pd.Series:
+    """Column-wise `a or b or c`: the first value per row that is not null, 0 or ""."""
+    result: Optional[pd.Series] = None
+    missing: Optional[pd.Series] = None
+    for column in columns:
+        if column not in frame.columns:
             continue
-        open_ts = parse_trade_timestamp(
-            record.get("open_timestamp") or record.get("open_time") or record.get("open_date")
-        )
-        normalized.append(
-            {
-                "pair": record.get("pair") or "",
-                "open_time": open_ts,
-                "close_time": close_ts,
-                "profit_ratio": float(profit),
-                "profit_abs": safe_metric(record.get("profit_abs") or record.get("profit_amount")),
-                "duration": record.get("trade_duration") or record.get("duration") or record.get("duration_min"),
-            }
-        )
-    normalized.sort(key=lambda t: t["close_time"])
-    return normalized
+        values = frame[column]
+        present = values.notna() & (values != 0)
+        if values.dtype == object:
+            present &= values != ""
+        if result is None:
+            if present.all():
+                return values
+            result = values.astype(object).where(present, None)
+            missing = ~present
+        else:
+            fill = missing & present
+            result[fill] = values[fill]
+            missing &= ~present
+        if not missing.any():
+            break
+    if result is None:
+        return pd.Series(None, index=frame.index, dtype=object)
+    return result.infer_objects()
 
 
-def load_trades(path: Path) -> List[Dict[str, Any]]:
-    if not path.exists():
-        return []
-    try:
-        data = json.loads(path.read_text())
-        if isinstance(data, list):
-            return data
-        if isinstance(data, dict):
-            if isinstance(data.get("trades"), list):
-                return data["trades"]
-            if isinstance(data.get("results"), list):
-                return data["results"]
+def numeric_values(values: pd.Series) -> pd.Series:
+    """Float values for real numbers only (strings and bools become NaN)."""
+    if pd.api.types.is_bool_dtype(values):
+        return pd.Series(np.nan, index=values.index)
+    if pd.api.types.is_numeric_dtype(values):
+        return values.astype("float64")
+    if pd.api.types.infer_dtype(values, skipna=True) in {"string", "empty"}:
+        return pd.Series(np.nan, index=values.index)
+    is_number = values.map(lambda v: isinstance(v, (int, float)) and not isinstance(v, bool))
+    return pd.to_numeric(values.where(is_number), errors="coerce")
+
+
+def parse_trade_timestamps(values: pd.Series) -> pd.Series:
+    """
+    Vectorised timestamp parsing for export fields: numbers are epoch seconds,
+    or milliseconds above 1e12; strings are parsed as ISO-8601 with a mixed
+    format fallback. Anything else becomes NaT.
+    """
+    parsed = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns, UTC]")
+    numbers = numeric_values(values)
+    is_number = numbers.notna()
+    if is_number.any():
+        as_ms = numbers[is_number].where(numbers[is_number] > 1e12, numbers[is_number] * 1000)
+        if np.isfinite(as_ms).all() and (as_ms % 1 == 0).all():
+            as_ms = as_ms.astype("int64")
+        parsed[is_number] = pd.to_datetime(as_ms, unit="ms", utc=True, errors="coerce")
+    kind = pd.api.types.infer_dtype(values, skipna=True)
+    if kind == "string":
+        is_text = values.notna()
+    elif values.dtype == object:
+        is_text = values.map(lambda v: isinstance(v, str))
+    else:
+        is_text = pd.Series(False, index=values.index)
+    if is_text.any():
+        text = values[is_text]
+        stamps = pd.to_datetime(text, utc=True, errors="coerce", format="ISO8601")
+        retry = stamps.isna()
+        if retry.any():
+            stamps[retry] = pd.to_datetime(text[retry], utc=True, errors="coerce", format="mixed")
+        parsed[is_text] = stamps
+    return parsed
+
+
+def normalize_trades(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise a raw trades export to TRADE_COLUMNS, sorted by close_time.
+    Profit falls back from profit_ratio to profit_pct / 100; trades without
+    a profit or a parseable close time are dropped.
+    """
+    profit = numeric_values(raw["profit_ratio"]) if "profit_ratio" in raw.columns else pd.Series(np.nan, index=raw.index)
+    if "profit_pct" in raw.columns:
+        profit = profit.fillna(numeric_values(raw["profit_pct"]) / 100.0)
+
+    close_time = parse_trade_timestamps(first_present(raw, ["close_timestamp", "close_time", "close_date"]))
+    open_time = parse_trade_timestamps(first_present(raw, ["open_timestamp", "open_time", "open_date"]))
+    profit_abs = numeric_values(first_present(raw, ["profit_abs", "profit_amount"]))
+
+    trades = pd.DataFrame(
+        {
+            "pair": first_present(raw, ["pair"]).fillna(""),
+            "open_time": open_time,
+            "close_time": close_time,
+            "profit_ratio": profit,
+            "profit_abs": profit_abs.replace([np.inf, -np.inf], np.nan).fillna(0.0),
+            "duration": first_present(raw, ["trade_duration", "duration", "duration_min"]),
+        }
+    )
+    trades = trades[trades["profit_ratio"].notna() & trades["close_time"].notna()]
+    return trades.sort_values("close_time", kind="stable").reset_index(drop=True)
+
+
+def load_trades(path: Path) -> pd.DataFrame:
+    """Load a freqtrade trades export (json, or csv as a fallback) into a DataFrame of raw records."""
+    if not path.exists():
+        return pd.DataFrame()
+    try:
+        data = json.loads(path.read_bytes())
+        if isinstance(data, dict):
+            strategies = data.get("strategy")
+            if isinstance(strategies, dict):
+                # freqtrade's backtest result: {"strategy": {<name>: {"trades": [...]}}}
+                data = [t for result in strategies.values() for t in (result or {}).get("trades") or []]
+            elif isinstance(data.get("trades"), list):
+                data = data["trades"]
+            elif isinstance(data.get("results"), list):
+                data = data["results"]
+        if isinstance(data, list):
+            return pd.DataFrame.from_records(data) if data else pd.DataFrame()
     except json.JSONDecodeError:
         pass
     try:
-        df = pd.read_csv(path)
-        return df.to_dict("records")
+        return pd.read_csv(path)
     except Exception:
-        return []
+        return pd.DataFrame()
 
 
-def build_equity_series(
-    trades: List[Dict[str, Any]],
-    initial_cash: float,
-) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-    equity = initial_cash
-    peak = initial_cash
-    equity_rows: List[Dict[str, Any]] = []
-    drawdown_rows: List[Dict[str, Any]] = []
-    for trade in trades:
-        equity *= 1 + float(trade["profit_ratio"])
-        if equity > peak:
-            peak = equity
-        dd = (equity / peak) - 1
-        timestamp = trade["close_time"].isoformat()
-        equity_rows.append({"timestamp": timestamp, "equity": equity})
-        drawdown_rows.append({"timestamp": timestamp, "drawdown": dd})
-    return equity_rows, drawdown_rows
+def iso_utc(values: pd.Series) -> pd.Series:
+    """UTC timestamps as ISO-8601 strings (matches Timestamp.isoformat at second resolution)."""
+    seconds = values.dt.tz_convert(None).to_numpy().astype("datetime64[s]")
+    text = pd.Series(np.datetime_as_string(seconds, unit="s"), index=values.index) + "+00:00"
+    return text.where(values.notna())
+
+
+def build_equity_series(trades: pd.DataFrame, initial_cash: float) -> pd.DataFrame:
+    """
+    Equity curve and drawdown after each closed trade, as arrays: equity is a
+    cumulative product of (1 + profit_ratio) seeded with initial_cash (same
+    multiplication order as compounding trade by trade), drawdown is measured
+    against the running maximum that starts at initial_cash.
+    """
+    growth = np.concatenate(([initial_cash], 1 + trades["profit_ratio"].to_numpy(dtype="float64")))
+    path = np.cumprod(growth)
+    peak = np.maximum.accumulate(path)
+    return pd.DataFrame(
+        {
+            "timestamp": trades["close_time"].array,
+            "equity": path[1:],
+            "drawdown": path[1:] / peak[1:] - 1,
+        }
+    )
 
 
 def compute_kpis(
-    trades: List[Dict[str, Any]],
-    equity_rows: List[Dict[str, Any]],
-    drawdown_rows: List[Dict[str, Any]],
+    returns: np.ndarray,
+    series: pd.DataFrame,
     period: Tuple[pd.Timestamp, pd.Timestamp],
     initial_cash: float,
 ) -> Dict[str, Any]:
     start, end = period
-    returns = [float(trade["profit_ratio"]) for trade in trades]
-    net_return = (
-        equity_rows[-1]["equity"] / initial_cash - 1 if equity_rows else 0.0
-    )
+    equity = series["equity"].to_numpy()
+    drawdown = series["drawdown"].to_numpy()
+    net_return = float(equity[-1]) / initial_cash - 1 if len(equity) else 0.0
     duration_days = max((end - start).total_seconds() / 86400.0, 1)
     years = duration_days / 365.25
     growth_base = 1 + net_return
@@ -568,18 +1902,16 @@ def compute_kpis(
         cagr = growth_base ** (1 / years) - 1
     sharpe = 0.0
     sortino = 0.0
-    if returns:
+    if len(returns):
         mean_ret = float(np.mean(returns))
         std_ret = float(np.std(returns))
-        downside = [r for r in returns if r < 0]
+        downside = returns[returns < 0]
         sharpe = (mean_ret / std_ret) * math.sqrt(len(returns)) if std_ret > 0 else 0.0
-        downside_std = float(np.std(downside)) if downside else 0.0
+        downside_std = float(np.std(downside)) if len(downside) else 0.0
         sortino = (mean_ret / downside_std) * math.sqrt(len(returns)) if downside_std > 0 else 0.0
-    max_dd = min((row["drawdown"] for row in drawdown_rows), default=0.0)
-    win_rate = (
-        sum(1 for r in returns if r > 0) / len(returns) if returns else 0.0
-    )
-    avg_trade = float(np.mean(returns)) if returns else 0.0
+    max_dd = float(drawdown.min()) if len(drawdown) else 0.0
+    win_rate = int(np.count_nonzero(returns > 0)) / len(returns) if len(returns) else 0.0
+    avg_trade = float(np.mean(returns)) if len(returns) else 0.0
     return {
         "netReturn": safe_metric(net_return),
         "cagr": safe_metric(cagr),
@@ -592,6 +1924,122 @@ def compute_kpis(
     }
 
 
+# --------------------------------------------------------------------
+# Warm freqtrade runner (FREQTRADE_RUNNER=warm)
+# --------------------------------------------------------------------
+# The child is a separate, stdlib-only script so that it does not pay for
+# this module's imports (boto3, ccxt, pyarrow) on top of freqtrade's
+FREQTRADE_RUNNER_SCRIPT = Path(__file__).resolve().with_name("freqtrade_runner.py")
+
+def rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as fh:
+            for line in fh:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+class FreqtradeRunner:
+    """
+    Client for a `freqtrade_runner.py` child process that keeps freqtrade,
+    ccxt, pandas and TA-Lib imported between backtests. Requests
+    and replies are JSON lines over the child's stdin/stdout. The child is
+    recycled after `max_runs` backtests or once its RSS exceeds
+    `max_rss_mb`, and replaced if it dies.
+    """
+
+    def __init__(self, max_runs: int, max_rss_mb: int):
+        self.max_runs = max_runs
+        self.max_rss_mb = max_rss_mb
+        self.proc: Optional[subprocess.Popen] = None
+        self.runs = 0
+        self.unavailable: Optional[str] = None
+
+    def start(self) -> bool:
+        self.proc = subprocess.Popen(
+            [sys.executable, "-u", str(FREQTRADE_RUNNER_SCRIPT)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self.runs = 0
+        hello = self.proc.stdout.readline()
+        try:
+            ready = json.loads(hello)
+        except json.JSONDecodeError:
+            ready = {"ready": False, "error": f"runner exited with {self.proc.wait()}"}
+        if not ready.get("ready"):
+            self.unavailable = ready.get("error") or "runner not ready"
+            self.stop()
+            return False
+        log(f"Started warm freqtrade runner pid={self.proc.pid}")
+        return True
+
+    def stop(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=10)
+        except Exception:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+    def recycle_if_needed(self):
+        if self.proc is None:
+            return
+        rss = rss_mb(self.proc.pid)
+        if self.proc.poll() is not None:
+            self.proc = None
+        elif self.runs >= self.max_runs or rss > self.max_rss_mb:
+            log(f"Recycling freqtrade runner pid={self.proc.pid} after {self.runs} runs ({rss:.0f} MB)")
+            self.stop()
+
+    def run(self, args: List[str], cwd: Path, log_path: Path, env: Dict[str, str]) -> int:
+        """Run `freqtrade <args>` in the warm child; its output is appended to log_path."""
+        self.recycle_if_needed()
+        if self.proc is None and not self.start():
+            raise RuntimeError(f"freqtrade runner unavailable: {self.unavailable}")
+        request = {"args": args, "cwd": str(cwd), "logPath": str(log_path), "env": env}
+        try:
+            self.proc.stdin.write(json.dumps(request) + "\n")
+            self.proc.stdin.flush()
+            reply = self.proc.stdout.readline()
+        except (BrokenPipeError, OSError):
+            reply = ""
+        self.runs += 1
+        if not reply:
+            code = self.proc.wait()
+            self.proc = None
+            raise RuntimeError(f"freqtrade runner died with {code}")
+        self.recycle_if_needed()
+        return int(json.loads(reply).get("returncode", 1))
+
+
+# One runner per thread: concurrent job slots must not share a child's pipe
+_freqtrade_runners = threading.local()
+
+
+def warm_freqtrade_runner() -> Optional[FreqtradeRunner]:
+    """This thread's warm runner, or None to use the freqtrade CLI instead."""
+    if FREQTRADE_RUNNER != "warm":
+        return None
+    runner = getattr(_freqtrade_runners, "runner", None)
+    if runner is None:
+        runner = _freqtrade_runners.runner = FreqtradeRunner(FREQTRADE_RUNNER_MAX_RUNS, FREQTRADE_RUNNER_MAX_RSS_MB)
+        atexit.register(runner.stop)
+        if not runner.start():
+            log(f"WARN: warm freqtrade runner unavailable ({runner.unavailable}); using the CLI")
+    if runner.unavailable:
+        return None
+    return runner
+
+
 def run_freqtrade_process(
     config: Dict[str, Any],
     workspace: Dict[str, Path],
@@ -630,27 +2078,33 @@ def run_freqtrade_process(
     ]
 
     log(f"Executing freqtrade: {' '.join(cmd)}")
-    proc = subprocess.run(
-        cmd,
-        cwd=workspace["root"],
-        capture_output=True,
-        text=True,
-        env=env,
-    )
     logs_path = workspace["root"] / "logs.txt"
-    logs_path.write_text(
-        "\n".join(
-            [
-                f"$ {' '.join(cmd)}",
-                "",
-                proc.stdout.strip(),
-                "",
-                proc.stderr.strip(),
-            ]
-        ).strip()
-    )
-    if proc.returncode != 0:
-        raise RuntimeError(f"freqtrade exited with {proc.returncode}")
+    runner = warm_freqtrade_runner()
+    if runner is not None:
+        logs_path.write_text(f"$ {' '.join(cmd)}\n\n")
+        returncode = runner.run(cmd[1:], workspace["root"], logs_path, {"FREQTRADE_USERDIR": env["FREQTRADE_USERDIR"]})
+    else:
+        proc = subprocess.run(
+            cmd,
+            cwd=workspace["root"],
+            capture_output=True,
+            text=True,
+            env=env,
+        )
+        logs_path.write_text(
+            "\n".join(
+                [
+                    f"$ {' '.join(cmd)}",
+                    "",
+                    proc.stdout.strip(),
+                    "",
+                    proc.stderr.strip(),
+                ]
+            ).strip()
+        )
+        returncode = proc.returncode
+    if returncode != 0:
+        raise RuntimeError(f"freqtrade exited with {returncode}")
 
     trades_path = resolve_trades_file(export_path, workspace["results"])
     return trades_path, logs_path
@@ -683,6 +2137,27 @@ def timeframe_to_freq(tf: str) -> str:
     return "1H"
 
 
+def market_from_spec(spec: Dict[str, Any]) -> Tuple[str, str, str]:
+    exchange = (spec.get("exchange") or "binance").lower()
+    pair = spec.get("pair") or "BTC/USDT"
+    timeframe = spec.get("timeframe") or "1h"
+    return exchange, pair, timeframe
+
+
+def prepare_dataset(spec: Dict[str, Any], workdir: Path, data_format: str) -> Path:
+    """
+    Load the market data for `spec` once and materialise it as a freqtrade
+    datadir under <workdir>/dataset. Child runs of a grid or walk-forward
+    point their config at this directory instead of rebuilding the dataset.
+    """
+    exchange, pair, timeframe = market_from_spec(spec or {})
+    market = ensure_market_data(spec or {}, MARKET_CACHE_DIR)
+    data_dir = workdir / "dataset"
+    dataset_path = write_freqtrade_dataset(market, data_dir, exchange, pair, timeframe, data_format)
+    log(f"Prepared shared dataset {dataset_path} ({len(market)} candles)")
+    return data_dir
+
+
 def run_engine(
     strategy_path: Path,
     workdir: Path,
@@ -690,41 +2165,36 @@ def run_engine(
     params: Optional[Dict[str, Any]] = None,
     phase: Optional[str] = None,
     manifest: Optional[Dict[str, Any]] = None,
+    dataset_dir: Optional[Path] = None,
+    data_format: Optional[str] = None,
+    artifact_formats: Optional[List[str]] = None,
 ) -> Dict[str, Any]:
-    cache_dir = Path("/tmp/market-data")
     params = params or {}
     manifest = manifest or {}
+    if engine_name(manifest) == "vectorized":
+        call = {"strategy_path": strategy_path, "workdir": workdir, "spec": spec, "params": params,
+                "phase": phase, "manifest": manifest, "artifact_formats": artifact_formats}
+        for _, engine_out, error in run_vectorized_batch([call]):
+            if error is not None:
+                raise error
+            return engine_out
+    data_format = resolve_dataset_format(data_format)
 
-    exchange = (spec.get("exchange") or "binance").lower()
-    pair = spec.get("pair") or "BTC/USDT"
-    timeframe = spec.get("timeframe") or "1h"
+    exchange, pair, timeframe = market_from_spec(spec or {})
 
-    market = ensure_market_data(spec or {}, cache_dir)
     workspace = prepare_freqtrade_workspace(workdir)
     timerange, start_dt, end_dt = timerange_from_spec(spec or {})
 
     strategy_dest = workspace["strategies"] / strategy_path.name
     shutil.copy(strategy_path, strategy_dest)
 
-    write_freqtrade_dataset(market, workspace["data_dir"], exchange, pair, timeframe)
+    if dataset_dir is None:
+        market = ensure_market_data(spec or {}, MARKET_CACHE_DIR)
+        write_freqtrade_dataset(market, workspace["data_dir"], exchange, pair, timeframe, data_format)
+        dataset_dir = workspace["data_dir"]
 
-    freqtrade_cfg = manifest.get("freqtrade", {}) if isinstance(manifest, dict) else {}
-    stake_currency = (
-        freqtrade_cfg.get("stakeCurrency")
-        if isinstance(freqtrade_cfg, dict)
-        else None
-    ) or (pair.split("/")[-1] if "/" in pair else "USDT")
-    stake_amount = (
-        float(freqtrade_cfg.get("stakeAmount", 1000))
-        if isinstance(freqtrade_cfg, dict)
-        else 1000.0
-    )
-    startup_count = (
-        int(freqtrade_cfg.get("startupCandleCount", 50))
-        if isinstance(freqtrade_cfg, dict)
-        else 50
-    )
-    initial_cash = safe_metric(freqtrade_cfg.get("wallet", 10_000)) or 10_000.0
+    settings = engine_settings(manifest, pair)
+    initial_cash = settings["initial_cash"]
 
     strategy_class = extract_strategy_class(strategy_dest, manifest)
     config = {
@@ -732,14 +2202,14 @@ def run_engine(
         "dry_run_wallet": initial_cash,
         "strategy": strategy_class,
         "strategy_path": str(workspace["strategies"]),
-        "datadir": str(workspace["data_dir"]),
-        "dataformat_ohlcv": "json",
+        "datadir": str(dataset_dir),
+        "dataformat_ohlcv": data_format,
         "dataformat_trades": "json",
         "timeframe": timeframe,
-        "startup_candle_count": startup_count,
+        "startup_candle_count": settings["startup_count"],
         "max_open_trades": 5,
-        "stake_currency": stake_currency,
-        "stake_amount": stake_amount,
+        "stake_currency": settings["stake_currency"],
+        "stake_amount": settings["stake_amount"],
         "model_params": params,
         "exchange": {
             "name": exchange,
@@ -755,37 +2225,106 @@ def run_engine(
         timerange,
         strategy_class,
     )
-    raw_trades = load_trades(trades_path)
-    trades = normalize_trades(raw_trades)
-    equity_rows, drawdown_rows = build_equity_series(trades, initial_cash)
-    kpis = compute_kpis(trades, equity_rows, drawdown_rows, (start_dt, end_dt), initial_cash)
-
-    equity_path = workdir / "equity.csv"
-    pd.DataFrame(equity_rows).to_csv(equity_path, index=False)
-    drawdown_path = workdir / "drawdown.csv"
-    pd.DataFrame(drawdown_rows).to_csv(drawdown_path, index=False)
-    trades_path_csv = workdir / "trades.csv"
-    trades_df = pd.DataFrame(
-        [
-            {
-                "pair": t["pair"],
-                "open_time": t["open_time"].isoformat() if t["open_time"] else None,
-                "close_time": t["close_time"].isoformat(),
-                "profit_ratio": t["profit_ratio"],
-                "profit_abs": t["profit_abs"],
-                "duration": t["duration"],
-            }
-            for t in trades
-        ]
+    trades_df = normalize_trades(load_trades(trades_path))
+    header = [
+        f"Strategy: {strategy_class}",
+        f"Phase: {phase or 'backtest'}",
+        f"Timerange: {timerange}",
+        f"Params: {json.dumps(params, sort_keys=True)}",
+    ]
+    return write_engine_outputs(
+        workdir, trades_df, initial_cash, (start_dt, end_dt), logs_path, header, artifact_formats
+    )
+
+
+def engine_settings(manifest: Dict[str, Any], pair: str) -> Dict[str, Any]:
+    """Stake/wallet settings from manifest.freqtrade, shared by both engines."""
+    freqtrade_cfg = manifest.get("freqtrade", {}) if isinstance(manifest, dict) else {}
+    if not isinstance(freqtrade_cfg, dict):
+        freqtrade_cfg = {}
+    return {
+        "stake_currency": freqtrade_cfg.get("stakeCurrency") or (pair.split("/")[-1] if "/" in pair else "USDT"),
+        "stake_amount": float(freqtrade_cfg.get("stakeAmount", 1000)),
+        "startup_count": int(freqtrade_cfg.get("startupCandleCount", 50)),
+        "initial_cash": safe_metric(freqtrade_cfg.get("wallet", 10_000)) or 10_000.0,
+    }
+
+
+ARTIFACT_FORMAT_CHOICES = ("csv", "csv.gz", "parquet")
+
+
+def resolve_artifact_formats(value: Any) -> List[str]:
+    """Artifact formats from a job's `artifactFormats` (list or comma string), else ARTIFACT_FORMATS."""
+    raw = value if value else ARTIFACT_FORMATS
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    formats: List[str] = []
+    for fmt in raw:
+        fmt = str(fmt).strip().lower()
+        if fmt in ARTIFACT_FORMAT_CHOICES:
+            if fmt not in formats:
+                formats.append(fmt)
+        elif fmt:
+            log(f"WARN: unsupported artifact format {fmt!r}; skipping")
+    return formats or ["csv"]
+
+
+def write_table_artifact(frame: pd.DataFrame, workdir: Path, name: str, formats: List[str]) -> List[Dict[str, Any]]:
+    """
+    Write `frame` as <name>.csv / <name>.csv.gz / <name>.parquet for each
+    requested format and return the artifact entries. CSVs carry ISO
+    timestamps; parquet keeps native UTC timestamp columns (zstd).
+    """
+    artifacts: List[Dict[str, Any]] = []
+    text_frame = None
+    for fmt in formats:
+        path = workdir / f"{name}.{fmt}"
+        if fmt == "parquet":
+            frame.to_parquet(path, index=False, compression="zstd")
+            artifacts.append({"path": str(path), "name": path.name, "content_type": "application/vnd.apache.parquet"})
+            continue
+        if text_frame is None:
+            text_frame = frame.assign(**{
+                col: iso_utc(frame[col])
+                for col in frame.columns
+                if pd.api.types.is_datetime64_any_dtype(frame[col])
+            })
+        if fmt == "csv.gz":
+            # Level 1: higher levels cost ~4x the CPU to save ~10% of the bytes.
+            # mtime=0 keeps identical tables byte-identical
+            text_frame.to_csv(path, index=False, compression={"method": "gzip", "compresslevel": 1, "mtime": 0})
+            artifacts.append({"path": str(path), "name": path.name, "content_type": "text/csv",
+                              "content_encoding": "gzip"})
+        else:
+            text_frame.to_csv(path, index=False)
+            artifacts.append({"path": str(path), "name": path.name, "content_type": "text/csv"})
+    return artifacts
+
+
+def write_engine_outputs(
+    workdir: Path,
+    trades_df: pd.DataFrame,
+    initial_cash: float,
+    period: Tuple[pd.Timestamp, pd.Timestamp],
+    logs_path: Path,
+    header: List[str],
+    artifact_formats: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Compute KPIs for normalised trades and write equity/drawdown/trades tables plus the log summary."""
+    formats = artifact_formats or ["csv"]
+    series = build_equity_series(trades_df, initial_cash)
+    returns = trades_df["profit_ratio"].to_numpy(dtype="float64")
+    kpis = compute_kpis(returns, series, period, initial_cash)
+
+    artifacts = (
+        write_table_artifact(series[["timestamp", "equity"]], workdir, "equity", formats)
+        + write_table_artifact(series[["timestamp", "drawdown"]], workdir, "drawdown", formats)
+        + write_table_artifact(trades_df, workdir, "trades", formats)
     )
-    trades_df.to_csv(trades_path_csv, index=False)
 
     summary = "\n".join(
-        [
-            f"Strategy: {strategy_class}",
-            f"Phase: {phase or 'backtest'}",
-            f"Timerange: {timerange}",
-            f"Params: {json.dumps(params, sort_keys=True)}",
+        header
+        + [
             f"Net return: {kpis['netReturn']:.2%}",
             f"CAGR: {kpis['cagr']:.2%}",
             f"Sharpe: {kpis['sharpe']:.2f}",
@@ -794,15 +2333,712 @@ def run_engine(
     )
     with open(logs_path, "a", encoding="utf-8") as fh:
         fh.write("\n\n" + summary + "\n")
+    artifacts.append({"path": str(logs_path), "name": "logs.txt", "content_type": "text/plain"})
+
+    return {"kpis": kpis, "artifacts": artifacts, "artifactFormats": formats}
+
+# --------------------------------------------------------------------
+# Vectorised engine (manifest.engine = "vectorized")
+# --------------------------------------------------------------------
+ENGINES = ("freqtrade", "vectorized")
+# Upper bound on param-sets x candles simulated in one NumPy pass
+VECTORIZED_CHUNK_CELLS = 4_000_000
 
-    artifacts = [
-        {"path": str(equity_path), "name": "equity.csv", "content_type": "text/csv"},
-        {"path": str(drawdown_path), "name": "drawdown.csv", "content_type": "text/csv"},
-        {"path": str(trades_path_csv), "name": "trades.csv", "content_type": "text/csv"},
-        {"path": str(logs_path), "name": "logs.txt", "content_type": "text/plain"},
+
+def engine_name(manifest: Optional[Dict[str, Any]]) -> str:
+    name = str((manifest or {}).get("engine") or "freqtrade").lower()
+    if name not in ENGINES:
+        log(f"WARN: unknown engine {name!r}; using freqtrade")
+        return "freqtrade"
+    return name
+
+
+def load_signal_function(strategy_path: Path, manifest: Dict[str, Any]) -> Callable:
+    """
+    Execute the strategy file and return its signal function, by default
+    `populate_signals(dataframe, params)` (overridable through
+    manifest.vectorized.signalFunction). The function receives the OHLCV
+    frame and returns it with boolean `enter_long` / `exit_long` columns.
+    """
+    cfg = manifest.get("vectorized") if isinstance(manifest.get("vectorized"), dict) else {}
+    name = cfg.get("signalFunction") or "populate_signals"
+    namespace = runpy.run_path(str(strategy_path), run_name="strategy")
+    fn = namespace.get(name)
+    if not callable(fn):
+        raise ValueError(f"strategy does not define {name}(dataframe, params)")
+    return fn
+
+
+def signal_columns(fn: Callable, market: pd.DataFrame, params: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    frame = fn(market.copy(), dict(params))
+    if frame is None:
+        raise ValueError("signal function returned no dataframe")
+    missing = [col for col in ("enter_long", "exit_long") if col not in frame.columns]
+    if missing:
+        raise ValueError(f"signal function did not set {', '.join(missing)}")
+    if len(frame) != len(market):
+        raise ValueError("signal function changed the number of candles")
+    enter = frame["enter_long"].fillna(0).to_numpy(dtype=bool)
+    exit_ = frame["exit_long"].fillna(0).to_numpy(dtype=bool)
+    return enter, exit_
+
+
+def simulate_signals(
+    enter: np.ndarray,
+    exit_: np.ndarray,
+    first: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Long-only, one position at a time, for a (param sets x candles) matrix
+    of signals. As in freqtrade, a signal on candle i fills at the open of
+    candle i + 1, an exit signal wins over an entry on the same candle, and
+    a position still open after the last candle is closed at its close.
+    Signals before `first` (startup candles) are ignored.
+
+    Returns (row, entry_candle, exit_candle) arrays, one entry per trade,
+    ordered by row then time; exit_candle == n_candles marks the forced
+    close at the end of the data.
+    """
+    rows, n = enter.shape
+    # Desired state after each candle: 1 long, 0 flat, -1 no signal (keep previous)
+    state = np.full((rows, n), -1, dtype=np.int8)
+    state[enter] = 1
+    state[exit_] = 0
+    state[:, :first] = -1
+    state[:, 0] = np.where(state[:, 0] < 0, 0, state[:, 0])
+    last_signal = np.where(state >= 0, np.arange(n), 0)
+    np.maximum.accumulate(last_signal, axis=1, out=last_signal)
+    desired = np.take_along_axis(state, last_signal, axis=1)
+
+    # Held during candle j = desired after candle j - 1; pad flat on both ends
+    held = np.zeros((rows, n + 2), dtype=np.int8)
+    held[:, 2:] = desired
+    held[:, -1] = 0
+    change = np.diff(held, axis=1)
+    entry_rows, entry_cols = np.nonzero(change == 1)
+    _, exit_cols = np.nonzero(change == -1)
+    return entry_rows, entry_cols, exit_cols
+
+
+def vectorized_trades(
+    market: pd.DataFrame,
+    pair: str,
+    timeframe: str,
+    fee: float,
+    stake_amount: float,
+    rows: np.ndarray,
+    entry_cols: np.ndarray,
+    exit_cols: np.ndarray,
+    row: int,
+) -> pd.DataFrame:
+    """Normalised trades (TRADE_COLUMNS) for one param set of a simulate_signals result."""
+    lo, hi = np.searchsorted(rows, [row, row + 1])
+    entries, exits = entry_cols[lo:hi], exit_cols[lo:hi]
+    open_prices = market["open"].to_numpy(dtype="float64")
+    exit_prices = np.append(open_prices, market["close"].to_numpy(dtype="float64")[-1])
+    candle_ms = market.index.as_unit("ns").asi8 // 1_000_000
+    exit_ms = np.append(candle_ms, candle_ms[-1] + timeframe_to_ms(timeframe))
+
+    entry_price = open_prices[entries]
+    profit_ratio = exit_prices[exits] * (1 - fee) / (entry_price * (1 + fee)) - 1
+    open_ms, close_ms = candle_ms[entries], exit_ms[exits]
+    return pd.DataFrame(
+        {
+            "pair": pair,
+            "open_time": pd.to_datetime(open_ms, unit="ms", utc=True),
+            "close_time": pd.to_datetime(close_ms, unit="ms", utc=True),
+            "profit_ratio": profit_ratio,
+            "profit_abs": profit_ratio * stake_amount,
+            "duration": (close_ms - open_ms) // 60_000,
+        },
+        columns=TRADE_COLUMNS,
+    )
+
+
+def run_vectorized_engine(
+    strategy_path: Path,
+    spec: Dict[str, Any],
+    manifest: Dict[str, Any],
+    runs: List[Dict[str, Any]],
+    market: Optional[pd.DataFrame] = None,
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Evaluate every entry of `runs` ({"workdir", "params", "phase",
+    "artifact_formats"}) over one load of the market data and one import of
+    the strategy, simulating the param sets together in NumPy. Yields (position, engine_out, error) like
+    run_engine_batch; engine_out has the same kpis/artifacts as run_engine.
+    Runs the strategy in this process; jobs go through run_vectorized_batch.
+    """
+    exchange, pair, timeframe = market_from_spec(spec or {})
+    timerange, start_dt, end_dt = timerange_from_spec(spec or {})
+    settings = engine_settings(manifest, pair)
+    cfg = manifest.get("vectorized") if isinstance(manifest.get("vectorized"), dict) else {}
+    fee = float(cfg.get("fee", 0.001))
+    try:
+        if market is None:
+            market = ensure_market_data(spec or {}, MARKET_CACHE_DIR)
+        fn = load_signal_function(strategy_path, manifest)
+    except Exception as exc:
+        for pos in range(len(runs)):
+            yield pos, None, exc
+        return
+
+    first = min(settings["startup_count"], len(market))
+    chunk = max(1, VECTORIZED_CHUNK_CELLS // max(len(market), 1))
+    log(f"Vectorised engine: {len(runs)} param sets over {len(market)} candles")
+    for base in range(0, len(runs), chunk):
+        batch = list(enumerate(runs[base:base + chunk], start=base))
+        signals: List[Tuple[int, np.ndarray, np.ndarray]] = []
+        for pos, run in batch:
+            try:
+                signals.append((pos, *signal_columns(fn, market, run.get("params") or {})))
+            except Exception as exc:
+                yield pos, None, exc
+        if not signals:
+            continue
+        rows, entry_cols, exit_cols = simulate_signals(
+            np.stack([enter for _, enter, _ in signals]),
+            np.stack([exit_ for _, _, exit_ in signals]),
+            first,
+        )
+        for row, (pos, _, _) in enumerate(signals):
+            run = runs[pos]
+            try:
+                trades_df = vectorized_trades(
+                    market, pair, timeframe, fee, settings["stake_amount"], rows, entry_cols, exit_cols, row
+                )
+                workdir = Path(run["workdir"])
+                logs_path = workdir / "logs.txt"
+                logs_path.write_text(f"vectorized engine: {len(market)} candles, fee {fee}")
+                header = [
+                    f"Strategy: {strategy_path.name} (vectorized)",
+                    f"Phase: {run.get('phase') or 'backtest'}",
+                    f"Timerange: {timerange}",
+                    f"Params: {json.dumps(run.get('params') or {}, sort_keys=True)}",
+                ]
+                yield pos, write_engine_outputs(
+                    workdir,
+                    trades_df,
+                    settings["initial_cash"],
+                    (start_dt, end_dt),
+                    logs_path,
+                    header,
+                    run.get("artifact_formats"),
+                ), None
+            except Exception as exc:
+                yield pos, None, exc
+
+
+def run_vectorized_group(
+    strategy_path: Path,
+    spec: Dict[str, Any],
+    manifest: Dict[str, Any],
+    runs: List[Dict[str, Any]],
+    market: pd.DataFrame,
+) -> List[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Engine-process side of run_vectorized_batch: every run's result, also
+    when the strategy raises SystemExit mid-pass. Errors of classes defined
+    by the strategy are re-raised as RuntimeError so they can be unpickled.
+    """
+    results: List[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]] = []
+    try:
+        results.extend(run_vectorized_engine(strategy_path, spec, manifest, runs, market))
+    except BaseException as exc:
+        done = {pos for pos, _, _ in results}
+        error = RuntimeError(f"strategy aborted: {type(exc).__name__}: {exc}")
+        results.extend((pos, None, error) for pos in range(len(runs)) if pos not in done)
+    return [
+        (pos, engine_out, error if error is None or type(error).__module__ == "builtins"
+         else RuntimeError(f"{type(error).__name__}: {error}"))
+        for pos, engine_out, error in results
     ]
 
-    return {"kpis": kpis, "artifacts": artifacts}
+
+def run_vectorized_batch(
+    calls: List[Dict[str, Any]],
+    pool: Optional["EnginePool"] = None,
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    run_engine_batch for vectorised strategies: one pass per distinct spec.
+    Market data is loaded here (through the frame cache) and the pass runs
+    in an engine worker process, so a strategy that exits or crashes cannot
+    take the job slot down; one still running after
+    VECTORIZED_TIMEOUT_SECONDS is killed and its runs fail.
+    """
+    groups: Dict[str, List[int]] = {}
+    for pos, kwargs in enumerate(calls):
+        groups.setdefault(json.dumps(kwargs.get("spec") or {}, sort_keys=True), []).append(pos)
+    owned = pool is None
+    pool = pool or EnginePool(1)
+    try:
+        for positions in groups.values():
+            head = calls[positions[0]]
+            spec = head.get("spec") or {}
+            runs = [
+                {
+                    "workdir": calls[pos]["workdir"],
+                    "params": calls[pos].get("params"),
+                    "phase": calls[pos].get("phase"),
+                    "artifact_formats": calls[pos].get("artifact_formats"),
+                }
+                for pos in positions
+            ]
+            try:
+                market = ensure_market_data(spec, MARKET_CACHE_DIR)
+                future = pool.submit(
+                    run_vectorized_group, head["strategy_path"], spec, head.get("manifest") or {}, runs, market
+                )
+                results = future.result(timeout=VECTORIZED_TIMEOUT_SECONDS)
+            except TimeoutError:
+                pool.kill()
+                error = TimeoutError(f"vectorised pass exceeded {VECTORIZED_TIMEOUT_SECONDS:.0f}s")
+                results = [(i, None, error) for i in range(len(runs))]
+            except BrokenProcessPool as exc:
+                pool.kill()
+                error = RuntimeError(f"engine worker died: {exc}")
+                results = [(i, None, error) for i in range(len(runs))]
+            except Exception as exc:
+                results = [(i, None, exc) for i in range(len(runs))]
+            for i, engine_out, error in results:
+                yield positions[i], engine_out, error
+    finally:
+        if owned:
+            pool.close()
+
+# --------------------------------------------------------------------
+# Parallel engine execution
+# --------------------------------------------------------------------
+def available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0)) or 1
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def engine_run_memory_mb(manifest: Optional[Dict[str, Any]] = None) -> int:
+    """Memory estimate per parallel engine run, including the warm freqtrade runner it keeps alive."""
+    if engine_name(manifest) == "freqtrade" and FREQTRADE_RUNNER == "warm":
+        return ENGINE_RUN_MEMORY_MB + FREQTRADE_RUNNER_MAX_RSS_MB
+    return ENGINE_RUN_MEMORY_MB
+
+
+def engine_concurrency(requested: int, manifest: Optional[Dict[str, Any]] = None) -> int:
+    """Number of engine runs to execute at once, bounded by this job slot's share of CPUs and memory."""
+    cpus = requested if requested > 0 else available_cpus() // JOB_SLOTS
+    by_memory = ENGINE_MEMORY_BUDGET_MB // JOB_SLOTS // max(engine_run_memory_mb(manifest), 1)
+    return max(1, min(cpus, by_memory))
+
+
+class EnginePool:
+    """
+    Spawned engine worker processes, started on first submit(). kill()
+    terminates the workers (a hung or crashed run); the next submit() then
+    starts fresh ones.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def kill(self):
+        if self.executor is None:
+            return
+        # ProcessPoolExecutor cannot stop a running task. SIGKILL its workers:
+        # they import this module, whose SIGTERM handler only drains
+        for proc in list((getattr(self.executor, "_processes", None) or {}).values()):
+            proc.kill()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+
+    def close(self, wait: bool = True):
+        """Shut down; without `wait`, queued runs are cancelled and running ones abandoned."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=wait, cancel_futures=not wait)
+            self.executor = None
+
+    def __enter__(self) -> "EnginePool":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(wait=exc_type is None)
+
+
+def run_engine_batch(
+    calls: List[Dict[str, Any]],
+    concurrency: int,
+    pool: Optional[EnginePool] = None,
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Run `run_engine(**kwargs)` for every entry of `calls` and yield
+    (position, engine_out, error) as each run finishes. A failed run yields
+    its exception instead of raising, so the other runs keep going; callers
+    that want to fail fast simply stop iterating, which cancels the runs that
+    have not started yet. With concurrency > 1 the runs execute in a pool of
+    spawned worker processes: `pool` if given (callers running batch after
+    batch keep its workers warm), otherwise one created for this batch.
+    """
+    if calls and engine_name(calls[0].get("manifest")) == "vectorized":
+        yield from run_vectorized_batch(calls, pool)
+        return
+
+    if concurrency <= 1 or len(calls) <= 1:
+        for pos, kwargs in enumerate(calls):
+            try:
+                yield pos, run_engine(**kwargs), None
+            except Exception as exc:
+                yield pos, None, exc
+        return
+
+    owned = pool is None
+    pool = pool or EnginePool(min(concurrency, len(calls)))
+    log(f"Running {len(calls)} engine runs with {pool.workers} worker processes")
+    futures: Dict[Future, int] = {}
+    try:
+        futures = {pool.submit(run_engine, **kwargs): pos for pos, kwargs in enumerate(calls)}
+        for fut in as_completed(futures):
+            exc = fut.exception()
+            if exc is not None:
+                yield futures[fut], None, exc
+            else:
+                yield futures[fut], fut.result(), None
+    except BaseException:
+        if owned:
+            pool.close(wait=False)
+        else:
+            for fut in futures:
+                fut.cancel()
+        raise
+    if owned:
+        pool.close()
+
+def run_engine_memoised(
+    calls: List[Dict[str, Any]],
+    concurrency: int,
+    hits: Dict[int, Dict[str, Any]],
+    pool: Optional[EnginePool] = None,
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[Exception]]]:
+    """run_engine_batch over the calls not in `hits`; cached positions yield their ResultCache hit first."""
+    for pos in sorted(hits):
+        yield pos, hits[pos], None
+    pending = [pos for pos in range(len(calls)) if pos not in hits]
+    if not pending:
+        return
+    for j, engine_out, error in run_engine_batch([calls[pos] for pos in pending], concurrency, pool):
+        yield pending[j], engine_out, error
+
+# --------------------------------------------------------------------
+# Result cache
+# --------------------------------------------------------------------
+def engine_version(manifest: Optional[Dict[str, Any]]) -> str:
+    engine = engine_name(manifest)
+    if engine == "freqtrade":
+        try:
+            return f"freqtrade {importlib.metadata.version('freqtrade')}"
+        except importlib.metadata.PackageNotFoundError:
+            return "freqtrade unknown"
+    return engine
+
+
+def normalized_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """The spec with market defaults and the timerange resolved, as it reaches the engine."""
+    exchange, pair, timeframe = market_from_spec(spec)
+    _, start, end = timerange_from_spec(spec)
+    rest = {k: v for k, v in spec.items() if k not in {"exchange", "pair", "timeframe", "start", "end"}}
+    return {**rest, "exchange": exchange, "pair": pair, "timeframe": timeframe,
+            "start": start.isoformat(), "end": end.isoformat()}
+
+
+class ResultCache:
+    """
+    Content-addressed engine results. A run is keyed by a hash of the
+    strategy file bytes, manifest, normalised spec, params, phase, artifact
+    formats and engine version. Once a run's artifacts are in S3, record()
+    + flush() write a pointer (KPIs, artifact keys) to
+    cache/results/<key>.json; a later identical run gets that pointer back
+    from lookup_many() and copies the artifacts server-side instead of
+    running the engine. Specs whose range reaches the present are never
+    cached, since their candles are still arriving. `bypass` skips lookups
+    but still records, refreshing the entries.
+    """
+
+    def __init__(self, strategy_path: Path, manifest: Optional[Dict[str, Any]], bypass: bool = False,
+                 enabled: bool = RESULT_CACHE):
+        self.enabled = enabled and bool(BUCKET)
+        self.bypass = bool(bypass)
+        self.manifest = manifest or {}
+        self.engine = engine_version(manifest)
+        self.strategy_digest = hashlib.sha256(strategy_path.read_bytes()).hexdigest() if self.enabled else ""
+        self.lookups = 0
+        self.hits = 0
+        self.pending: List[Tuple[str, Dict[str, Any]]] = []
+
+    def key(self, call: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a run_engine call, or None when its result is not cacheable."""
+        if not self.enabled:
+            return None
+        spec = call.get("spec") or {}
+        _, _, end = timerange_from_spec(spec)
+        _, _, timeframe = market_from_spec(spec)
+        if end + pd.Timedelta(milliseconds=timeframe_to_ms(timeframe)) > pd.Timestamp.now(tz="UTC"):
+            return None
+        payload = {
+            "version": RESULT_CACHE_VERSION,
+            "engine": self.engine,
+            "strategy": self.strategy_digest,
+            "manifest": self.manifest,
+            "spec": normalized_spec(spec),
+            "params": call.get("params") or {},
+            "phase": call.get("phase"),
+            "artifactFormats": call.get("artifact_formats") or ["csv"],
+        }
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def fetch(self, key: str) -> Optional[Dict[str, Any]]:
+        """The cached engine_out for `key`, or None on a miss (including a deleted source run)."""
+        try:
+            obj = s3.get_object(Bucket=BUCKET, Key=f"{RESULT_CACHE_PREFIX}/{key}.json")
+            entry = json.loads(obj["Body"].read().decode("utf-8"))
+            # The source run's artifacts may have been deleted since
+            for a in entry["artifacts"]:
+                s3.head_object(Bucket=BUCKET, Key=a["key"])
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") not in {"NoSuchKey", "404"}:
+                log(f"WARN: result cache lookup failed for {key}: {exc}")
+            return None
+        except (BotoCoreError, ValueError, KeyError, TypeError) as exc:
+            log(f"WARN: result cache lookup failed for {key}: {exc}")
+            return None
+        return {
+            "kpis": entry.get("kpis", {}),
+            "artifactFormats": entry.get("artifactFormats", ["csv"]),
+            "artifacts": [
+                {"source_key": a["key"], "name": a["name"],
+                 "content_type": a.get("content_type", "application/octet-stream"),
+                 "content_encoding": a.get("content_encoding")}
+                for a in entry["artifacts"]
+            ],
+            "cacheHit": True,
+            "cachedFrom": entry.get("artifactPrefix"),
+        }
+
+    def lookup_many(self, calls: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """Cached engine_outs by call position; lookups run concurrently."""
+        if not self.enabled or self.bypass:
+            return {}
+        keys = {pos: self.key(call) for pos, call in enumerate(calls)}
+        keys = {pos: key for pos, key in keys.items() if key}
+        if not keys:
+            return {}
+        with ThreadPoolExecutor(max_workers=max(1, ARTIFACT_UPLOAD_CONCURRENCY)) as pool:
+            found = dict(zip(keys, pool.map(self.fetch, keys.values())))
+        hits = {pos: out for pos, out in found.items() if out is not None}
+        self.lookups += len(keys)
+        self.hits += len(hits)
+        if hits:
+            log(f"Result cache: {len(hits)}/{len(keys)} runs already computed")
+        return hits
+
+    def record(self, call: Dict[str, Any], engine_out: Dict[str, Any], prefix: str):
+        """Remember a fresh run's result; written by flush() once its artifacts are uploaded."""
+        if engine_out.get("cacheHit"):
+            return
+        key = self.key(call)
+        if not key:
+            return
+        prefix = prefix.rstrip("/")
+        artifacts = [
+            {"key": f"{prefix}/{a['name']}", "name": a["name"],
+             "content_type": a.get("content_type", "application/octet-stream"),
+             "content_encoding": a.get("content_encoding")}
+            for a in engine_out.get("artifacts", [])
+            if Path(a["path"]).exists()
+        ]
+        self.pending.append((key, {
+            "key": key,
+            "engine": self.engine,
+            "createdAt": datetime.utcnow().isoformat() + "Z",
+            "artifactPrefix": prefix + "/",
+            "kpis": engine_out.get("kpis", {}),
+            "artifactFormats": engine_out.get("artifactFormats", ["csv"]),
+            "artifacts": artifacts,
+        }))
+
+    def flush(self):
+        """Write the recorded pointers. Failures only cost future hits, so they are logged, not raised."""
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+
+        def put(item: Tuple[str, Dict[str, Any]]):
+            key, entry = item
+            try:
+                s3_put_json(f"{RESULT_CACHE_PREFIX}/{key}.json", entry, indent=None)
+            except (BotoCoreError, ClientError) as exc:
+                log(f"WARN: result cache write failed for {key}: {exc}")
+
+        with ThreadPoolExecutor(max_workers=max(1, ARTIFACT_UPLOAD_CONCURRENCY)) as pool:
+            list(pool.map(put, pending))
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "bypass": self.bypass,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hitRate": self.hits / self.lookups if self.lookups else None,
+        }
+
+# --------------------------------------------------------------------
+# Grid-style members (grid and optimize runs)
+# --------------------------------------------------------------------
+class GridMembers:
+    """
+    Writes the finished members of a grid-style run: each member's
+    metrics.json and artifacts under grid/<i>/, its index entry, live
+    progress with the best member so far, and the rate-limited partial
+    index. Members pruned by a halving rung keep their rung KPIs out of
+    `kpis`, so ranking and aggregates only see full-range results.
+    """
+
+    def __init__(
+        self,
+        job: Dict[str, Any],
+        index: Dict[str, Any],
+        uploader: ArtifactUploader,
+        cache: ResultCache,
+        objective: str,
+        total: int,
+        writer: Optional[RunStatusWriter] = None,
+    ):
+        self.job = job
+        self.index = index
+        self.uploader = uploader
+        self.cache = cache
+        self.objective = objective
+        self.total = total
+        self.writer = writer
+        self.prefix = f"{job['artifactPrefix'].rstrip('/')}/grid"
+        self.children: Dict[int, Dict[str, Any]] = {}
+        self.best: Optional[Dict[str, Any]] = None
+        self.partial_index = PartialIndex(f"{self.prefix}/index.json", uploader, "children")
+
+    def finish(self, i: int, engine_out: Dict[str, Any], call: Dict[str, Any], pruned_at: Optional[int] = None):
+        job = self.job
+        params = call.get("params") or {}
+        child_id = f"{job['runId']}_{i:03d}"
+        child_prefix = f"{self.prefix}/{i:03d}"
+        kpis = engine_out.get("kpis", {})
+        child_metrics = {
+            "runId": child_id,
+            "parentRunId": job["runId"],
+            "strategyId": job["strategyId"],
+            "kind": f"{self.index['kind']}:member",
+            "index": i,
+            "startedAt": datetime.utcnow().isoformat() + "Z",
+            "finishedAt": datetime.utcnow().isoformat() + "Z",
+            "params": params,
+            "kpis": kpis,
+            "spec": call["spec"],
+            "artifactFormats": engine_out.get("artifactFormats", ["csv"]),
+            "cacheHit": bool(engine_out.get("cacheHit")),
+        }
+        if engine_out.get("cacheHit"):
+            child_metrics["cachedFrom"] = engine_out.get("cachedFrom")
+        if pruned_at is not None:
+            child_metrics["prunedAtRung"] = pruned_at
+
+        mpath = call["workdir"] / "metrics.json"
+        mpath.write_text(json.dumps(child_metrics, indent=2))
+        self.uploader.submit(child_prefix, mpath, "metrics.json", "application/json")
+        self.uploader.submit_artifacts(child_prefix, engine_out.get("artifacts", []))
+        self.cache.record(call, engine_out, child_prefix)
+
+        # Members finish out of order; the index is assembled in member order
+        self.children[i] = {
+            "runId": child_id,
+            "index": i,
+            "artifactPrefix": child_prefix + "/",
+            "params": params,
+            "kpis": kpis,
+        }
+        if pruned_at is not None:
+            self.children[i].update({"kpis": {}, "prunedAtRung": pruned_at, "rungKpis": kpis})
+        else:
+            value = kpis.get(self.objective)
+            if value is not None and (self.best is None or value > self.best["value"]):
+                self.best = {"runId": child_id, "index": i, "value": value}
+        if self.writer is not None:
+            self.writer.progress(job["runId"], {"done": len(self.children), "total": self.total,
+                                                "objective": self.objective, "best": self.best})
+        self.partial_index.update(self.index, self.children, self.total)
+
+
+def write_grid_summary(
+    job: Dict[str, Any],
+    workdir: Path,
+    index: Dict[str, Any],
+    members: GridMembers,
+    artifact_formats: List[str],
+    cache: ResultCache,
+    writer: Optional[RunStatusWriter],
+    extra: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Final grid/index.json, results.parquet, leaderboard.json, child rows and parent metrics.json."""
+    index["children"] = [members.children[i] for i in sorted(members.children)]
+    index["finishedAt"] = datetime.utcnow().isoformat() + "Z"
+    index.update({"partial": False, "done": len(members.children), "total": members.total, **extra})
+
+    # One columnar table (and a precomputed top-K) so consumers can rank and
+    # filter members with a single read instead of N metrics.json fetches
+    objective = members.objective
+    results = grid_results_frame(index["children"], objective)
+    results_path = workdir / "grid_results.parquet"
+    results.to_parquet(results_path, index=False, compression="zstd")
+    upload_file(results_path, f"{members.prefix}/results.parquet", "application/vnd.apache.parquet")
+    leaderboard = grid_leaderboard(index["children"], results, GRID_LEADERBOARD_SIZE)
+    s3_put_json(
+        f"{members.prefix}/leaderboard.json",
+        {"objective": objective, "members": len(results), "leaderboard": leaderboard},
+        indent=None,
+    )
+    s3_put_json(f"{members.prefix}/index.json", index)
+    if writer is not None:
+        writer.record_children(job, index["kind"], index["children"])
+
+    # Also a top-level metrics.json for the parent run
+    parent_metrics = {
+        "runId": job["runId"],
+        "strategyId": job["strategyId"],
+        "kind": index["kind"],
+        "startedAt": index["startedAt"],
+        "finishedAt": index["finishedAt"],
+        "members": [c["runId"] for c in index["children"]],
+        "spec": job.get("spec", {}),
+        "artifactFormats": artifact_formats,
+        "objective": objective,
+        **extra,
+        "leaderboard": leaderboard,
+        "resultCache": cache.summary(),
+    }
+    child_kpis = [
+        child.get("kpis", {})
+        for child in index["children"]
+        if child.get("kpis")
+    ]
+    parent_metrics["kpis"] = aggregate_kpis(child_kpis)
+    s3_put_json(f"{job['artifactPrefix'].rstrip('/')}/metrics.json", parent_metrics)
+
+    return parent_metrics
 
 # --------------------------------------------------------------------
 # Kind handlers
@@ -812,16 +3048,18 @@ def handle_backtest(job: Dict[str, Any], workdir: Path) -> Dict[str, Any]:
     strategy_file = workdir / "strategy_payload"
     download_strategy(job["manifestS3Key"], strategy_file)
     manifest = load_strategy_manifest(job.get("manifestS3Key"))
-    manifest = load_strategy_manifest(job.get("manifestS3Key"))
-    manifest = load_strategy_manifest(job.get("manifestS3Key"))
 
-    engine_out = run_engine(
-        strategy_file,
-        workdir,
-        job.get("spec", {}),
-        job.get("params"),
-        manifest=manifest,
-    )
+    call = {
+        "strategy_path": strategy_file,
+        "workdir": workdir,
+        "spec": job.get("spec", {}),
+        "params": job.get("params"),
+        "manifest": manifest,
+        "data_format": job.get("dataFormat"),
+        "artifact_formats": resolve_artifact_formats(job.get("artifactFormats")),
+    }
+    cache = ResultCache(strategy_file, manifest, job.get("bypassCache"))
+    engine_out = cache.lookup_many([call]).get(0) or run_engine(**call)
     result = {
         "runId": job["runId"],
         "strategyId": job["strategyId"],
@@ -831,27 +3069,36 @@ def handle_backtest(job: Dict[str, Any], workdir: Path) -> Dict[str, Any]:
         "params": job.get("params") or {},
         "kpis": engine_out.get("kpis", {}),
         "spec": job.get("spec", {}),
+        "artifactFormats": engine_out.get("artifactFormats", ["csv"]),
+        "cacheHit": bool(engine_out.get("cacheHit")),
+        "resultCache": cache.summary(),
     }
+    if engine_out.get("cacheHit"):
+        result["cachedFrom"] = engine_out.get("cachedFrom")
 
-    # Write and upload metrics.json
+    # Write and upload metrics.json plus any engine artifacts
     metrics_path = workdir / "metrics.json"
     metrics_path.write_text(json.dumps(result, indent=2))
-    upload_artifact(job["artifactPrefix"], "metrics.json", metrics_path.read_bytes(), "application/json")
-
-    # Upload any engine artifacts
-    for a in engine_out.get("artifacts", []):
-        p = Path(a["path"])
-        if p.exists():
-            upload_artifact(job["artifactPrefix"], a.get("name", p.name), p.read_bytes(), a.get("content_type", "application/octet-stream"))
+    with ArtifactUploader() as uploader:
+        uploader.submit(job["artifactPrefix"], metrics_path, "metrics.json", "application/json")
+        uploader.submit_artifacts(job["artifactPrefix"], engine_out.get("artifacts", []))
+    cache.record(call, engine_out, job["artifactPrefix"])
+    cache.flush()
 
     result["artifactPrefix"] = job["artifactPrefix"]
     return result
 
-def handle_grid(job: Dict[str, Any], workdir: Path) -> Dict[str, Any]:
+def handle_grid(job: Dict[str, Any], workdir: Path, writer: Optional[RunStatusWriter] = None) -> Dict[str, Any]:
     """
     Iterate grid param sets, run a sub-backtest per set, and produce:
       - runs/<runId>/grid/index.json         (summary of subruns)
       - runs/<runId>/grid/<i>/metrics.json   (per subrun)
+    plus live progress and one child "Run" row per member when a `writer` is given.
+
+    With `search: "halving"` all members first run on a short prefix of the
+    range; only the top 1/eta by the objective go on to each longer rung,
+    and members pruned at rung r are written with `prunedAtRung: r`, their
+    rung KPIs and no full-period KPIs.
     """
     grid: List[Dict[str, Any]] = job.get("grid") or []
     if not grid:
@@ -859,78 +3106,93 @@ def handle_grid(job: Dict[str, Any], workdir: Path) -> Dict[str, Any]:
 
     strategy_file = workdir / "strategy_payload"
     download_strategy(job["manifestS3Key"], strategy_file)
+    manifest = load_strategy_manifest(job.get("manifestS3Key"))
+    data_format = resolve_dataset_format(job.get("dataFormat"))
+    artifact_formats = resolve_artifact_formats(job.get("artifactFormats"))
+
+    spec = job.get("spec", {})
+    search = resolve_search(job.get("search"))
+    if search == "halving":
+        eta, rung_specs = halving_rungs(spec, job.get("halving"), len(grid))
+    else:
+        eta, rung_specs = 1, [spec]
 
     index: Dict[str, Any] = {
         "runId": job["runId"],
         "kind": "grid",
-        "spec": job.get("spec", {}),
+        "spec": spec,
         "children": [],
         "startedAt": datetime.utcnow().isoformat() + "Z",
     }
 
+    calls: List[Dict[str, Any]] = []
     for i, params in enumerate(grid):
-        child_id = f"{job['runId']}_{i:03d}"
-        child_prefix = f"{job['artifactPrefix'].rstrip('/')}/grid/{i:03d}"
-
         subdir = workdir / f"grid_{i:03d}"
         subdir.mkdir(parents=True, exist_ok=True)
-
-        engine_out = run_engine(
-            strategy_file, subdir, job.get("spec", {}), params, manifest=manifest
-        )
-        child_metrics = {
-            "runId": child_id,
-            "parentRunId": job["runId"],
-            "strategyId": job["strategyId"],
-            "kind": "grid:member",
-            "index": i,
-            "startedAt": datetime.utcnow().isoformat() + "Z",
-            "finishedAt": datetime.utcnow().isoformat() + "Z",
-            "params": params,
-            "kpis": engine_out.get("kpis", {}),
-            "spec": job.get("spec", {}),
-        }
-
-        mpath = subdir / "metrics.json"
-        mpath.write_text(json.dumps(child_metrics, indent=2))
-        upload_artifact(child_prefix, "metrics.json", mpath.read_bytes(), "application/json")
-
-        for a in engine_out.get("artifacts", []):
-            p = Path(a["path"])
-            if p.exists():
-                upload_artifact(child_prefix, a.get("name", p.name), p.read_bytes(), a.get("content_type", "application/octet-stream"))
-
-        # Add to index
-        index["children"].append({
-            "runId": child_id,
-            "index": i,
-            "artifactPrefix": child_prefix + "/",
+        calls.append({
+            "strategy_path": strategy_file,
+            "workdir": subdir,
+            "spec": spec,
             "params": params,
-            "kpis": engine_out.get("kpis", {}),
+            "manifest": manifest,
+            "dataset_dir": None,
+            "data_format": data_format,
+            "artifact_formats": artifact_formats,
         })
 
-    index["finishedAt"] = datetime.utcnow().isoformat() + "Z"
-    s3_put_json(f"{job['artifactPrefix'].rstrip('/')}/grid/index.json", index)
-
-    # Also a top-level metrics.json for the grid parent (optional)
-    parent_metrics = {
-        "runId": job["runId"],
-        "strategyId": job["strategyId"],
-        "kind": "grid",
-        "startedAt": index["startedAt"],
-        "finishedAt": index["finishedAt"],
-        "members": [c["runId"] for c in index["children"]],
-        "spec": job.get("spec", {}),
-    }
-    child_kpis = [
-        child.get("kpis", {})
-        for child in index["children"]
-        if child.get("kpis")
-    ]
-    parent_metrics["kpis"] = aggregate_kpis(child_kpis)
-    s3_put_json(f"{job['artifactPrefix'].rstrip('/')}/metrics.json", parent_metrics)
-
-    return parent_metrics
+    cache = ResultCache(strategy_file, manifest, job.get("bypassCache"))
+    dataset_dir: Optional[Path] = None
+    objective = resolve_objective(job.get("objective"))
+    concurrency = engine_concurrency(GRID_CONCURRENCY, manifest)
+    rungs: List[Dict[str, Any]] = []
+    # Uploads run in the background while the next members compute; the
+    # index only ever lists members whose artifacts are already in S3.
+    # Halving rungs share one set of engine workers
+    with ArtifactUploader() as uploader, EnginePool(concurrency) as pool:
+        members = GridMembers(job, index, uploader, cache, objective, len(calls), writer)
+        active = list(range(len(grid)))
+        for r, rung_spec in enumerate(rung_specs):
+            final = r == len(rung_specs) - 1
+            rung_calls = []
+            for i in active:
+                if final:
+                    rung_calls.append(calls[i])
+                    continue
+                rung_dir = calls[i]["workdir"] / f"rung_{r}"
+                rung_dir.mkdir(parents=True, exist_ok=True)
+                rung_calls.append({**calls[i], "spec": rung_spec, "workdir": rung_dir})
+
+            # Members already computed by an earlier run are copied, not re-run;
+            # the shared dataset is only written once something needs to run
+            hits = cache.lookup_many(rung_calls)
+            if engine_name(manifest) == "freqtrade" and dataset_dir is None and len(hits) < len(rung_calls):
+                dataset_dir = prepare_dataset(spec, workdir, data_format)
+            for call in rung_calls:
+                call["dataset_dir"] = dataset_dir
+
+            rung_results: Dict[int, Dict[str, Any]] = {}
+            for j, engine_out, error in run_engine_memoised(rung_calls, concurrency, hits, pool):
+                if error is not None:
+                    raise error
+                if final:
+                    members.finish(active[j], engine_out, rung_calls[j])
+                else:
+                    rung_results[j] = engine_out
+
+            rung = {"rung": r, "spec": rung_spec, "members": len(active)}
+            if not final:
+                kept = halving_survivors({j: out.get("kpis", {}) for j, out in rung_results.items()}, objective, eta)
+                for j in sorted(set(rung_results) - set(kept)):
+                    members.finish(active[j], rung_results[j], rung_calls[j], pruned_at=r)
+                rung["pruned"] = [active[j] for j in sorted(set(rung_results) - set(kept))]
+                active = [active[j] for j in kept]
+                log(f"Grid rung {r}: kept {len(active)}/{rung['members']} members by {objective}")
+            rung["kept"] = len(active)
+            rungs.append(rung)
+
+    cache.flush()
+    search_summary = {"mode": search, "eta": eta, "rungs": rungs} if search == "halving" else {"mode": search}
+    return write_grid_summary(job, workdir, index, members, artifact_formats, cache, writer, {"search": search_summary})
 
 def month_add(dt: datetime, months: int) -> datetime:
     return dt + relativedelta(months=+months)
@@ -969,12 +3231,13 @@ def wf_windows(spec: Dict[str, Any], wf: Dict[str, int]) -> Iterable[Dict[str, s
         if cursor >= end:
             break
 
-def handle_walkforward(job: Dict[str, Any], workdir: Path) -> Dict[str, Any]:
+def handle_walkforward(job: Dict[str, Any], workdir: Path, writer: Optional[RunStatusWriter] = None) -> Dict[str, Any]:
     """
     Produce rolling windows and run engine for each.
     Artifacts:
       - runs/<runId>/wf/index.json           (summary)
       - runs/<runId>/wf/<i>/metrics.json     (per window test result)
+    plus live progress and one child "Run" row per window when a `writer` is given.
     """
     wf = job.get("walkforward")
     if not wf:
@@ -982,8 +3245,11 @@ def handle_walkforward(job: Dict[str, Any], workdir: Path) -> Dict[str, Any]:
 
     strategy_file = workdir / "strategy_payload"
     download_strategy(job["manifestS3Key"], strategy_file)
+    manifest = load_strategy_manifest(job.get("manifestS3Key"))
 
     spec = job.get("spec", {})
+    data_format = resolve_dataset_format(job.get("dataFormat"))
+    artifact_formats = resolve_artifact_formats(job.get("artifactFormats"))
     idx: Dict[str, Any] = {
         "runId": job["runId"],
         "kind": "walkforward",
@@ -993,56 +3259,111 @@ def handle_walkforward(job: Dict[str, Any], workdir: Path) -> Dict[str, Any]:
         "startedAt": datetime.utcnow().isoformat() + "Z",
     }
 
-    for i, w in enumerate(wf_windows(spec, wf)):
-        child_id = f"{job['runId']}_wf_{i:03d}"
-        child_prefix = f"{job['artifactPrefix'].rstrip('/')}/wf/{i:03d}"
+    windows = list(wf_windows(spec, wf))
+    calls: List[Dict[str, Any]] = []
+    for i, w in enumerate(windows):
         subdir = workdir / f"wf_{i:03d}"
         subdir.mkdir(parents=True, exist_ok=True)
-
-        # You can pass window info into your engine via params
-        params = {"wfWindow": w}
-
-        engine_out = run_engine(
-            strategy_file,
-            subdir,
-            spec,
-            params,
-            phase="walkforward_test",
-            manifest=manifest,
-        )
-        child_metrics = {
-            "runId": child_id,
-            "parentRunId": job["runId"],
-            "strategyId": job["strategyId"],
-            "kind": "walkforward:window",
-            "index": i,
-            "window": w,
-            "startedAt": datetime.utcnow().isoformat() + "Z",
-            "finishedAt": datetime.utcnow().isoformat() + "Z",
-            "params": params,
-            "kpis": engine_out.get("kpis", {}),
+        calls.append({
+            "strategy_path": strategy_file,
+            "workdir": subdir,
             "spec": spec,
-        }
+            # You can pass window info into your engine via params
+            "params": {"wfWindow": w},
+            "phase": "walkforward_test",
+            "manifest": manifest,
+            "dataset_dir": None,
+            "data_format": data_format,
+            "artifact_formats": artifact_formats,
+        })
 
-        mpath = subdir / "metrics.json"
-        mpath.write_text(json.dumps(child_metrics, indent=2))
-        upload_artifact(child_prefix, "metrics.json", mpath.read_bytes(), "application/json")
+    cache = ResultCache(strategy_file, manifest, job.get("bypassCache"))
+    hits = cache.lookup_many(calls)
+    if engine_name(manifest) == "freqtrade" and len(hits) < len(calls):
+        dataset_dir = prepare_dataset(spec, workdir, data_format)
+        for call in calls:
+            call["dataset_dir"] = dataset_dir
+
+    entries: Dict[int, Dict[str, Any]] = {}
+    concurrency = engine_concurrency(WALKFORWARD_CONCURRENCY, manifest)
+    index_key = f"{job['artifactPrefix'].rstrip('/')}/wf/index.json"
+
+    def report_progress():
+        if writer is not None:
+            failed = sum(1 for e in entries.values() if e.get("error"))
+            writer.progress(job["runId"], {"done": len(entries), "total": len(calls), "failed": failed})
+    with ArtifactUploader() as uploader:
+        partial_index = PartialIndex(index_key, uploader, "windows")
+        for i, engine_out, error in run_engine_memoised(calls, concurrency, hits):
+            w = windows[i]
+            params = calls[i]["params"]
+            subdir = calls[i]["workdir"]
+            child_id = f"{job['runId']}_wf_{i:03d}"
+            child_prefix = f"{job['artifactPrefix'].rstrip('/')}/wf/{i:03d}"
+
+            if error is not None:
+                # A failed window is recorded but does not abort the others
+                log(f"Walk-forward window {i} failed: {error}")
+                entries[i] = {
+                    "runId": child_id,
+                    "index": i,
+                    "artifactPrefix": child_prefix + "/",
+                    "window": w,
+                    "kpis": {},
+                    "error": str(error),
+                }
+                report_progress()
+                partial_index.update(idx, entries, len(calls))
+                continue
 
-        for a in engine_out.get("artifacts", []):
-            p = Path(a["path"])
-            if p.exists():
-                upload_artifact(child_prefix, a.get("name", p.name), p.read_bytes(), a.get("content_type", "application/octet-stream"))
+            child_metrics = {
+                "runId": child_id,
+                "parentRunId": job["runId"],
+                "strategyId": job["strategyId"],
+                "kind": "walkforward:window",
+                "index": i,
+                "window": w,
+                "startedAt": datetime.utcnow().isoformat() + "Z",
+                "finishedAt": datetime.utcnow().isoformat() + "Z",
+                "params": params,
+                "kpis": engine_out.get("kpis", {}),
+                "spec": spec,
+                "artifactFormats": engine_out.get("artifactFormats", ["csv"]),
+                "cacheHit": bool(engine_out.get("cacheHit")),
+            }
+            if engine_out.get("cacheHit"):
+                child_metrics["cachedFrom"] = engine_out.get("cachedFrom")
+
+            mpath = subdir / "metrics.json"
+            mpath.write_text(json.dumps(child_metrics, indent=2))
+            uploader.submit(child_prefix, mpath, "metrics.json", "application/json")
+            uploader.submit_artifacts(child_prefix, engine_out.get("artifacts", []))
+            cache.record(calls[i], engine_out, child_prefix)
+
+            entries[i] = {
+                "runId": child_id,
+                "index": i,
+                "artifactPrefix": child_prefix + "/",
+                "window": w,
+                "kpis": engine_out.get("kpis", {}),
+            }
+            report_progress()
+            partial_index.update(idx, entries, len(calls))
 
-        idx["windows"].append({
-            "runId": child_id,
-            "index": i,
-            "artifactPrefix": child_prefix + "/",
-            "window": w,
-            "kpis": engine_out.get("kpis", {}),
-        })
+    cache.flush()
+
+    idx["windows"] = [entries[i] for i in sorted(entries)]
+    failed = [w["index"] for w in idx["windows"] if w.get("error")]
+    if windows and len(failed) == len(windows):
+        raise RuntimeError(f"all {len(windows)} walk-forward windows failed")
 
     idx["finishedAt"] = datetime.utcnow().isoformat() + "Z"
-    s3_put_json(f"{job['artifactPrefix'].rstrip('/')}/wf/index.json", idx)
+    idx.update({"partial": False, "done": len(entries), "total": len(calls)})
+    s3_put_json(index_key, idx)
+    if writer is not None:
+        writer.record_children(
+            job, "walkforward", [{**w, "params": {"wfWindow": w["window"]}} for w in idx["windows"]]
+        )
 
     # Optional parent metrics
     parent_metrics = {
@@ -1052,8 +3373,11 @@ def handle_walkforward(job: Dict[str, Any], workdir: Path) -> Dict[str, Any]:
         "startedAt": idx["startedAt"],
         "finishedAt": idx["finishedAt"],
         "windows": [w["runId"] for w in idx["windows"]],
+        "failedWindows": failed,
         "spec": spec,
+        "artifactFormats": artifact_formats,
         "wf": wf,
+        "resultCache": cache.summary(),
     }
     window_kpis = [
         window.get("kpis", {})
@@ -1065,9 +3389,275 @@ def handle_walkforward(job: Dict[str, Any], workdir: Path) -> Dict[str, Any]:
 
     return parent_metrics
 
+def handle_optimize(job: Dict[str, Any], workdir: Path, writer: Optional[RunStatusWriter] = None) -> Dict[str, Any]:
+    """
+    Adaptive parameter search within `optimize.budget` backtests over
+    `optimize.space` (merged onto `params`). The first `initial` sets are
+    drawn at random, then each batch of parallel runs is proposed by
+    tpe_candidates() from every result so far, maximising the objective.
+    Members use the grid layout:
+      - runs/<runId>/grid/index.json         (summary, kind "optimize")
+      - runs/<runId>/grid/<i>/metrics.json   (per evaluation, in order tried)
+    """
+    config = job.get("optimize") or {}
+    dims = optimize_space(config.get("space"))
+    budget = int(config.get("budget") or 0)
+    if budget < 1:
+        raise ValueError("optimize.budget must be at least 1")
+    initial = min(budget, max(1, int(config.get("initial") or max(5, budget // 5))))
+    seed = config.get("seed")
+    seed = int(seed) if seed is not None else int(np.random.SeedSequence().entropy % (2 ** 32))
+    rng = np.random.default_rng(seed)
+    base_params = job.get("params") or {}
+
+    strategy_file = workdir / "strategy_payload"
+    download_strategy(job["manifestS3Key"], strategy_file)
+    manifest = load_strategy_manifest(job.get("manifestS3Key"))
+    data_format = resolve_dataset_format(job.get("dataFormat"))
+    artifact_formats = resolve_artifact_formats(job.get("artifactFormats"))
+    spec = job.get("spec", {})
+
+    index: Dict[str, Any] = {
+        "runId": job["runId"],
+        "kind": "optimize",
+        "spec": spec,
+        "children": [],
+        "startedAt": datetime.utcnow().isoformat() + "Z",
+    }
+
+    cache = ResultCache(strategy_file, manifest, job.get("bypassCache"))
+    dataset_dir: Optional[Path] = None
+    objective = resolve_objective(job.get("objective"))
+    concurrency = engine_concurrency(GRID_CONCURRENCY, manifest)
+    history: List[Tuple[Dict[str, Any], float]] = []
+    seen: Set[str] = set()
+    # Every TPE batch runs on the same engine workers, so each proposal
+    # round does not pay for spawning and importing a fresh pool
+    with ArtifactUploader() as uploader, EnginePool(concurrency) as pool:
+        members = GridMembers(job, index, uploader, cache, objective, budget, writer)
+        while len(history) < budget:
+            if len(history) < initial:
+                proposed = random_candidates(dims, rng, initial - len(history), seen)
+            else:
+                proposed = tpe_candidates(dims, history, rng, min(concurrency, budget - len(history)), seen)
+            if not proposed:
+                log(f"Optimize: search space exhausted after {len(history)} evaluations")
+                break
+
+            calls: List[Dict[str, Any]] = []
+            for params in proposed:
+                subdir = workdir / f"grid_{len(history) + len(calls):03d}"
+                subdir.mkdir(parents=True, exist_ok=True)
+                calls.append({
+                    "strategy_path": strategy_file,
+                    "workdir": subdir,
+                    "spec": spec,
+                    "params": {**base_params, **params},
+                    "manifest": manifest,
+                    "dataset_dir": None,
+                    "data_format": data_format,
+                    "artifact_formats": artifact_formats,
+                })
+            hits = cache.lookup_many(calls)
+            if engine_name(manifest) == "freqtrade" and dataset_dir is None and len(hits) < len(calls):
+                dataset_dir = prepare_dataset(spec, workdir, data_format)
+            for call in calls:
+                call["dataset_dir"] = dataset_dir
+
+            start = len(history)
+            results: Dict[int, float] = {}
+            for j, engine_out, error in run_engine_memoised(calls, concurrency, hits, pool):
+                if error is not None:
+                    raise error
+                members.finish(start + j, engine_out, calls[j])
+                # Runs without the objective (e.g. no trades) rank below every scored run
+                try:
+                    value = float(engine_out.get("kpis", {}).get(objective))
+                except (TypeError, ValueError):
+                    value = -math.inf
+                results[j] = value if not math.isnan(value) else -math.inf
+            history.extend((proposed[j], results[j]) for j in range(len(proposed)))
+            best = members.best["value"] if members.best else None
+            log(f"Optimize: {len(history)}/{budget} evaluated, best {objective} {best}")
+
+    cache.flush()
+    summary = {"budget": budget, "initial": initial, "seed": seed, "evaluations": len(history),
+               "space": config.get("space"), "best": members.best}
+    if members.best is not None:
+        summary["bestParams"] = members.children[members.best["index"]]["params"]
+    return write_grid_summary(job, workdir, index, members, artifact_formats, cache, writer, {"optimize": summary})
+
+
+# --------------------------------------------------------------------
+# SQS visibility heartbeat
+# --------------------------------------------------------------------
+def estimate_job_seconds(job: Dict[str, Any]) -> float:
+    """Rough runtime: (per-run overhead + bars x per-bar cost) for each batch of parallel runs."""
+    spec = job.get("spec") or {}
+    _, start, end = timerange_from_spec(spec)
+    bars = (end - start).total_seconds() * 1000 / timeframe_to_ms(spec.get("timeframe") or "1h")
+    kind = (job.get("kind") or "backtest").lower()
+    runs, parallel = 1, 1
+    if kind == "grid":
+        runs, parallel = len(job.get("grid") or []) or 1, engine_concurrency(GRID_CONCURRENCY)
+    elif kind == "walkforward":
+        try:
+            runs = len(list(wf_windows(spec, job.get("walkforward") or {}))) or 1
+        except (KeyError, TypeError, ValueError):
+            runs = 1
+        parallel = engine_concurrency(WALKFORWARD_CONCURRENCY)
+    elif kind == "optimize":
+        try:
+            runs = max(1, int((job.get("optimize") or {}).get("budget") or 1))
+        except (TypeError, ValueError):
+            runs = 1
+        parallel = engine_concurrency(GRID_CONCURRENCY)
+    return math.ceil(runs / parallel) * (JOB_SECONDS_PER_RUN + bars * JOB_SECONDS_PER_BAR)
+
+
+def visibility_extension(job: Dict[str, Any]) -> int:
+    try:
+        estimate = estimate_job_seconds(job)
+    except Exception:
+        estimate = VISIBILITY_TIMEOUT
+    return int(min(max(estimate, VISIBILITY_TIMEOUT), MAX_VISIBILITY_EXTENSION))
+
+
+class VisibilityHeartbeat:
+    """
+    Keeps a received message invisible while its job runs: extends the
+    visibility timeout to `extension` seconds right away and then every
+    `interval` (a third of the extension by default), on a background
+    thread, until stop(). A worker that dies stops heartbeating, so the
+    message reappears at most `extension` seconds later.
+    """
+
+    def __init__(self, receipt: Optional[str], extension: int, interval: Optional[float] = None):
+        self.receipt = receipt
+        self.extension = extension
+        self.interval = interval if interval is not None else extension / 3
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="visibility-heartbeat", daemon=True)
+
+    def start(self):
+        if self.receipt:
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def release(self):
+        """
+        Stop, and shorten the message's invisibility back to the queue's
+        receive timeout, so a failed job is retried as it was before the
+        heartbeat rather than after a full (up to an hour) extension.
+        """
+        self.stop()
+        if not self.receipt:
+            return
+        try:
+            sqs.change_message_visibility(
+                QueueUrl=QUEUE_URL,
+                ReceiptHandle=self.receipt,
+                VisibilityTimeout=VISIBILITY_TIMEOUT,
+            )
+        except ClientError as exc:
+            log(f"WARN: could not reset message visibility: {exc}")
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                sqs.change_message_visibility(
+                    QueueUrl=QUEUE_URL,
+                    ReceiptHandle=self.receipt,
+                    VisibilityTimeout=self.extension,
+                )
+            except ClientError as exc:
+                # Invalid/expired receipt, or SQS's 12h total cap: nothing left to extend
+                log(f"WARN: visibility heartbeat stopped: {exc}")
+                return
+            except Exception as exc:
+                log(f"WARN: visibility heartbeat failed, retrying: {exc}")
+            self._stop.wait(self.interval)
+
+
 # --------------------------------------------------------------------
 # Main loop
 # --------------------------------------------------------------------
+def process_message(m: Dict[str, Any], writer: RunStatusWriter, base_workdir: Path):
+    """
+    Run one SQS message to completion in the calling job slot, in its own
+    workdir. The message is deleted (by its own receipt handle) once the job
+    succeeds, or straight away if it is not JSON; a failed job's message
+    reappears once the queue's receive timeout (VISIBILITY_TIMEOUT) passes.
+    """
+    receipt = m.get("ReceiptHandle")
+    body = m.get("Body", "{}")
+
+    try:
+        job = json.loads(body)
+    except json.JSONDecodeError:
+        log("ERROR: received non-JSON message; deleting to skip")
+        if receipt:
+            try:
+                sqs.delete_message(QueueUrl=QUEUE_URL, ReceiptHandle=receipt)
+            except Exception as e:
+                log(f"ERROR: delete_message failed for bad JSON: {e}")
+        return
+
+    run_id = job.get("runId") or f"r_{uuid.uuid4()}"
+    prefix = job.get("artifactPrefix") or f"runs/{run_id}/"
+    kind = (job.get("kind") or "backtest").lower()
+
+    extension = visibility_extension(job)
+    log(f"Processing job runId={run_id} kind={kind} (visibility {extension}s heartbeat)")
+    heartbeat = VisibilityHeartbeat(receipt, extension)
+    heartbeat.start()
+    workdir = base_workdir / run_id
+    workdir.mkdir(parents=True, exist_ok=True)
+    disk_budget.job_started(workdir)
+    disk_budget.enforce()
+
+    try:
+        writer.ensure_run(job, prefix, kind.upper())
+        writer.mark_running(run_id)
+
+        if kind == "backtest":
+            result = handle_backtest(job, workdir)
+        elif kind == "grid":
+            result = handle_grid(job, workdir, writer)
+        elif kind == "walkforward":
+            result = handle_walkforward(job, workdir, writer)
+        elif kind == "optimize":
+            result = handle_optimize(job, workdir, writer)
+        else:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        writer.mark_succeeded(
+            run_id,
+            result.get("kpis"),
+            result.get("artifactPrefix", prefix),
+        )
+
+        heartbeat.stop()
+        if receipt:
+            sqs.delete_message(QueueUrl=QUEUE_URL, ReceiptHandle=receipt)
+        log(f"✅ Completed job {run_id} (artifacts under s3://{BUCKET}/{prefix})")
+
+    except Exception as e:
+        log(f"❌ Job {run_id} failed: {e}")
+        traceback.print_exc()
+        writer.mark_failed(run_id)
+        heartbeat.release()
+        time.sleep(5)
+    finally:
+        heartbeat.stop()
+        disk_budget.job_finished(workdir)
+        disk_budget.enforce()
+
+
 def main():
     global sqs
     print(">>> worker.py starting up", flush=True)
@@ -1086,20 +3676,33 @@ def main():
     log(f"Bucket: {BUCKET}")
 
     store = RunStore(DATABASE_URL)
+    writer = RunStatusWriter(store).start()
 
-    base_workdir = Path("/tmp/workdir")
+    base_workdir = WORKDIR_ROOT
     base_workdir.mkdir(parents=True, exist_ok=True)
 
     idle_ticks = 0
     backoff = 1
+    slots = ThreadPoolExecutor(max_workers=JOB_SLOTS, thread_name_prefix="job")
+    in_flight: Set[Future] = set()
+    log(f"Job slots: {JOB_SLOTS}")
 
     while not STOP:
+        for fut in [f for f in in_flight if f.done()]:
+            in_flight.discard(fut)
+            if fut.exception() is not None:
+                log(f"ERROR: job slot crashed: {fut.exception()}")
+        free = JOB_SLOTS - len(in_flight)
+        if free <= 0:
+            wait(in_flight, timeout=1, return_when=FIRST_COMPLETED)
+            continue
+
         try:
             resp = sqs.receive_message(
                 QueueUrl=QUEUE_URL,
-                MaxNumberOfMessages=1,
-                WaitTimeSeconds=20,
-                VisibilityTimeout=900,
+                MaxNumberOfMessages=min(free, 10),
+                WaitTimeSeconds=SQS_WAIT_SECONDS,
+                VisibilityTimeout=VISIBILITY_TIMEOUT,
             )
         except Exception as e:
             log(f"ERROR: receive_message failed: {e}")
@@ -1115,67 +3718,19 @@ def main():
         msgs = resp.get("Messages", [])
         if not msgs:
             idle_ticks += 1
-            if idle_ticks % 6 == 0:
+            if idle_ticks % 6 == 0 and not in_flight:
                 log("Idle: no messages")
             continue
 
         idle_ticks = 0
-        m = msgs[0]
-        receipt = m.get("ReceiptHandle")
-        body = m.get("Body", "{}")
-
-        try:
-            job = json.loads(body)
-        except json.JSONDecodeError:
-            log("ERROR: received non-JSON message; deleting to skip")
-            if receipt:
-                try:
-                    sqs.delete_message(QueueUrl=QUEUE_URL, ReceiptHandle=receipt)
-                except Exception as e:
-                    log(f"ERROR: delete_message failed for bad JSON: {e}")
-            continue
-
-        run_id = job.get("runId") or f"r_{uuid.uuid4()}"
-        prefix = job.get("artifactPrefix") or f"runs/{run_id}/"
-        kind = (job.get("kind") or "backtest").lower()
-
-        log(f"Processing job runId={run_id} kind={kind}")
-        workdir = base_workdir / run_id
-        workdir.mkdir(parents=True, exist_ok=True)
-
-        try:
-            if store.enabled():
-                store.ensure_run(job, prefix, kind.upper())
-                store.mark_running(run_id)
-
-            if kind == "backtest":
-                result = handle_backtest(job, workdir)
-            elif kind == "grid":
-                result = handle_grid(job, workdir)
-            elif kind == "walkforward":
-                result = handle_walkforward(job, workdir)
-            else:
-                raise ValueError(f"Unknown job kind: {kind}")
-
-            if store.enabled():
-                store.mark_succeeded(
-                    run_id,
-                    result.get("kpis"),
-                    result.get("artifactPrefix", prefix),
-                )
-
-            if receipt:
-                sqs.delete_message(QueueUrl=QUEUE_URL, ReceiptHandle=receipt)
-            log(f"✅ Completed job {run_id} (artifacts under s3://{BUCKET}/{prefix})")
-
-        except Exception as e:
-            log(f"❌ Job {run_id} failed: {e}")
-            traceback.print_exc()
-            if store.enabled():
-                store.mark_failed(run_id)
-            time.sleep(5)
+        for m in msgs:
+            in_flight.add(slots.submit(process_message, m, writer, base_workdir))
 
+    if in_flight:
+        log(f"Draining {len(in_flight)} in-flight job(s)…")
+    slots.shutdown(wait=True)
     log("Exiting worker main loop")
+    writer.close()
     store.close()
 
 